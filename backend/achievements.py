@@ -1,15 +1,76 @@
-from datetime import datetime, date, timezone
-from sqlalchemy import select, func
+"""Achievement unlock checks.
+
+``check_achievements`` is called after an action that may have changed
+a user's progress, naming the triggering event.  Each criterion declares
+the events whose actions can change its inputs, and an event evaluates
+only those criteria, so that unlocks are the same as checking
+everything every time:
+
+* completion counts and completion times only change when a quest is
+  completed, which runs a check;
+* the streak only changes when a quest is verified;
+* the approved-redemption count only changes when a reward is redeemed
+  or approved, both of which run a check;
+* today's assignments also change through deletions, trades and skips,
+  and XP and pet levels through pet care, admin adjustments and pet
+  switches, none of which run a check, so those criteria are evaluated
+  on every event.
+
+Counts come from the ``user_daily_stats`` rollup or from bounded/EXISTS
+queries rather than loading the user's history.
+"""
+
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Iterable
+
+from sqlalchemy import Integer, cast, exists, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.models import (
     Achievement, UserAchievement, User, ChoreAssignment, AssignmentStatus,
     PointTransaction, PointType, RewardRedemption, Notification, NotificationType,
+    UserDailyStats,
 )
 from backend.websocket_manager import ws_manager
-
-
-async def check_achievements(db: AsyncSession, user: User):
-    result = await db.execute(select(Achievement))
+from backend.services.clock import clock
+
+# Events passed to check_achievements
+EVENT_QUEST_COMPLETED = "quest_completed"
+EVENT_QUEST_VERIFIED = "quest_verified"
+EVENT_REDEMPTION = "redemption"
+EVENT_POINTS_AWARDED = "points_awarded"
+ALL_EVENTS = frozenset({
+    EVENT_QUEST_COMPLETED, EVENT_QUEST_VERIFIED, EVENT_REDEMPTION, EVENT_POINTS_AWARDED,
+})
+
+_DONE_STATUSES = [AssignmentStatus.completed, AssignmentStatus.verified]
+
+# criteria type -> evaluator(db, user, criteria, cache); ``cache`` holds
+# inputs shared by several achievements during one check.
+Evaluator = Callable[[AsyncSession, User, dict, dict], Awaitable[bool]]
+_EVALUATORS: dict[str, Evaluator] = {}
+# criteria type -> events that can change its inputs
+_TRIGGERS: dict[str, frozenset[str]] = {}
+
+
+def _criterion(ctype: str, *, triggers: Iterable[str] = ALL_EVENTS):
+    """Register an evaluator for ``ctype``, run on the ``triggers`` events
+    (see the module docstring)."""
+    def decorator(fn: Evaluator) -> Evaluator:
+        _EVALUATORS[ctype] = fn
+        _TRIGGERS[ctype] = frozenset(triggers)
+        return fn
+    return decorator
+
+
+async def check_achievements(db: AsyncSession, user: User, event: str | None = None):
+    """Unlock every achievement ``user`` now qualifies for.
+
+    ``event`` is one of the ``EVENT_*`` constants and limits the check to
+    the criteria the event can affect; ``None`` checks everything.
+    """
+    wanted = None if event is None else _EVENT_CRITERIA[event]
+
+    result = await db.execute(select(Achievement).order_by(Achievement.id))
     all_achievements = result.scalars().all()
 
     result = await db.execute(
@@ -17,113 +78,141 @@ async def check_achievements(db: AsyncSession, user: User):
     )
     unlocked_ids = set(result.scalars().all())
 
+    cache: dict = {}
     for achievement in all_achievements:
         if achievement.id in unlocked_ids:
             continue
-        if await _check_criteria(db, user, achievement.criteria):
+        if wanted is not None and achievement.criteria.get("type") not in wanted:
+            continue
+        if await _check_criteria(db, user, achievement.criteria, cache):
             await _unlock_achievement(db, user, achievement)
 
 
-async def _check_criteria(db: AsyncSession, user: User, criteria: dict) -> bool:
-    ctype = criteria.get("type")
+async def _check_criteria(
+    db: AsyncSession, user: User, criteria: dict, cache: dict | None = None,
+) -> bool:
+    evaluator = _EVALUATORS.get(criteria.get("type"))
+    if evaluator is None:
+        return False
+    return await evaluator(db, user, criteria, {} if cache is None else cache)
+
 
-    if ctype == "total_completions":
+@_criterion("total_completions", triggers={EVENT_QUEST_COMPLETED})
+async def _total_completions(db, user, criteria, cache) -> bool:
+    if "completions" not in cache:
         result = await db.execute(
-            select(func.count()).select_from(ChoreAssignment).where(
-                ChoreAssignment.user_id == user.id,
-                ChoreAssignment.status.in_([AssignmentStatus.completed, AssignmentStatus.verified]),
-            )
+            select(func.sum(UserDailyStats.completed + UserDailyStats.verified))
+            .where(UserDailyStats.user_id == user.id)
         )
-        count = result.scalar()
-        return count >= criteria["count"]
+        cache["completions"] = result.scalar() or 0
+    return cache["completions"] >= criteria["count"]
 
-    elif ctype == "consecutive_days_all_complete":
-        return user.current_streak >= criteria["days"]
 
-    elif ctype == "total_points_earned":
-        return user.total_points_earned >= criteria["amount"]
+@_criterion("consecutive_days_all_complete", triggers={EVENT_QUEST_VERIFIED})
+@_criterion("streak_reached", triggers={EVENT_QUEST_VERIFIED})
+async def _streak(db, user, criteria, cache) -> bool:
+    return user.current_streak >= criteria["days"]
 
-    elif ctype == "completion_before_time":
-        hour = criteria["hour"]
-        result = await db.execute(
-            select(ChoreAssignment).where(
+
+@_criterion("total_points_earned")
+async def _total_points_earned(db, user, criteria, cache) -> bool:
+    return user.total_points_earned >= criteria["amount"]
+
+
+@_criterion("completion_before_time", triggers={EVENT_QUEST_COMPLETED})
+async def _completion_before_time(db, user, criteria, cache) -> bool:
+    # Same hour as the stored (naive) completed_at value
+    completed_hour = cast(func.strftime("%H", ChoreAssignment.completed_at), Integer)
+    result = await db.execute(
+        select(
+            exists().where(
                 ChoreAssignment.user_id == user.id,
-                ChoreAssignment.status.in_([AssignmentStatus.completed, AssignmentStatus.verified]),
+                ChoreAssignment.status.in_(_DONE_STATUSES),
                 ChoreAssignment.completed_at.isnot(None),
+                completed_hour < criteria["hour"],
             )
         )
-        for assignment in result.scalars().all():
-            if assignment.completed_at and assignment.completed_at.hour < hour:
-                return True
-        return False
+    )
+    return bool(result.scalar())
 
-    elif ctype == "streak_reached":
-        return user.current_streak >= criteria["days"]
 
-    elif ctype == "total_redemptions":
-        result = await db.execute(
-            select(func.count()).select_from(RewardRedemption).where(
-                RewardRedemption.user_id == user.id,
-                RewardRedemption.status == "approved",
-            )
+@_criterion("total_redemptions", triggers={EVENT_REDEMPTION})
+async def _total_redemptions(db, user, criteria, cache) -> bool:
+    # Stop counting once the threshold is reached
+    approved = (
+        select(RewardRedemption.id)
+        .where(
+            RewardRedemption.user_id == user.id,
+            RewardRedemption.status == "approved",
         )
-        count = result.scalar()
-        return count >= criteria["count"]
+        .limit(criteria["count"])
+        .subquery()
+    )
+    result = await db.execute(select(func.count()).select_from(approved))
+    return result.scalar() >= criteria["count"]
 
-    elif ctype == "all_daily_before_time":
-        hour = criteria["hour"]
-        today = date.today()
+
+async def _todays_assignments(db: AsyncSession, user: User, cache: dict) -> list:
+    """Today's non-skipped assignments as (status, completed_at) rows."""
+    if "today" not in cache:
         result = await db.execute(
-            select(ChoreAssignment).where(
+            select(ChoreAssignment.status, ChoreAssignment.completed_at).where(
                 ChoreAssignment.user_id == user.id,
-                ChoreAssignment.date == today,
+                ChoreAssignment.date == clock.today(),
                 ChoreAssignment.status != AssignmentStatus.skipped,
             )
         )
-        assignments = result.scalars().all()
-        if not assignments:
+        cache["today"] = result.all()
+    return cache["today"]
+
+
+@_criterion("all_daily_before_time")
+async def _all_daily_before_time(db, user, criteria, cache) -> bool:
+    hour = criteria["hour"]
+    assignments = await _todays_assignments(db, user, cache)
+    if not assignments:
+        return False
+    for a in assignments:
+        if a.status == AssignmentStatus.pending:
             return False
-        for a in assignments:
-            if a.status == AssignmentStatus.pending:
-                return False
-            if a.completed_at and a.completed_at.hour >= hour:
-                return False
-        return True
-
-    elif ctype == "all_daily_completed":
-        today = date.today()
-        result = await db.execute(
-            select(ChoreAssignment).where(
-                ChoreAssignment.user_id == user.id,
-                ChoreAssignment.date == today,
-                ChoreAssignment.status != AssignmentStatus.skipped,
-            )
-        )
-        assignments = result.scalars().all()
-        if not assignments:
+        if a.completed_at and a.completed_at.hour >= hour:
             return False
-        return all(
-            a.status in (AssignmentStatus.completed, AssignmentStatus.verified)
-            for a in assignments
-        )
+    return True
+
 
-    elif ctype == "unassigned_chore_completed":
-        # This would require tracking if chore was self-claimed
+@_criterion("all_daily_completed")
+async def _all_daily_completed(db, user, criteria, cache) -> bool:
+    assignments = await _todays_assignments(db, user, cache)
+    if not assignments:
         return False
+    return all(a.status in _DONE_STATUSES for a in assignments)
 
-    elif ctype == "pet_level_reached":
-        config = user.avatar_config or {}
-        pet = config.get("pet")
-        if not pet or pet == "none":
-            return False
-        from backend.services.pet_leveling import get_current_pet_xp, get_pet_level
-        pet_xp = get_current_pet_xp(config)
-        level = get_pet_level(pet_xp)["level"]
-        return level >= criteria["level"]
 
+@_criterion("unassigned_chore_completed", triggers=frozenset())
+async def _unassigned_chore_completed(db, user, criteria, cache) -> bool:
+    # This would require tracking if chore was self-claimed
     return False
 
 
+@_criterion("pet_level_reached")
+async def _pet_level_reached(db, user, criteria, cache) -> bool:
+    config = user.avatar_config or {}
+    pet = config.get("pet")
+    if not pet or pet == "none":
+        return False
+    from backend.services.pet_leveling import get_current_pet_xp, get_pet_level
+    pet_xp = get_current_pet_xp(config)
+    level = get_pet_level(pet_xp)["level"]
+    return level >= criteria["level"]
+
+
+# event -> criteria types it evaluates, from the declared triggers
+_EVENT_CRITERIA: dict[str, frozenset[str]] = {
+    event: frozenset(ctype for ctype, events in _TRIGGERS.items() if event in events)
+    for event in ALL_EVENTS
+}
+
+
 async def _unlock_achievement(db: AsyncSession, user: User, achievement: Achievement):
     ua = UserAchievement(user_id=user.id, achievement_id=achievement.id)
     db.add(ua)
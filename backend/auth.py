@@ -1,11 +1,14 @@
+import asyncio
 import hashlib
 import hmac
 import json
 import base64
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
+from fastapi import HTTPException
 
 from backend.config import settings
 
@@ -56,20 +59,61 @@ def _jwt_decode(token: str, secret: str) -> dict | None:
         return None
 
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+# bcrypt runs on a small dedicated pool so that logins don't block the
+# event loop.  Callers beyond the workers plus BCRYPT_MAX_QUEUE waiting
+# are turned away with 503 instead of piling up behind each other.
+_bcrypt_pool = ThreadPoolExecutor(
+    max_workers=max(settings.BCRYPT_MAX_WORKERS, 1), thread_name_prefix="bcrypt",
+)
+_bcrypt_in_flight = 0
+
+
+async def _run_bcrypt(fn, *args):
+    global _bcrypt_in_flight
+    if _bcrypt_in_flight >= max(settings.BCRYPT_MAX_WORKERS, 1) + settings.BCRYPT_MAX_QUEUE:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many sign-in attempts in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _bcrypt_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_bcrypt_pool, fn, *args)
+    finally:
+        _bcrypt_in_flight -= 1
+
+
+def _hash(secret: str) -> str:
+    return bcrypt.hashpw(secret.encode(), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode()
+
+
+def _check(secret: str, hashed: str) -> bool:
+    return bcrypt.checkpw(secret.encode(), hashed.encode())
 
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+async def hash_password(password: str) -> str:
+    return await _run_bcrypt(_hash, password)
 
 
-def hash_pin(pin: str) -> str:
-    return bcrypt.hashpw(pin.encode(), bcrypt.gensalt()).decode()
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _run_bcrypt(_check, password, hashed)
 
 
-def verify_pin(pin: str, hashed: str) -> bool:
-    return bcrypt.checkpw(pin.encode(), hashed.encode())
+async def hash_pin(pin: str) -> str:
+    return await _run_bcrypt(_hash, pin)
+
+
+async def verify_pin(pin: str, hashed: str) -> bool:
+    return await _run_bcrypt(_check, pin, hashed)
+
+
+def needs_rehash(hashed: str) -> bool:
+    """True if ``hashed`` was made with a cost other than BCRYPT_ROUNDS."""
+    # Format: $2b$<cost>$<salt+hash>
+    try:
+        return int(hashed.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
 
 
 def create_access_token(user_id: int, role: str) -> str:
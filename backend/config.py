@@ -8,15 +8,37 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     REGISTRATION_ENABLED: bool = False
     DATABASE_URL: str = "sqlite+aiosqlite:////app/data/chores_os.db"
+    SQLITE_PROFILE: str = "balanced"
+    SQLITE_FOREIGN_KEYS: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     COOKIE_SECURE: bool = False
     LOGIN_RATE_LIMIT_MAX: int = 10
     PIN_RATE_LIMIT_MAX: int = 5
     REGISTER_RATE_LIMIT_MAX: int = 5
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 10000
+    EMOTE_RATE_LIMIT_MAX: int = 5
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_MAX_WORKERS: int = 2
+    BCRYPT_MAX_QUEUE: int = 32
     CORS_ORIGINS: str = ""
     MAX_UPLOAD_SIZE_MB: int = 5
     DAILY_RESET_HOUR: int = 0
+    DAILY_RESET_CATCHUP_DAYS: int = 7
+    SCHEDULER_LEASE_SECONDS: int = 60
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_ENTRIES: int = 1024
+    WS_SEND_QUEUE_SIZE: int = 100
+    WS_OVERFLOW_POLICY: str = "drop_oldest"
+    WS_BUS: str = "local"
+    WS_BUS_POLL_MS: int = 200
+    WS_COALESCE_MS: int = 250
+    WS_PING_INTERVAL_SECONDS: int = 25
+    WS_PONG_TIMEOUT_SECONDS: int = 20
     TZ: str = "Europe/London"
     VAPID_PRIVATE_KEY: str = ""
     VAPID_PUBLIC_KEY: str = ""
@@ -1,13 +1,83 @@
+import logging
+
+from sqlalchemy import event, inspect
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from backend.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Per-connection SQLite pragmas, selected with SQLITE_PROFILE.
+#   durable  - fsync on every commit; safest on unreliable storage
+#   balanced - WAL with synchronous=NORMAL: no corruption on power loss,
+#              at worst the last commits are lost (the default)
+#   fast     - no fsync and a large cache/mmap; for disposable data
+SQLITE_PROFILES = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 10000,
+        "cache_size": -8000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "busy_timeout": 5000,
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    """Return the pragmas applied to every new connection."""
+    profile = SQLITE_PROFILES.get(settings.SQLITE_PROFILE)
+    if profile is None:
+        logger.warning(
+            "Unknown SQLITE_PROFILE %r, using 'balanced'", settings.SQLITE_PROFILE,
+        )
+        profile = SQLITE_PROFILES["balanced"]
+    # Off by default: existing deletes rely on SQLite not enforcing FKs
+    return {**profile, "foreign_keys": "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF"}
+
+
+_is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+
+# aiosqlite defaults to NullPool (a new connection per session); pool
+# explicitly so connections, and their page cache, are reused.
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
 )
 
+
+if _is_sqlite:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in sqlite_pragmas().items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -15,10 +85,12 @@ class Base(DeclarativeBase):
     pass
 
 
+def _has_table(sync_conn, name: str) -> bool:
+    return inspect(sync_conn).has_table(name)
+
+
 async def init_db():
     async with engine.begin() as conn:
-        # Enable WAL mode
-        await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
         from backend.models import (  # noqa: F401
             User, Chore, ChoreAssignment, ChoreCategory, ChoreRotation,
             ChoreExclusion, ChoreAssignmentRule, QuestTemplate,
@@ -27,31 +99,34 @@ async def init_db():
             Notification, SpinResult, ApiKey, AuditLog, AppSetting,
             InviteCode, RefreshToken, PushSubscription,
             AvatarItem, UserAvatarItem,
-            Shoutout, VacationPeriod,
+            Shoutout, VacationPeriod, GenerationWatermark,
+            SchedulerLease, ScheduledJob, JobRun, SchemaVersion, UserDailyStats,
+            LeaderboardSnapshot, RateLimitCounter, WebSocketEvent,
         )
+        fresh = not await conn.run_sync(_has_table, "users")
         await conn.run_sync(Base.metadata.create_all)
 
-        # Lightweight column migrations for SQLite (create_all won't add
-        # new columns to existing tables).
-        _migrations = [
-            ("reward_redemptions", "fulfilled_by", "INTEGER REFERENCES users(id)"),
-            ("reward_redemptions", "fulfilled_at", "DATETIME"),
-            # v2 feature columns
-            ("users", "streak_freezes_used", "INTEGER DEFAULT 0"),
-            ("users", "streak_freeze_month", "INTEGER"),
-            ("chore_assignments", "feedback", "TEXT"),
-            ("rewards", "category", "VARCHAR(50)"),
-            ("achievements", "tier", "VARCHAR(10)"),
-            ("achievements", "group_key", "VARCHAR(50)"),
-            ("achievements", "sort_order", "INTEGER DEFAULT 0"),
-        ]
-        for table, col, typedef in _migrations:
-            try:
-                await conn.exec_driver_sql(
-                    f"ALTER TABLE {table} ADD COLUMN {col} {typedef}"
-                )
-            except Exception:
-                pass  # column already exists
+    # create_all won't alter existing tables; versioned migrations do
+    from backend.migrations import run_migrations
+    await run_migrations(fresh)
+
+    if _is_sqlite:
+        await log_sqlite_settings()
+
+
+async def log_sqlite_settings():
+    """Log the pragma values and pool sizing actually in effect."""
+    async with engine.connect() as conn:
+        effective = {}
+        for name in sqlite_pragmas():
+            result = await conn.exec_driver_sql(f"PRAGMA {name}")
+            effective[name] = result.scalar()
+    logger.info(
+        "SQLite profile %r: %s; pool_size=%d max_overflow=%d pool_timeout=%ds",
+        settings.SQLITE_PROFILE,
+        ", ".join(f"{k}={v}" for k, v in effective.items()),
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT,
+    )
 
 
 async def get_db():
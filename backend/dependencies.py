@@ -1,12 +1,13 @@
 from fastapi import Depends, HTTPException, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from backend.database import get_db
+from backend.database import async_session, get_db
 from backend.auth import decode_access_token
 from backend.models import User, UserRole
+from backend.services.user_cache import CurrentUser, snapshot, user_cache
 
 
-async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)) -> User:
+def _token_user_id(request: Request) -> int:
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Not authenticated")
@@ -14,27 +15,76 @@ async def get_current_user(request: Request, db: AsyncSession = Depends(get_db))
     payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
-    user_id = int(payload["sub"])
+    return int(payload["sub"])
+
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)) -> User:
+    user_id = _token_user_id(request)
+    generation = user_cache.generation
     result = await db.execute(select(User).where(User.id == user_id, User.is_active == True))
     user = result.scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=401, detail="User not found or inactive")
+    user_cache.put(snapshot(user), generation)
     return user
 
 
-async def require_parent(user: User = Depends(get_current_user)) -> User:
+async def get_current_identity(request: Request) -> CurrentUser:
+    """The caller as a cached ``CurrentUser`` snapshot.
+
+    For endpoints that only need identity, role or balances to display;
+    a cache hit needs no database access.  Use ``get_current_user`` to
+    modify the user.
+    """
+    user_id = _token_user_id(request)
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    generation = user_cache.generation
+    async with async_session() as db:
+        result = await db.execute(
+            select(
+                User.id, User.username, User.display_name, User.role,
+                User.points_balance, User.total_points_earned,
+            ).where(User.id == user_id, User.is_active == True)
+        )
+        row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=401, detail="User not found or inactive")
+    user = snapshot(row)
+    user_cache.put(user, generation)
+    return user
+
+
+def _check_parent(user):
     if user.role not in (UserRole.parent, UserRole.admin):
         raise HTTPException(status_code=403, detail="Parent or admin role required")
     return user
 
 
-async def require_admin(user: User = Depends(get_current_user)) -> User:
+def _check_admin(user):
     if user.role != UserRole.admin:
         raise HTTPException(status_code=403, detail="Admin role required")
     return user
 
 
+async def require_parent(user: User = Depends(get_current_user)) -> User:
+    return _check_parent(user)
+
+
+async def require_admin(user: User = Depends(get_current_user)) -> User:
+    return _check_admin(user)
+
+
 async def require_kid(user: User = Depends(get_current_user)) -> User:
     if user.role != UserRole.kid:
         raise HTTPException(status_code=403, detail="Kid role required")
     return user
+
+
+async def require_parent_identity(user: CurrentUser = Depends(get_current_identity)) -> CurrentUser:
+    return _check_parent(user)
+
+
+async def require_admin_identity(user: CurrentUser = Depends(get_current_identity)) -> CurrentUser:
+    return _check_admin(user)
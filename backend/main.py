@@ -1,8 +1,7 @@
-import asyncio
 import logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s: %(message)s")
 from contextlib import asynccontextmanager
-from datetime import datetime, date, timedelta, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
@@ -13,61 +12,68 @@ from sqlalchemy import delete
 
 from backend.config import settings
 from backend.database import init_db, async_session
+from backend.migrations import run_backfills
 from backend.seed import seed_database
 from backend.auth import decode_access_token
 from backend.websocket_manager import ws_manager
 from backend.models import RefreshToken
-from backend.services.assignment_generator import generate_daily_assignments
+from backend.rate_limit import rate_limiter
+from backend.services.daily_reset import run_due_resets, next_reset_after
+from backend.services.scheduler import scheduler
 from backend.services.push_hook import install_push_hooks
+from backend.services.generation_hook import install_generation_hooks
+from backend.services.daily_stats import install_daily_stats_hooks
+from backend.services.achievement_sweep import reevaluate_achievements
+from backend.services.user_cache import install_user_cache_hooks
+from backend.services.interval_index import install_interval_index_hooks
+from backend.services.leaderboard import (
+    freeze_finished_weeks, install_leaderboard_hooks, next_week_boundary,
+)
 
 logger = logging.getLogger(__name__)
 
 STATIC_DIR = Path(__file__).parent.parent / "static"
 
 
-async def daily_reset_task():
-    """Background task that runs once per day at the configured hour.
-
-    Responsibilities:
-    - Generate today's recurring chore assignments (with rotation advancement)
-    - Clean up expired refresh tokens
-    """
-    while True:
-        now = datetime.now(timezone.utc)
-        target_hour = settings.DAILY_RESET_HOUR
-        next_run = now.replace(hour=target_hour, minute=0, second=0, microsecond=0)
-        if now >= next_run:
-            next_run += timedelta(days=1)
-        wait_seconds = (next_run - now).total_seconds()
-        await asyncio.sleep(wait_seconds)
-
-        try:
-            async with async_session() as db:
-                today = date.today()
-
-                await generate_daily_assignments(db, today)
-
-                # Clean up expired refresh tokens
-                await db.execute(
-                    delete(RefreshToken).where(
-                        RefreshToken.expires_at < datetime.now(timezone.utc)
-                    )
-                )
-
-                await db.commit()
-        except Exception:
-            logger.exception("Daily reset error")
+async def cleanup_expired_refresh_tokens():
+    async with async_session() as db:
+        await db.execute(
+            delete(RefreshToken).where(
+                RefreshToken.expires_at < datetime.now(timezone.utc)
+            )
+        )
+        await db.commit()
+
+
+# Background jobs.  Every worker runs the scheduler but only the lease
+# holder executes jobs, so running several uvicorn workers is safe.
+# The daily reset replays any days missed while the app was down.
+scheduler.register("daily_reset", run_due_resets, next_reset_after)
+scheduler.register("refresh_token_cleanup", cleanup_expired_refresh_tokens, next_reset_after)
+scheduler.register("rate_limit_cleanup", rate_limiter.purge, next_reset_after)
+scheduler.register("migration_backfills", run_backfills, lambda now: now + timedelta(hours=1))
+# After the backfills, so a first run can freeze past weeks from the rollup
+scheduler.register("leaderboard_snapshot", freeze_finished_weeks, next_week_boundary)
+# After the daily reset, so streak achievements see the new streaks
+scheduler.register("achievement_sweep", reevaluate_achievements, next_reset_after)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
     install_push_hooks()
+    install_generation_hooks()
+    install_daily_stats_hooks()
+    install_leaderboard_hooks()
+    install_user_cache_hooks()
+    install_interval_index_hooks()
     async with async_session() as db:
         await seed_database(db)
-    task = asyncio.create_task(daily_reset_task())
+    await ws_manager.start()
+    scheduler.start()
     yield
-    task.cancel()
+    await scheduler.stop()
+    await ws_manager.stop()
 
 
 app = FastAPI(title="ChoreQuest", lifespan=lifespan)
@@ -155,11 +161,16 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
         await websocket.close(code=4001)
         return
 
-    await ws_manager.connect(websocket, user_id)
+    conn = await ws_manager.connect(websocket, user_id)
     try:
         while True:
+            # Clients only send pongs; any frame shows the socket is alive
             await websocket.receive_text()
+            ws_manager.touch(conn)
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Also stops the connection's writer task
         ws_manager.disconnect(websocket, user_id)
 
 
@@ -0,0 +1,276 @@
+"""Versioned schema migrations.
+
+Each migration is an async function registered with ``@migration`` under
+a unique, increasing version number.  ``run_migrations`` applies every
+version missing from the ``schema_version`` table in order, each in its
+own transaction together with its version row, and logs how long each
+step took.  A failing step aborts startup instead of being ignored.
+
+A fresh database is built by ``create_all`` straight at the latest
+schema, so all versions are recorded as applied without running them.
+
+Migrations registered with ``backfill=True`` rewrite existing rows.
+They are not run at startup: ``run_backfills`` runs them from the
+background scheduler, in short batched transactions (see
+``backfill_in_batches``), so a large history can be migrated while the
+app keeps serving requests.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import inspect, select, union
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from backend.database import async_session, engine
+from backend.models import ChoreAssignment, PointTransaction, SchemaVersion
+from backend.services.clock import clock
+from backend.services.daily_stats import rebuild_daily_stats
+
+logger = logging.getLogger(__name__)
+
+# Rows updated per backfill transaction
+BACKFILL_BATCH_SIZE = 500
+
+# version -> (name, function, is_backfill)
+MIGRATIONS: dict[int, tuple[str, Callable[..., Awaitable], bool]] = {}
+
+
+def migration(version: int, name: str, *, backfill: bool = False):
+    """Register a migration.
+
+    Schema migrations receive an ``AsyncConnection`` inside the step's
+    transaction.  Backfills take no arguments and manage their own
+    transactions, normally through ``backfill_in_batches``.
+    """
+    def decorator(fn):
+        if version in MIGRATIONS:
+            raise ValueError(f"Duplicate migration version {version}")
+        MIGRATIONS[version] = (name, fn, backfill)
+        return fn
+    return decorator
+
+
+async def _applied_versions() -> set[int]:
+    async with engine.connect() as conn:
+        result = await conn.execute(select(SchemaVersion.version))
+        return set(result.scalars().all())
+
+
+async def _apply(version: int, step: Callable[[AsyncConnection], Awaitable] | None = None) -> bool:
+    """Record ``version`` and run ``step`` in one transaction.
+
+    The version row is written first so that the write lock is held
+    before the step runs; if another worker has already applied the
+    version the insert fails and the step is skipped.
+    """
+    name = MIGRATIONS[version][0]
+    table = SchemaVersion.__table__
+    t0 = time.monotonic()
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(table.insert().values(version=version, name=name))
+        except IntegrityError:
+            logger.info("Migration %d (%s) already applied by another worker", version, name)
+            return False
+        if step is not None:
+            await step(conn)
+        duration_ms = int((time.monotonic() - t0) * 1000)
+        await conn.execute(
+            table.update().where(table.c.version == version).values(duration_ms=duration_ms)
+        )
+    if step is not None:
+        logger.info("Applied migration %d (%s) in %d ms", version, name, duration_ms)
+    return True
+
+
+async def run_migrations(fresh: bool) -> None:
+    """Apply pending schema migrations in version order.
+
+    ``fresh`` means the tables were just created by ``create_all``, in
+    which case every version is stamped as applied without running.
+    """
+    applied = await _applied_versions()
+    pending = sorted(v for v in MIGRATIONS if v not in applied)
+    if not pending:
+        return
+
+    if fresh:
+        for version in pending:
+            await _apply(version)
+        logger.info("New database stamped at schema version %d", pending[-1])
+        return
+
+    for version in pending:
+        _, fn, is_backfill = MIGRATIONS[version]
+        if not is_backfill:
+            await _apply(version, fn)
+
+
+async def run_backfills() -> None:
+    """Run pending backfill migrations in version order."""
+    applied = await _applied_versions()
+    for version in sorted(MIGRATIONS):
+        name, fn, is_backfill = MIGRATIONS[version]
+        if not is_backfill or version in applied:
+            continue
+        t0 = time.monotonic()
+        logger.info("Starting backfill %d (%s)", version, name)
+        await fn()
+        await _apply(version)
+        logger.info(
+            "Backfill %d (%s) finished in %.1f s", version, name, time.monotonic() - t0,
+        )
+
+
+async def backfill_in_batches(
+    table: str,
+    columns: list[str],
+    pending: str,
+    compute: Callable[[Any], dict[str, Any]],
+    batch_size: int = BACKFILL_BATCH_SIZE,
+) -> int:
+    """Rewrite rows of ``table`` matching the SQL condition ``pending``.
+
+    Rows are read ``batch_size`` at a time (``rowid`` plus ``columns``),
+    ``compute(row)`` returns the new column values (the same keys for
+    every row), and each batch is written in its own short transaction.
+    ``compute`` must make the row stop matching ``pending`` so that an
+    interrupted backfill resumes where it stopped.  Returns the number
+    of rows updated.
+    """
+    total = 0
+    last_rowid = 0
+    while True:
+        async with engine.begin() as conn:
+            # Walk forward by rowid so each batch starts where the last
+            # one stopped instead of rescanning finished rows.
+            result = await conn.exec_driver_sql(
+                f"SELECT rowid, {', '.join(columns)} FROM {table} "
+                f"WHERE rowid > {last_rowid} AND ({pending}) "
+                f"ORDER BY rowid LIMIT {int(batch_size)}"
+            )
+            rows = result.all()
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+            updates = [{**compute(row), "_rowid": row[0]} for row in rows]
+            assignments = ", ".join(
+                f"{col} = :{col}" for col in updates[0] if col != "_rowid"
+            )
+            await conn.exec_driver_sql(
+                f"UPDATE {table} SET {assignments} WHERE rowid = :_rowid", updates,
+            )
+        total += len(rows)
+        # Give waiting requests a turn at the write lock
+        await asyncio.sleep(0)
+    return total
+
+
+def _column_names(sync_conn, table: str) -> set[str]:
+    return {c["name"] for c in inspect(sync_conn).get_columns(table)}
+
+
+async def _add_column(conn: AsyncConnection, table: str, column: str, typedef: str) -> None:
+    if column not in await conn.run_sync(_column_names, table):
+        await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {typedef}")
+
+
+# ---------------------------------------------------------------------------
+# Migrations
+# ---------------------------------------------------------------------------
+
+
+@migration(1, "legacy columns")
+async def _legacy_columns(conn: AsyncConnection) -> None:
+    """Columns previously added by the unversioned ALTER loop; databases
+    that already have them are left alone."""
+    for table, column, typedef in [
+        ("reward_redemptions", "fulfilled_by", "INTEGER REFERENCES users(id)"),
+        ("reward_redemptions", "fulfilled_at", "DATETIME"),
+        ("users", "streak_freezes_used", "INTEGER DEFAULT 0"),
+        ("users", "streak_freeze_month", "INTEGER"),
+        ("chore_assignments", "feedback", "TEXT"),
+        ("rewards", "category", "VARCHAR(50)"),
+        ("achievements", "tier", "VARCHAR(10)"),
+        ("achievements", "group_key", "VARCHAR(50)"),
+        ("achievements", "sort_order", "INTEGER DEFAULT 0"),
+    ]:
+        await _add_column(conn, table, column, typedef)
+
+
+@migration(2, "secondary indexes")
+async def _secondary_indexes(conn: AsyncConnection) -> None:
+    for statement in [
+        "CREATE INDEX IF NOT EXISTS ix_chore_assignments_user_date_status "
+        "ON chore_assignments (user_id, date, status)",
+        "CREATE INDEX IF NOT EXISTS ix_chore_assignments_date ON chore_assignments (date)",
+        "CREATE INDEX IF NOT EXISTS ix_point_transactions_user_created "
+        "ON point_transactions (user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_read_created "
+        "ON notifications (user_id, is_read, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_refresh_tokens_token_hash ON refresh_tokens (token_hash)",
+        "CREATE INDEX IF NOT EXISTS ix_audit_logs_created_at ON audit_logs (created_at)",
+    ]:
+        await conn.exec_driver_sql(statement)
+
+
+@migration(3, "point transaction local day")
+async def _point_transaction_local_day(conn: AsyncConnection) -> None:
+    await _add_column(conn, "point_transactions", "local_day", "DATE")
+    for statement in [
+        "CREATE INDEX IF NOT EXISTS ix_point_transactions_user_day "
+        "ON point_transactions (user_id, local_day)",
+        "CREATE INDEX IF NOT EXISTS ix_point_transactions_day ON point_transactions (local_day)",
+    ]:
+        await conn.exec_driver_sql(statement)
+
+
+@migration(4, "backfill point transaction local day", backfill=True)
+async def _backfill_point_transaction_local_day() -> None:
+    def compute(row) -> dict[str, Any]:
+        created_at = datetime.fromisoformat(row.created_at) if row.created_at else None
+        # Legacy rows without a timestamp can't be placed; file them far back
+        day = clock.local_date(created_at) if created_at else date.min
+        return {"local_day": day.isoformat()}
+
+    count = await backfill_in_batches(
+        "point_transactions", ["created_at"], "local_day IS NULL", compute,
+    )
+    logger.info("Backfilled local_day on %d point transactions", count)
+
+
+@migration(5, "build user daily stats", backfill=True)
+async def _build_user_daily_stats() -> None:
+    # Runs after the local_day backfill (version 4) that XP is grouped by.
+    # The rollup is inserted into its own table, so rather than
+    # backfill_in_batches each user's rows are rebuilt in a transaction
+    # of their own; rebuilding is idempotent, so an interrupted run
+    # simply starts again.
+    async with async_session() as db:
+        result = await db.execute(
+            union(
+                select(ChoreAssignment.user_id.distinct()),
+                select(PointTransaction.user_id.distinct()),
+            )
+        )
+        user_ids = sorted(result.scalars().all())
+    count = 0
+    for user_id in user_ids:
+        async with async_session() as db:
+            count += await rebuild_daily_stats(db, [user_id])
+            await db.commit()
+        # Give waiting requests a turn at the write lock
+        await asyncio.sleep(0)
+    logger.info("Built %d user daily stats rows for %d users", count, len(user_ids))
+
+
+@migration(6, "user daily stats day index")
+async def _user_daily_stats_day_index(conn: AsyncConnection) -> None:
+    await conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_user_daily_stats_day ON user_daily_stats (day)"
+    )
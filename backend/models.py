@@ -1,11 +1,12 @@
 import enum
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from sqlalchemy import (
     Integer, String, Text, Boolean, Float, Date, DateTime, Enum, JSON,
-    ForeignKey, UniqueConstraint,
+    ForeignKey, UniqueConstraint, Index,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.database import Base
+from backend.timeutil import local_date
 
 
 class UserRole(str, enum.Enum):
@@ -104,6 +105,7 @@ class RotationCadence(str, enum.Enum):
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (Index("ix_refresh_tokens_token_hash", "token_hash"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     token_hash: Mapped[str] = mapped_column(String, nullable=False)
@@ -173,7 +175,13 @@ class Chore(Base):
 
 class ChoreAssignment(Base):
     __tablename__ = "chore_assignments"
-    __table_args__ = (UniqueConstraint("chore_id", "user_id", "date"),)
+    __table_args__ = (
+        UniqueConstraint("chore_id", "user_id", "date"),
+        # Per-kid day/range lookups (stats, spin, achievements)
+        Index("ix_chore_assignments_user_date_status", "user_id", "date", "status"),
+        # Whole-family range scans (calendar, generator)
+        Index("ix_chore_assignments_date", "date"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     chore_id: Mapped[int] = mapped_column(ForeignKey("chores.id"), nullable=False)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -285,8 +293,19 @@ class RewardRedemption(Base):
     fulfiller = relationship("User", foreign_keys=[fulfilled_by])
 
 
+def _local_day_default(context) -> date:
+    # Evaluated after the created_at default, so both agree on the instant
+    created_at = context.get_current_parameters().get("created_at")
+    return local_date(created_at or datetime.now(timezone.utc))
+
+
 class PointTransaction(Base):
     __tablename__ = "point_transactions"
+    __table_args__ = (
+        Index("ix_point_transactions_user_created", "user_id", "created_at"),
+        Index("ix_point_transactions_user_day", "user_id", "local_day"),
+        Index("ix_point_transactions_day", "local_day"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     amount: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -295,10 +314,47 @@ class PointTransaction(Base):
     reference_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_by: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Household-local calendar day of created_at, for index range scans
+    local_day: Mapped[date | None] = mapped_column(Date, default=_local_day_default)
 
     user = relationship("User", foreign_keys=[user_id])
 
 
+class UserDailyStats(Base):
+    """Per-user, per-day rollup of XP and assignment outcomes.
+
+    Maintained in the same transaction as the assignment and point
+    transaction rows it summarizes (see ``services/daily_stats.py``).
+    Status columns count assignments by status, so ``completed`` does
+    not include ``verified``.  Days with nothing to count have no row.
+    """
+    __tablename__ = "user_daily_stats"
+    __table_args__ = (
+        # Whole-family day ranges (current-week leaderboard)
+        Index("ix_user_daily_stats_day", "day"),
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    xp_earned: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    assigned: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    verified: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    skipped: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class LeaderboardSnapshot(Base):
+    """A kid's frozen standing on the weekly leaderboard of a past week."""
+    __tablename__ = "leaderboard_snapshots"
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    weekly_xp: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    quests_completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    frozen_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    user = relationship("User")
+
+
 class Achievement(Base):
     __tablename__ = "achievements"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -359,6 +415,9 @@ class SeasonalEvent(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_read_created", "user_id", "is_read", "created_at"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     type: Mapped[NotificationType] = mapped_column(Enum(NotificationType), nullable=False)
@@ -401,6 +460,7 @@ class ApiKey(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (Index("ix_audit_logs_created_at", "created_at"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
     action: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -511,3 +571,83 @@ class VacationPeriod(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     creator = relationship("User")
+
+
+class GenerationWatermark(Base):
+    """Weeks whose recurring assignments have already been generated.
+
+    A row means the week is materialized and read endpoints can skip
+    auto-generation.  Rows are cleared whenever chores, assignment rules,
+    rotations, exclusions or vacations change.
+    """
+    __tablename__ = "generation_watermarks"
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    materialized_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class SchedulerLease(Base):
+    """Leadership lease for background jobs.
+
+    Only the worker whose ``owner`` holds an unexpired lease runs
+    scheduled jobs; the lease is renewed while it is alive and taken
+    over by another worker once it expires.
+    """
+    __tablename__ = "scheduler_leases"
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(100), nullable=False)
+    acquired_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class ScheduledJob(Base):
+    __tablename__ = "scheduled_jobs"
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    next_run_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_status: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    run_count: Mapped[int] = mapped_column(Integer, default=0)
+    failure_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class JobRun(Base):
+    __tablename__ = "job_runs"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_name: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    owner: Mapped[str] = mapped_column(String(100), nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    duration_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(10), nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class RateLimitCounter(Base):
+    """Recent request times of one key for the shared rate limiter
+    backend (see ``backend/rate_limit.py``).  Times are epoch seconds."""
+    __tablename__ = "rate_limit_counters"
+    key: Mapped[str] = mapped_column(String(200), primary_key=True)
+    # Space-separated, oldest first; at most the key's limit
+    stamps: Mapped[str] = mapped_column(Text, default="", nullable=False)
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+
+
+class WebSocketEvent(Base):
+    """A WebSocket message relayed between workers by the SQLite event
+    bus (see ``backend/services/ws_bus.py``); kept for a short while."""
+    __tablename__ = "ws_events"
+    # AUTOINCREMENT so ids never go backwards once old rows are deleted
+    __table_args__ = {"sqlite_autoincrement": True}
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    origin: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class SchemaVersion(Base):
+    """Applied schema migrations (see ``backend/migrations.py``)."""
+    __tablename__ = "schema_version"
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -1,24 +1,175 @@
+"""Request rate limiting for the auth and emote endpoints.
+
+Each key (e.g. ``login:<ip>``) keeps the times of its most recent
+allowed requests, at most ``max_requests`` of them.  A request is allowed
+if fewer than ``max_requests`` fall inside the window, which with the
+times kept oldest first only means comparing against the oldest one, so
+a check is O(1) and a key never holds more than its limit.  The result
+is the same as an unbounded sliding log.
+
+Times live in a backend chosen by ``RATE_LIMIT_BACKEND``:
+
+* ``memory`` - per worker, capped at ``RATE_LIMIT_MAX_KEYS`` keys with
+  least-recently-used eviction; a key expires one window after its last
+  allowed request.
+* ``sqlite`` - the ``rate_limit_counters`` table, so limits hold across
+  uvicorn workers.  Each check is one short write transaction.
+
+The limiter counts checks and rejections per key class (the part of the
+key before the first ``:``) for the admin rate-limit endpoint.
+"""
+
+import logging
 import time
-from collections import defaultdict
+from collections import OrderedDict, deque
+
 from fastapi import HTTPException
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from backend.config import settings
+from backend.database import engine
+from backend.models import RateLimitCounter
+
+logger = logging.getLogger(__name__)
+
+
+def _hit(stamps: deque, limit: int, window: int, now: float) -> float | None:
+    """Record a request in ``stamps`` if allowed.
+
+    Returns None when allowed, otherwise the seconds until the oldest
+    kept request leaves the window.  A ``limit`` of zero or less allows
+    nothing.
+    """
+    if limit <= 0:
+        return float(window)
+    if len(stamps) >= limit and stamps[0] > now - window:
+        return stamps[0] + window - now
+    # At the limit the oldest time has left the window; a longer deque
+    # (e.g. after the limit was lowered) is trimmed to the newest times.
+    stamps.append(now)
+    while len(stamps) > limit:
+        stamps.popleft()
+    return None
+
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> (request times, expires at), least recently used first
+        self._keys: OrderedDict[str, tuple[deque, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
 
+    async def hit(self, key: str, limit: int, window: int, now: float) -> float | None:
+        stamps, expires_at = self._keys.pop(key, (None, 0.0))
+        if stamps is None or expires_at <= now:
+            stamps = deque()
+        retry_after = _hit(stamps, limit, window, now)
+        self._keys[key] = (stamps, stamps[-1] + window if stamps else now)
+        self._evict(now)
+        return retry_after
 
-class SlidingWindowRateLimiter:
-    def __init__(self):
-        self._windows: dict[str, list[float]] = defaultdict(list)
+    def _evict(self, now: float) -> None:
+        while len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+        # Drop expired keys from the idle end; stops at the first live one
+        while self._keys:
+            key, (_, expires_at) = next(iter(self._keys.items()))
+            if expires_at > now:
+                break
+            del self._keys[key]
 
-    def check(self, key: str, max_requests: int, window_seconds: int):
-        now = time.time()
-        cutoff = now - window_seconds
-        self._windows[key] = [t for t in self._windows[key] if t > cutoff]
-        if len(self._windows[key]) >= max_requests:
-            retry_after = int(self._windows[key][0] + window_seconds - now) + 1
+    async def purge(self, now: float) -> int:
+        expired = [key for key, (_, expires_at) in self._keys.items() if expires_at <= now]
+        for key in expired:
+            del self._keys[key]
+        return len(expired)
+
+
+class SQLiteBackend:
+    name = "sqlite"
+
+    async def hit(self, key: str, limit: int, window: int, now: float) -> float | None:
+        table = RateLimitCounter.__table__
+        async with engine.begin() as conn:
+            # Touch the row first so this transaction holds the write lock
+            # while the times are read and updated.
+            stmt = sqlite_insert(table).values(key=key, stamps="", expires_at=0.0)
+            result = await conn.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["key"], set_={"key": stmt.excluded.key},
+                ).returning(table.c.stamps, table.c.expires_at)
+            )
+            row = result.one()
+            stamps = deque(map(float, row.stamps.split())) if row.expires_at > now else deque()
+            retry_after = _hit(stamps, limit, window, now)
+            await conn.execute(
+                update(table).where(table.c.key == key).values(
+                    stamps=" ".join(repr(t) for t in stamps),
+                    expires_at=stamps[-1] + window if stamps else now,
+                )
+            )
+        return retry_after
+
+    async def purge(self, now: float) -> int:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                delete(RateLimitCounter).where(RateLimitCounter.expires_at <= now)
+            )
+        return result.rowcount
+
+
+class RateLimiter:
+    def __init__(self, backend):
+        self.backend = backend
+        # key class -> {"checked", "rejected", "errors"} since startup
+        self.metrics: dict[str, dict[str, int]] = {}
+
+    async def check(self, key: str, max_requests: int, window_seconds: int):
+        """Count a request against ``key``; raise 429 over the limit."""
+        counts = self.metrics.setdefault(
+            key.split(":", 1)[0], {"checked": 0, "rejected": 0, "errors": 0},
+        )
+        counts["checked"] += 1
+        try:
+            retry_after = await self.backend.hit(key, max_requests, window_seconds, time.time())
+        except Exception:
+            # A broken backend must not lock everyone out of signing in
+            counts["errors"] += 1
+            logger.warning(
+                "Rate limit backend %s failed; allowing %s", self.backend.name, key, exc_info=True,
+            )
+            return
+        if retry_after is not None:
+            counts["rejected"] += 1
             raise HTTPException(
                 status_code=429,
                 detail="Too many requests",
-                headers={"Retry-After": str(retry_after)},
+                headers={"Retry-After": str(int(retry_after) + 1)},
             )
-        self._windows[key].append(now)
+
+    async def purge(self) -> int:
+        """Delete expired keys.  Returns how many were removed."""
+        return await self.backend.purge(time.time())
+
+    def stats(self) -> dict:
+        stats = {"backend": self.backend.name, "classes": self.metrics}
+        if isinstance(self.backend, MemoryBackend):
+            stats["tracked_keys"] = len(self.backend)
+            stats["max_keys"] = self.backend.max_keys
+        return stats
+
+
+def _make_backend():
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBackend()
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        logger.warning("Unknown RATE_LIMIT_BACKEND %r, using 'memory'", settings.RATE_LIMIT_BACKEND)
+    return MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
 
 
-rate_limiter = SlidingWindowRateLimiter()
+rate_limiter = RateLimiter(_make_backend())
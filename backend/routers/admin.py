@@ -9,7 +9,10 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database import get_db
-from backend.models import User, ApiKey, InviteCode, AuditLog, AppSetting
+from backend.models import (
+    User, ApiKey, InviteCode, AuditLog, AppSetting, GenerationWatermark,
+    SchedulerLease, ScheduledJob, JobRun, UserRole,
+)
 from backend.schemas import (
     UserResponse,
     AdminUserUpdate,
@@ -20,9 +23,23 @@ from backend.schemas import (
     InviteCodeResponse,
     AuditLogResponse,
     SettingsUpdate,
+    GenerationWatermarkResponse,
+    ScheduledJobResponse,
+    JobRunResponse,
+    SchedulerStatusResponse,
 )
 from backend.auth import hash_password
-from backend.dependencies import require_admin, require_parent, get_current_user
+from backend.rate_limit import rate_limiter
+from backend.dependencies import (
+    require_admin, require_admin_identity, require_parent, get_current_user,
+)
+from backend.services.scheduler import LEASE_NAME
+from backend.services.daily_stats import rebuild_daily_stats
+from backend.services.family_streak import clear_family_streak
+from backend.services.leaderboard import current_week
+from backend.services.achievement_sweep import reevaluate_achievements
+from backend.services.user_cache import CurrentUser
+from backend.websocket_manager import ws_manager
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -57,10 +74,14 @@ async def update_user(
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
+    was_kid = user.role == UserRole.kid and user.is_active
     if body.role is not None:
         user.role = body.role
     if body.is_active is not None:
         user.is_active = body.is_active
+    # The settled family streak covers the active kids at the time
+    if was_kid != (user.role == UserRole.kid and user.is_active):
+        await clear_family_streak(db)
 
     user.updated_at = datetime.now(timezone.utc)
     await db.commit()
@@ -81,6 +102,8 @@ async def deactivate_user(
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
+    if user.role == UserRole.kid and user.is_active:
+        await clear_family_streak(db)
     user.is_active = False
     user.updated_at = datetime.now(timezone.utc)
     await db.commit()
@@ -101,7 +124,7 @@ async def reset_user_password(
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.password_hash = hash_password(body.new_password)
+    user.password_hash = await hash_password(body.new_password)
     user.updated_at = datetime.now(timezone.utc)
     await db.commit()
     return {"detail": f"Password reset for {user.username}"}
@@ -332,3 +355,125 @@ async def update_settings(
 
     await db.commit()
     return {"detail": "Settings updated"}
+
+
+# ============================================================
+# Assignment Generation
+# ============================================================
+
+# ---------- GET /generation-watermarks ----------
+@router.get("/generation-watermarks", response_model=list[GenerationWatermarkResponse])
+async def list_generation_watermarks(
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """List weeks whose recurring assignments are materialized, newest first."""
+    result = await db.execute(
+        select(GenerationWatermark).order_by(GenerationWatermark.week_start.desc())
+    )
+    marks = result.scalars().all()
+    return [GenerationWatermarkResponse.model_validate(m) for m in marks]
+
+
+# ============================================================
+# Statistics
+# ============================================================
+
+# ---------- POST /daily-stats/rebuild ----------
+@router.post("/daily-stats/rebuild")
+async def rebuild_user_daily_stats(
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """Recompute the daily stats rollup from assignments and the XP ledger."""
+    rows = await rebuild_daily_stats(db)
+    # The settled family streak is derived from the rollup
+    await clear_family_streak(db)
+    await db.commit()
+    current_week.invalidate()
+    return {"detail": f"Rebuilt daily stats ({rows} rows)", "rows": rows}
+
+
+# ============================================================
+# Rate limits
+# ============================================================
+
+# ---------- GET /rate-limits ----------
+@router.get("/rate-limits")
+async def get_rate_limit_stats(
+    _admin: CurrentUser = Depends(require_admin_identity),
+):
+    """Rate limiter backend and, per key class, checks and rejections
+    since this worker started."""
+    return rate_limiter.stats()
+
+
+# ============================================================
+# WebSockets
+# ============================================================
+
+# ---------- GET /websockets ----------
+@router.get("/websockets")
+async def get_websocket_stats(
+    _admin: CurrentUser = Depends(require_admin_identity),
+):
+    """Connections per user, message and byte rates, send latency and
+    drop/reap counters for this worker."""
+    return {**ws_manager.stats(), "by_user": ws_manager.connections()}
+
+
+# ============================================================
+# Achievements
+# ============================================================
+
+# ---------- POST /achievements/reevaluate ----------
+@router.post("/achievements/reevaluate")
+async def reevaluate_all_achievements(
+    dry_run: bool = Query(True),
+    _admin: CurrentUser = Depends(require_admin_identity),
+):
+    """Check every active kid against every achievement and unlock what
+    they qualify for.  Defaults to a dry run that only reports."""
+    return await reevaluate_achievements(dry_run=dry_run)
+
+
+# ============================================================
+# Scheduler
+# ============================================================
+
+# ---------- GET /jobs ----------
+@router.get("/jobs", response_model=SchedulerStatusResponse)
+async def get_scheduler_status(
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """Show which worker runs background jobs and each job's last outcome."""
+    lease = await db.get(SchedulerLease, LEASE_NAME)
+    result = await db.execute(select(ScheduledJob).order_by(ScheduledJob.name))
+    jobs = result.scalars().all()
+    return SchedulerStatusResponse(
+        leader=lease.owner if lease else None,
+        lease_expires_at=lease.expires_at if lease else None,
+        jobs=[ScheduledJobResponse.model_validate(j) for j in jobs],
+    )
+
+
+# ---------- GET /jobs/{name}/runs ----------
+@router.get("/jobs/{name}/runs", response_model=list[JobRunResponse])
+async def list_job_runs(
+    name: str,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_admin),
+):
+    """Recent runs of a background job, newest first."""
+    result = await db.execute(
+        select(JobRun)
+        .where(JobRun.job_name == name)
+        .order_by(JobRun.id.desc())
+        .limit(limit)
+    )
+    runs = result.scalars().all()
+    if not runs and await db.get(ScheduledJob, name) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return [JobRunResponse.model_validate(r) for r in runs]
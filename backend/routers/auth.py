@@ -24,6 +24,7 @@ from backend.auth import (
     verify_password,
     hash_pin,
     verify_pin,
+    needs_rehash,
     create_access_token,
     create_refresh_token,
     decode_refresh_token,
@@ -90,7 +91,7 @@ async def register(
     response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    rate_limiter.check(f"register:{request.client.host}", 5, 3600)
+    await rate_limiter.check(f"register:{request.client.host}", settings.REGISTER_RATE_LIMIT_MAX, 3600)
 
     # Check if this is the very first user
     count_result = await db.execute(select(func.count()).select_from(User))
@@ -132,7 +133,7 @@ async def register(
     user = User(
         username=body.username,
         display_name=body.display_name,
-        password_hash=hash_password(body.password),
+        password_hash=await hash_password(body.password),
         role=role,
     )
     db.add(user)
@@ -165,17 +166,21 @@ async def login(
     response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    rate_limiter.check(f"login:{request.client.host}", 10, 300)
+    await rate_limiter.check(f"login:{request.client.host}", settings.LOGIN_RATE_LIMIT_MAX, 300)
 
     result = await db.execute(select(User).where(User.username == body.username))
     user = result.scalar_one_or_none()
 
-    if user is None or not verify_password(body.password, user.password_hash):
+    if user is None or not await verify_password(body.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is disabled")
 
+    # Upgrade the hash to the configured work factor while we have the password
+    if needs_rehash(user.password_hash):
+        user.password_hash = await hash_password(body.password)
+
     # Audit log
     audit = AuditLog(
         user_id=user.id,
@@ -197,17 +202,20 @@ async def pin_login(
     response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    rate_limiter.check(f"pin:{request.client.host}", 5, 900)
+    await rate_limiter.check(f"pin:{request.client.host}", settings.PIN_RATE_LIMIT_MAX, 900)
 
     result = await db.execute(select(User).where(User.username == body.username))
     user = result.scalar_one_or_none()
 
-    if user is None or user.pin_hash is None or not verify_pin(body.pin, user.pin_hash):
+    if user is None or user.pin_hash is None or not await verify_pin(body.pin, user.pin_hash):
         raise HTTPException(status_code=401, detail="Invalid username or PIN")
 
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is disabled")
 
+    if needs_rehash(user.pin_hash):
+        user.pin_hash = await hash_pin(body.pin)
+
     # Audit log
     audit = AuditLog(
         user_id=user.id,
@@ -338,10 +346,10 @@ async def change_password(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    if not verify_password(body.current_password, user.password_hash):
+    if not await verify_password(body.current_password, user.password_hash):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
 
-    user.password_hash = hash_password(body.new_password)
+    user.password_hash = await hash_password(body.new_password)
     user.updated_at = datetime.now(timezone.utc)
 
     # Invalidate all refresh tokens
@@ -374,7 +382,7 @@ async def set_pin(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    user.pin_hash = hash_pin(body.pin)
+    user.pin_hash = await hash_pin(body.pin)
     user.updated_at = datetime.now(timezone.utc)
     await db.commit()
     return {"detail": "PIN set successfully"}
@@ -21,7 +21,8 @@ from backend.models import (
 from backend.schemas import TradeRequest
 from backend.dependencies import get_current_user, require_parent
 from backend.websocket_manager import ws_manager
-from backend.services.assignment_generator import auto_generate_week_assignments
+from backend.services.assignment_generator import ensure_week_generated
+from backend.services.clock import clock
 
 router = APIRouter(prefix="/api/calendar", tags=["calendar"])
 
@@ -39,11 +40,12 @@ async def get_weekly_calendar(
 
     If no week_start is provided, defaults to the current week's Monday.
     The provided date must be a Monday.
-    Auto-generates ChoreAssignment records for recurring chores.
+    Auto-generates ChoreAssignment records for recurring chores unless
+    the week is already materialized.
     Returns assignments grouped by day.
     """
     if week_start is None:
-        today = date.today()
+        today = clock.today()
         week_start = today - timedelta(days=today.weekday())
     elif week_start.weekday() != 0:
         raise HTTPException(status_code=400, detail="week_start must be a Monday")
@@ -51,7 +53,7 @@ async def get_weekly_calendar(
     week_end = week_start + timedelta(days=6)
 
     # Auto-generate missing assignments for the week
-    await auto_generate_week_assignments(db, week_start)
+    await ensure_week_generated(db, week_start)
 
     # Fetch all assignments for the week (exclude soft-deleted chores)
     result = await db.execute(
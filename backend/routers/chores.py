@@ -1,7 +1,7 @@
 import logging
 import os
 import uuid
-from datetime import datetime, date, timezone, timedelta
+from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy import select, and_, func, delete, text
@@ -22,7 +22,6 @@ from backend.models import (
     AssignmentStatus,
     PointTransaction,
     PointType,
-    SeasonalEvent,
     Notification,
     NotificationType,
     Recurrence,
@@ -43,10 +42,16 @@ from backend.schemas import (
 )
 from backend.config import settings
 from backend.dependencies import get_current_user, require_parent
-from backend.achievements import check_achievements
+from backend.achievements import (
+    check_achievements, EVENT_QUEST_COMPLETED, EVENT_QUEST_VERIFIED,
+)
 from backend.websocket_manager import ws_manager
-from backend.services.recurrence import should_create_on_day
+from backend.services.recurrence import compile_chore_recurrence
 from backend.services.rotation import get_rotation_kid_for_day
+from backend.services.generation_hook import invalidate_generation
+from backend.services.daily_stats import refresh_daily_stats
+from backend.services.interval_index import interval_index
+from backend.services.clock import clock
 
 logger = logging.getLogger(__name__)
 
@@ -306,7 +311,7 @@ async def create_chore(
     db.add(chore)
     await db.flush()
 
-    today = date.today()
+    today = clock.today()
     for uid in body.assigned_user_ids:
         u_result = await db.execute(select(User).where(User.id == uid))
         if u_result.scalar_one_or_none() is None:
@@ -338,11 +343,18 @@ async def cleanup_all_stale(
         .where(ChoreAssignment.status == AssignmentStatus.pending)
     )
     pending_count = pending_count_result.scalar() or 0
+    pending_cells_result = await db.execute(
+        select(ChoreAssignment.user_id, ChoreAssignment.date)
+        .where(ChoreAssignment.status == AssignmentStatus.pending)
+        .distinct()
+    )
+    pending_cells = {(row.user_id, row.date) for row in pending_cells_result.all()}
     await db.execute(
         delete(ChoreAssignment).where(
             ChoreAssignment.status == AssignmentStatus.pending
         )
     )
+    await refresh_daily_stats(db, pending_cells)
 
     excl_count_result = await db.execute(
         select(func.count()).select_from(ChoreExclusion)
@@ -350,6 +362,9 @@ async def cleanup_all_stale(
     excl_count = excl_count_result.scalar() or 0
     await db.execute(delete(ChoreExclusion))
 
+    # Bulk deletes bypass the generation hook — force a fresh week build
+    await invalidate_generation(db)
+
     await db.commit()
 
     return {
@@ -383,11 +398,11 @@ async def update_chore(
 
     for field, value in update_data.items():
         setattr(chore, field, value)
-    chore.updated_at = datetime.now(timezone.utc)
+    chore.updated_at = clock.now()
 
     newly_assigned = []
     if assigned_user_ids is not None:
-        today = date.today()
+        today = clock.today()
         for uid in assigned_user_ids:
             existing = await db.execute(
                 select(ChoreAssignment).where(
@@ -429,7 +444,7 @@ async def delete_chore(
 ):
     chore = await _get_chore_or_404(db, chore_id)
     chore.is_active = False
-    chore.updated_at = datetime.now(timezone.utc)
+    chore.updated_at = clock.now()
     await db.commit()
     await ws_manager.broadcast(_CHORE_CHANGED, exclude_user=user.id)
     return None
@@ -490,7 +505,7 @@ async def assign_chore(
 ):
     chore = await _get_chore_or_404(db, chore_id)
 
-    today = date.today()
+    today = clock.today()
     submitted_user_ids = {item.user_id for item in body.assignments}
 
     # Deactivate rules for kids NOT in the submitted list
@@ -537,14 +552,14 @@ async def assign_chore(
             existing_rotation.kid_ids = kid_ids
             existing_rotation.cadence = body.rotation.cadence
             existing_rotation.current_index = 0
-            existing_rotation.last_rotated = datetime.now(timezone.utc)
+            existing_rotation.last_rotated = clock.now()
         else:
             existing_rotation = ChoreRotation(
                 chore_id=chore_id,
                 kid_ids=kid_ids,
                 cadence=body.rotation.cadence,
                 current_index=0,
-                last_rotated=datetime.now(timezone.utc),
+                last_rotated=clock.now(),
             )
             db.add(existing_rotation)
             await db.flush()
@@ -636,9 +651,7 @@ async def assign_chore(
             db.add(rule)
 
         # Create today's assignment if schedule matches
-        create_today = should_create_on_day(
-            item.recurrence, today, chore.created_at.weekday(), item.custom_days,
-        )
+        create_today = compile_chore_recurrence(chore, rule).occurs_on(today)
 
         # Rotation filtering: only the current rotation kid gets today's assignment
         if create_today and rotation_kid_id is not None:
@@ -672,7 +685,7 @@ async def assign_chore(
                 existing_assignment.completed_at = None
                 existing_assignment.verified_at = None
                 existing_assignment.verified_by = None
-                existing_assignment.updated_at = datetime.now(timezone.utc)
+                existing_assignment.updated_at = clock.now()
 
         db.add(_quest_assigned_notification(item.user_id, chore))
 
@@ -715,7 +728,7 @@ async def debug_chore(
     )
     rules = rules_result.scalars().all()
 
-    today = date.today()
+    today = clock.today()
     week_start = today - timedelta(days=today.weekday())
     week_end = week_start + timedelta(days=6)
 
@@ -841,8 +854,8 @@ async def complete_chore(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    today = date.today()
-    now = datetime.now(timezone.utc)
+    now = clock.now()
+    today = clock.local_date(now)
 
     result = await db.execute(
         select(ChoreAssignment)
@@ -905,6 +918,8 @@ async def complete_chore(
     assignment.updated_at = now
 
     await db.commit()
+    # Completion criteria are only evaluated on this event
+    await check_achievements(db, user, EVENT_QUEST_COMPLETED)
 
     # Notify parents for approval
     parent_result = await db.execute(
@@ -951,8 +966,8 @@ async def verify_chore(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_parent),
 ):
-    today = date.today()
-    now = datetime.now(timezone.utc)
+    now = clock.now()
+    today = clock.local_date(now)
 
     result = await db.execute(
         select(ChoreAssignment)
@@ -978,20 +993,13 @@ async def verify_chore(
     assignment.verified_by = user.id
     assignment.updated_at = now
 
-    # Calculate event multiplier (use naive UTC to match SQLite storage)
-    now_naive = now.replace(tzinfo=None)
-    ev_result = await db.execute(
-        select(SeasonalEvent).where(
-            SeasonalEvent.is_active == True,
-            SeasonalEvent.start_date <= now_naive,
-            SeasonalEvent.end_date >= now_naive,
-        )
-    )
-    active_events = ev_result.scalars().all()
+    # Calculate event multiplier from the in-memory event index
+    await interval_index.ensure_loaded(db)
+    active_events = interval_index.active_events(now)
 
     multiplier = 1.0
-    for event in active_events:
-        multiplier *= event.multiplier
+    for _, event_multiplier in active_events:
+        multiplier *= event_multiplier
 
     # Award base points
     db.add(PointTransaction(
@@ -1006,7 +1014,7 @@ async def verify_chore(
     if multiplier > 1.0:
         bonus_points = int(base_points * multiplier) - base_points
         if bonus_points > 0:
-            event_names = ", ".join(e.title for e in active_events)
+            event_names = ", ".join(title for title, _ in active_events)
             db.add(PointTransaction(
                 user_id=assignment.user_id,
                 amount=bonus_points,
@@ -1044,14 +1052,13 @@ async def verify_chore(
             kid.last_streak_date = today
         elif gap > 1:
             # Check if all gap days were vacation days (streak shouldn't break)
-            from backend.routers.vacation import is_vacation_day
-            all_vacation = True
-            for offset in range(1, gap):
-                gap_day = kid.last_streak_date + timedelta(days=offset)
-                if not await is_vacation_day(db, gap_day):
-                    all_vacation = False
-                    break
-            if all_vacation:
+            from backend.routers.vacation import vacation_days_between
+            gap_vacation_days = await vacation_days_between(
+                db,
+                kid.last_streak_date + timedelta(days=1),
+                today - timedelta(days=1),
+            )
+            if len(gap_vacation_days) == gap - 1:
                 kid.current_streak += 1
                 kid.last_streak_date = today
             else:
@@ -1089,7 +1096,7 @@ async def verify_chore(
         ))
 
     await db.commit()
-    await check_achievements(db, kid)
+    await check_achievements(db, kid, EVENT_QUEST_VERIFIED)
 
     # Deactivate assignment rule for one-time quests so they no longer
     # appear as assigned after completion.
@@ -1145,8 +1152,8 @@ async def uncomplete_chore(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_parent),
 ):
-    today = date.today()
-    now = datetime.now(timezone.utc)
+    now = clock.now()
+    today = clock.local_date(now)
 
     result = await db.execute(
         select(ChoreAssignment).where(
@@ -1229,8 +1236,8 @@ async def skip_chore(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_parent),
 ):
-    today = date.today()
-    now = datetime.now(timezone.utc)
+    now = clock.now()
+    today = clock.local_date(now)
 
     result = await db.execute(
         select(ChoreAssignment).where(
@@ -3,14 +3,19 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 
-from backend.models import User
-from backend.dependencies import get_current_user
+from backend.config import settings
+from backend.dependencies import get_current_identity
+from backend.rate_limit import rate_limiter
+from backend.services.user_cache import CurrentUser
 from backend.websocket_manager import ws_manager
 
 router = APIRouter(prefix="/api/emotes", tags=["emotes"])
 
 VALID_EMOTES = ["dance", "wave", "cheer", "flex", "sparkle", "highfive"]
 
+# Seconds over which EMOTE_RATE_LIMIT_MAX applies
+EMOTE_RATE_LIMIT_WINDOW = 10
+
 
 class EmoteRequest(BaseModel):
     emote: str = Field(max_length=20)
@@ -20,11 +25,14 @@ class EmoteRequest(BaseModel):
 @router.post("")
 async def send_emote(
     body: EmoteRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_identity),
 ):
     """Send an emote — broadcast to all connected users."""
     if body.emote not in VALID_EMOTES:
         raise HTTPException(status_code=400, detail=f"Invalid emote. Valid: {VALID_EMOTES}")
+    await rate_limiter.check(
+        f"emote:{current_user.id}", settings.EMOTE_RATE_LIMIT_MAX, EMOTE_RATE_LIMIT_WINDOW,
+    )
 
     await ws_manager.broadcast({
         "type": "emote",
@@ -9,6 +9,8 @@ from backend.models import SeasonalEvent, User, UserRole, Notification, Notifica
 from backend.schemas import EventCreate, EventUpdate, EventResponse
 from backend.dependencies import get_current_user, require_parent
 from backend.websocket_manager import ws_manager
+from backend.services.interval_index import interval_index
+from backend.services.clock import clock
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
@@ -20,7 +22,7 @@ def _make_aware(dt: datetime) -> datetime:
 
 def _event_to_response(event: SeasonalEvent) -> dict:
     """Build an EventResponse dict with computed is_active based on date range + DB flag."""
-    now = datetime.now(timezone.utc)
+    now = clock.now()
     in_range = _make_aware(event.start_date) <= now <= _make_aware(event.end_date)
     data = EventResponse.model_validate(event).model_dump()
     data["is_active"] = event.is_active and in_range
@@ -79,6 +81,7 @@ async def create_event(
 
     await db.commit()
     await db.refresh(event)
+    await interval_index.rebuild(db)
     await ws_manager.broadcast({"type": "data_changed", "data": {"entity": "event"}}, exclude_user=parent.id)
     return _event_to_response(event)
 
@@ -114,6 +117,7 @@ async def update_event(
 
     await db.commit()
     await db.refresh(event)
+    await interval_index.rebuild(db)
     await ws_manager.broadcast({"type": "data_changed", "data": {"entity": "event"}})
     return _event_to_response(event)
 
@@ -134,6 +138,7 @@ async def end_event(
     event.is_active = False
     await db.commit()
     await db.refresh(event)
+    await interval_index.rebuild(db)
     await ws_manager.broadcast({"type": "data_changed", "data": {"entity": "event"}})
     return _event_to_response(event)
 
@@ -153,5 +158,6 @@ async def delete_event(
 
     await db.delete(event)
     await db.commit()
+    await interval_index.rebuild(db)
     await ws_manager.broadcast({"type": "data_changed", "data": {"entity": "event"}})
     return {"detail": "Event deleted"}
@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.database import get_db
 from backend.models import Notification
 from backend.schemas import NotificationResponse
-from backend.dependencies import get_current_user
+from backend.dependencies import get_current_identity
 
 router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 
@@ -17,7 +17,7 @@ async def list_notifications(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
-    user=Depends(get_current_user),
+    user=Depends(get_current_identity),
 ):
     """List notifications for the current user."""
     stmt = select(Notification).where(Notification.user_id == user.id)
@@ -36,7 +36,7 @@ async def list_notifications(
 @router.get("/unread-count")
 async def unread_count(
     db: AsyncSession = Depends(get_db),
-    user=Depends(get_current_user),
+    user=Depends(get_current_identity),
 ):
     """Return the count of unread notifications for the current user."""
     result = await db.execute(
@@ -53,7 +53,7 @@ async def unread_count(
 async def mark_read(
     notification_id: int,
     db: AsyncSession = Depends(get_db),
-    user=Depends(get_current_user),
+    user=Depends(get_current_identity),
 ):
     """Mark a single notification as read (must belong to the current user)."""
     result = await db.execute(
@@ -77,7 +77,7 @@ async def mark_read(
 @router.post("/read-all")
 async def mark_all_read(
     db: AsyncSession = Depends(get_db),
-    user=Depends(get_current_user),
+    user=Depends(get_current_identity),
 ):
     """Mark all notifications as read for the current user."""
     await db.execute(
@@ -1,6 +1,5 @@
 """Pet interaction endpoints — feed, pet, play for small XP bonuses."""
 import json
-from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
@@ -16,6 +15,8 @@ from backend.services.pet_leveling import (
     migrate_pet_xp,
     set_current_pet_xp,
 )
+from backend.services.clock import clock
+from backend.services.user_cache import user_cache
 
 router = APIRouter(prefix="/api/pets", tags=["pets"])
 
@@ -41,7 +42,7 @@ async def pet_interact(
         raise HTTPException(status_code=400, detail="No pet equipped")
 
     # ── Daily interaction limit ──
-    today_str = date.today().isoformat()
+    today_str = clock.today().isoformat()
     interactions = config.get("pet_interactions", {})
     if interactions.get("date") != today_str:
         interactions = {"date": today_str, "count": 0, "actions": []}
@@ -96,6 +97,7 @@ async def pet_interact(
         },
     )
     await db.commit()
+    user_cache.invalidate(user.id)
 
     # Sync in-memory user object so subsequent reads in this request are correct
     user.avatar_config = config
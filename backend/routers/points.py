@@ -22,7 +22,7 @@ from backend.schemas import (
     UserResponse,
 )
 from backend.dependencies import get_current_user, require_parent, require_admin
-from backend.achievements import check_achievements
+from backend.achievements import check_achievements, EVENT_POINTS_AWARDED
 from backend.websocket_manager import ws_manager
 
 router = APIRouter(prefix="/api/points", tags=["points"])
@@ -120,7 +120,7 @@ async def award_bonus(
     await db.refresh(tx)
 
     # Check achievements after bonus
-    await check_achievements(db, user)
+    await check_achievements(db, user, EVENT_POINTS_AWARDED)
 
     # WebSocket notification
     await ws_manager.send_to_user(user.id, {
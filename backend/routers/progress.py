@@ -1,17 +1,15 @@
 """Progress charts data endpoint — XP over time, completions, streaks."""
 
-from datetime import date, timedelta
+from datetime import timedelta
 
 from fastapi import APIRouter, Depends
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database import get_db
-from backend.models import (
-    User, UserRole, ChoreAssignment, AssignmentStatus,
-    PointTransaction,
-)
+from backend.models import User, UserRole, UserDailyStats
 from backend.dependencies import get_current_user
+from backend.services.clock import clock
 
 router = APIRouter(prefix="/api/progress", tags=["progress"])
 
@@ -22,7 +20,7 @@ async def get_progress(
     db: AsyncSession = Depends(get_db),
 ):
     """Return 30-day daily chart data for the current user (or all kids for parents)."""
-    today = date.today()
+    today = clock.today()
     start = today - timedelta(days=29)
 
     if current_user.role == UserRole.kid:
@@ -37,65 +35,34 @@ async def get_progress(
     if not user_ids:
         return {"days": [], "summary": {}}
 
-    # Daily XP earned
-    xp_result = await db.execute(
+    # Daily XP earned, quests completed and quests assigned
+    result = await db.execute(
         select(
-            func.date(PointTransaction.created_at).label("day"),
-            func.sum(PointTransaction.amount).label("xp"),
+            UserDailyStats.day,
+            func.sum(UserDailyStats.xp_earned).label("xp"),
+            func.sum(UserDailyStats.completed + UserDailyStats.verified).label("completed"),
+            func.sum(UserDailyStats.assigned).label("total"),
         )
         .where(
-            PointTransaction.user_id.in_(user_ids),
-            PointTransaction.amount > 0,
-            func.date(PointTransaction.created_at) >= start,
-            func.date(PointTransaction.created_at) <= today,
+            UserDailyStats.user_id.in_(user_ids),
+            UserDailyStats.day >= start,
+            UserDailyStats.day <= today,
         )
-        .group_by(func.date(PointTransaction.created_at))
+        .group_by(UserDailyStats.day)
     )
-    xp_by_day = {str(row.day): row.xp or 0 for row in xp_result.all()}
-
-    # Daily completed quests
-    completed_result = await db.execute(
-        select(
-            ChoreAssignment.date,
-            func.count().label("completed"),
-        )
-        .where(
-            ChoreAssignment.user_id.in_(user_ids),
-            ChoreAssignment.date >= start,
-            ChoreAssignment.date <= today,
-            ChoreAssignment.status.in_([
-                AssignmentStatus.completed, AssignmentStatus.verified,
-            ]),
-        )
-        .group_by(ChoreAssignment.date)
-    )
-    completed_by_day = {str(row.date): row.completed for row in completed_result.all()}
-
-    # Daily total quests assigned
-    total_result = await db.execute(
-        select(
-            ChoreAssignment.date,
-            func.count().label("total"),
-        )
-        .where(
-            ChoreAssignment.user_id.in_(user_ids),
-            ChoreAssignment.date >= start,
-            ChoreAssignment.date <= today,
-        )
-        .group_by(ChoreAssignment.date)
-    )
-    total_by_day = {str(row.date): row.total for row in total_result.all()}
+    by_day = {str(row.day): row for row in result.all()}
 
     # Build daily array
     days = []
     for i in range(30):
         d = start + timedelta(days=i)
         ds = str(d)
-        total = total_by_day.get(ds, 0)
-        completed = completed_by_day.get(ds, 0)
+        row = by_day.get(ds)
+        total = row.total if row else 0
+        completed = row.completed if row else 0
         days.append({
             "date": ds,
-            "xp": xp_by_day.get(ds, 0),
+            "xp": row.xp if row else 0,
             "completed": completed,
             "total": total,
             "rate": round(completed / total, 2) if total > 0 else 0,
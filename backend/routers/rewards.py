@@ -24,7 +24,7 @@ from backend.schemas import (
     RedemptionResponse,
 )
 from backend.dependencies import get_current_user, require_parent
-from backend.achievements import check_achievements
+from backend.achievements import check_achievements, EVENT_REDEMPTION
 from backend.websocket_manager import ws_manager
 
 router = APIRouter(prefix="/api/rewards", tags=["rewards"])
@@ -99,6 +99,9 @@ async def approve_redemption(
     await db.commit()
     await db.refresh(redemption)
 
+    # An approved redemption counts towards redemption achievements
+    await check_achievements(db, redemption.user, EVENT_REDEMPTION)
+
     await ws_manager.send_to_user(redemption.user_id, {
         "type": "reward_approved",
         "data": {
@@ -435,7 +438,7 @@ async def redeem_reward(
     await db.commit()
 
     # Check achievements after redemption
-    await check_achievements(db, current_user)
+    await check_achievements(db, current_user, EVENT_REDEMPTION)
 
     # WebSocket notification
     await ws_manager.send_to_user(current_user.id, {
@@ -9,6 +9,7 @@ from backend.models import ChoreRotation
 from backend.schemas import RotationCreate, RotationUpdate, RotationResponse
 from backend.dependencies import require_parent
 from backend.websocket_manager import ws_manager
+from backend.services.clock import clock
 
 router = APIRouter(prefix="/api/rotations", tags=["rotations"])
 
@@ -133,8 +134,8 @@ async def advance_rotation(
         raise HTTPException(status_code=400, detail="Rotation has no kids to advance through")
 
     rotation.current_index = (rotation.current_index + 1) % len(rotation.kid_ids)
-    rotation.last_rotated = datetime.now(timezone.utc)
-    rotation.updated_at = datetime.now(timezone.utc)
+    rotation.last_rotated = clock.now()
+    rotation.updated_at = rotation.last_rotated
 
     await db.commit()
     await db.refresh(rotation)
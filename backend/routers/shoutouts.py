@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
@@ -8,6 +8,7 @@ from backend.database import get_db
 from backend.models import User, Shoutout, Notification, NotificationType
 from backend.schemas import ShoutoutCreate, ShoutoutResponse
 from backend.dependencies import get_current_user
+from backend.services.clock import clock
 from backend.websocket_manager import ws_manager
 
 router = APIRouter(prefix="/api/shoutouts", tags=["shoutouts"])
@@ -19,7 +20,7 @@ async def list_shoutouts(
     current_user: User = Depends(get_current_user),
 ):
     """Recent shoutouts (last 7 days)."""
-    cutoff = datetime.utcnow() - timedelta(days=7)
+    cutoff = clock.now().replace(tzinfo=None) - timedelta(days=7)
     result = await db.execute(
         select(Shoutout)
         .where(Shoutout.created_at >= cutoff)
@@ -73,8 +74,9 @@ async def create_shoutout(
     if not target:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Rate limit: max 5 shoutouts per user per day
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    # Rate limit: max 5 shoutouts per user per household day
+    local_midnight = clock.local_now().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_start = local_midnight.astimezone(timezone.utc).replace(tzinfo=None)
     count_result = await db.execute(
         select(Shoutout).where(
             Shoutout.from_user_id == current_user.id,
@@ -1,5 +1,4 @@
 import random
-from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select, func
@@ -16,9 +15,10 @@ from backend.models import (
 )
 from backend.schemas import SpinResultResponse, SpinAvailabilityResponse
 from backend.dependencies import get_current_user
-from backend.achievements import check_achievements
+from backend.achievements import check_achievements, EVENT_POINTS_AWARDED
 from backend.websocket_manager import ws_manager
 from backend.services.pet_leveling import award_pet_xp_db
+from backend.services.clock import clock
 
 router = APIRouter(prefix="/api/spin", tags=["spin"])
 
@@ -42,7 +42,7 @@ async def _can_spin_today(db: AsyncSession, user: User) -> tuple[bool, int | Non
 
     Returns (can_spin, last_result_points_or_none, reason_or_none).
     """
-    today = date.today()
+    today = clock.today()
 
     # Get last spin result for display
     last_result: int | None = None
@@ -122,7 +122,7 @@ async def execute_spin(
 
     # Pick from the wheel segments so the frontend animation matches
     points_won = random.choice(WHEEL_VALUES)
-    today = date.today()
+    today = clock.today()
 
     # Create spin result
     spin_result = SpinResult(
@@ -155,7 +155,7 @@ async def execute_spin(
 
     # Check achievements (non-blocking on failure)
     try:
-        await check_achievements(db, user)
+        await check_achievements(db, user, EVENT_POINTS_AWARDED)
     except Exception:
         pass
 
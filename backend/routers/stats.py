@@ -1,6 +1,6 @@
 from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import HTMLResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,6 +15,7 @@ from backend.models import (
     AssignmentStatus,
     PointTransaction,
     PointType,
+    LeaderboardSnapshot,
     Achievement,
     UserAchievement,
     Notification,
@@ -22,10 +23,13 @@ from backend.models import (
 )
 from backend.schemas import UserResponse, AchievementResponse, AchievementUpdate
 from backend.dependencies import get_current_user, require_parent
-from backend.services.assignment_generator import auto_generate_week_assignments
-from backend.services.stats_helpers import completion_rate
+from backend.services.assignment_generator import ensure_week_generated
+from backend.services.stats_helpers import completion_rate, standard_windows, window_stats
 from backend.services.ranks import get_rank
 from backend.services.pet_leveling import get_pet_level
+from backend.services.clock import clock
+from backend.services.family_streak import get_family_streak
+from backend.services.leaderboard import current_week, rank_kids
 
 router = APIRouter(prefix="/api/stats", tags=["stats"])
 
@@ -42,7 +46,7 @@ async def get_my_stats(
 ):
     """Current user stats."""
     achievements_count = await _count_achievements(db, current_user.id)
-    thirty_days_ago = date.today() - timedelta(days=30)
+    thirty_days_ago = clock.today() - timedelta(days=30)
     total_30d, completed_30d, rate_30d = await completion_rate(
         db, current_user.id, thirty_days_ago,
     )
@@ -60,7 +64,7 @@ async def get_my_stats(
         pet_info = None
 
     # Streak freeze: available once per calendar month
-    today = date.today()
+    today = clock.today()
     current_month = today.month + today.year * 12
     streak_freeze_available = (current_user.streak_freeze_month or 0) != current_month
 
@@ -107,7 +111,7 @@ async def get_party(
     db: AsyncSession = Depends(get_db),
 ):
     """Family roster visible to all users — kids and parents alike."""
-    today = date.today()
+    today = clock.today()
 
     # All active users (parents + kids)
     result = await db.execute(
@@ -127,7 +131,7 @@ async def get_party(
     activity_result = await db.execute(
         select(PointTransaction)
         .where(
-            PointTransaction.created_at >= str(two_days_ago),
+            PointTransaction.local_day >= two_days_ago,
             PointTransaction.amount > 0,
             PointTransaction.type.in_([PointType.chore_complete, PointType.achievement, PointType.event_multiplier]),
         )
@@ -176,26 +180,7 @@ async def get_party(
     activity = activity[:20]
 
     # Family streak: consecutive days where ALL kids completed at least 1 quest
-    family_streak = 0
-    if kid_ids:
-        for days_back in range(60):
-            check_date = today - timedelta(days=days_back)
-            all_completed = True
-            for kid_id in kid_ids:
-                count_result = await db.execute(
-                    select(func.count()).select_from(ChoreAssignment).where(
-                        ChoreAssignment.user_id == kid_id,
-                        ChoreAssignment.date == check_date,
-                        ChoreAssignment.status.in_([AssignmentStatus.completed, AssignmentStatus.verified]),
-                    )
-                )
-                if count_result.scalar() == 0:
-                    all_completed = False
-                    break
-            if all_completed:
-                family_streak += 1
-            else:
-                break
+    family_streak = await get_family_streak(db, today, kid_ids)
 
     # Combined family XP
     family_total_xp = sum(u.total_points_earned for u in kids)
@@ -250,9 +235,9 @@ async def get_kid_detail(
     if not kid:
         raise HTTPException(status_code=404, detail="Kid not found")
 
-    today = date.today()
+    today = clock.today()
     monday = today - timedelta(days=today.weekday())
-    await auto_generate_week_assignments(db, monday)
+    await ensure_week_generated(db, monday)
 
     result = await db.execute(
         select(ChoreAssignment)
@@ -287,9 +272,9 @@ async def get_family_stats(
     db: AsyncSession = Depends(get_db),
 ):
     """Overview of all kids. Parent+ only."""
-    today = date.today()
+    today = clock.today()
     monday = today - timedelta(days=today.weekday())
-    await auto_generate_week_assignments(db, monday)
+    await ensure_week_generated(db, monday)
 
     result = await db.execute(
         select(User).where(User.role == UserRole.kid, User.is_active == True)
@@ -306,6 +291,8 @@ async def get_family_stats(
     today_completed = await _count_today_assignments_by_kid(
         db, kid_ids, today, completed_only=True,
     )
+    # Completion over every standard window for all kids in one query
+    windows = await window_stats(db, kid_ids, standard_windows(today))
 
     return [
         {
@@ -316,6 +303,7 @@ async def get_family_stats(
             "current_streak": kid.current_streak,
             "today_completed": today_completed.get(kid.id, 0),
             "today_total": today_totals.get(kid.id, 0),
+            "windows": windows[kid.id],
         }
         for kid in kids
     ]
@@ -326,11 +314,7 @@ async def get_leaderboard(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Weekly leaderboard. Sum positive PointTransactions for the current week."""
-    today = date.today()
-    monday = today - timedelta(days=today.weekday())
-    sunday = monday + timedelta(days=6)
-
+    """Weekly leaderboard for the current week, from the in-memory week."""
     result = await db.execute(
         select(User).where(User.role == UserRole.kid, User.is_active == True)
     )
@@ -340,59 +324,52 @@ async def get_leaderboard(
     if not kid_map:
         return []
 
-    # Weekly XP per kid
-    result = await db.execute(
-        select(
-            PointTransaction.user_id,
-            func.sum(PointTransaction.amount).label("weekly_xp"),
-        )
-        .where(
-            PointTransaction.user_id.in_(list(kid_map.keys())),
-            PointTransaction.amount > 0,
-            func.date(PointTransaction.created_at) >= monday,
-            func.date(PointTransaction.created_at) <= sunday,
-        )
-        .group_by(PointTransaction.user_id)
-        .order_by(func.sum(PointTransaction.amount).desc())
-    )
-    xp_rows = result.all()
-
-    # Weekly quests per kid
-    quest_result = await db.execute(
-        select(
-            ChoreAssignment.user_id,
-            func.count().label("quests_done"),
-        )
-        .where(
-            ChoreAssignment.user_id.in_(list(kid_map.keys())),
-            ChoreAssignment.date >= monday,
-            ChoreAssignment.date <= sunday,
-            ChoreAssignment.status.in_(
-                [AssignmentStatus.completed, AssignmentStatus.verified]
-            ),
-        )
-        .group_by(ChoreAssignment.user_id)
-    )
-    quests_map = {row.user_id: row.quests_done for row in quest_result.all()}
+    totals = await current_week.totals(db, clock.today())
+    return [
+        _build_leaderboard_entry(kid_map[kid_id], rank, weekly_xp, quests)
+        for kid_id, rank, weekly_xp, quests in rank_kids(list(kid_map), totals)
+    ]
 
-    # Build ranked leaderboard: kids with XP first, then the rest
-    leaderboard = []
-    seen_ids: set[int] = set()
-    rank = 1
 
-    for row in xp_rows:
-        kid = kid_map.get(row.user_id)
-        if kid:
-            leaderboard.append(_build_leaderboard_entry(kid, rank, row.weekly_xp or 0, quests_map))
-            seen_ids.add(kid.id)
-            rank += 1
+@router.get("/leaderboard/history")
+async def get_leaderboard_history(
+    limit: int = Query(4, ge=1, le=52),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Frozen leaderboards of past weeks, newest first."""
+    weeks_result = await db.execute(
+        select(LeaderboardSnapshot.week_start)
+        .distinct()
+        .order_by(LeaderboardSnapshot.week_start.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    weeks = weeks_result.scalars().all()
+    if not weeks:
+        return []
 
-    for kid_id, kid in kid_map.items():
-        if kid_id not in seen_ids:
-            leaderboard.append(_build_leaderboard_entry(kid, rank, 0, quests_map))
-            rank += 1
+    result = await db.execute(
+        select(LeaderboardSnapshot)
+        .where(LeaderboardSnapshot.week_start.in_(weeks))
+        .options(selectinload(LeaderboardSnapshot.user))
+        .order_by(LeaderboardSnapshot.week_start.desc(), LeaderboardSnapshot.rank)
+    )
+    entries_by_week: dict[date, list[dict]] = {week: [] for week in weeks}
+    for snap in result.scalars().all():
+        entries_by_week[snap.week_start].append(
+            _build_leaderboard_entry(snap.user, snap.rank, snap.weekly_xp, snap.quests_completed)
+        )
 
-    return leaderboard
+    return [
+        {
+            "week_start": week.isoformat(),
+            "week_end": (week + timedelta(days=6)).isoformat(),
+            "entries": entries,
+        }
+        for week, entries in entries_by_week.items()
+    ]
 
 
 @router.get("/achievements/all")
@@ -450,19 +427,15 @@ async def get_user_stats(
 
     achievements_count = await _count_achievements(db, user.id)
 
-    today = date.today()
-    seven_days_ago = today - timedelta(days=7)
-    thirty_days_ago = today - timedelta(days=30)
-
-    total_7d, completed_7d, _ = await completion_rate(db, user.id, seven_days_ago)
-    total_30d, completed_30d, rate_30d = await completion_rate(db, user.id, thirty_days_ago)
+    windows = (await window_stats(db, [user.id], standard_windows(clock.today())))[user.id]
 
     return {
         "user": UserResponse.model_validate(user),
         "achievements_count": achievements_count,
-        "completion_rate_30d": rate_30d,
-        "last_7_days": {"completed": completed_7d, "total": total_7d},
-        "last_30_days": {"completed": completed_30d, "total": total_30d},
+        "completion_rate_30d": windows["30d"]["rate"],
+        "last_7_days": _window_summary(windows["7d"]),
+        "last_30_days": _window_summary(windows["30d"]),
+        "windows": windows,
     }
 
 
@@ -480,17 +453,13 @@ async def get_completion_history(
     if not result.scalar_one_or_none():
         raise HTTPException(status_code=404, detail="User not found")
 
-    today = date.today()
-    seven_days_ago = today - timedelta(days=7)
-    thirty_days_ago = today - timedelta(days=30)
-
-    total_7d, completed_7d, _ = await completion_rate(db, user_id, seven_days_ago)
-    total_30d, completed_30d, _ = await completion_rate(db, user_id, thirty_days_ago)
+    windows = (await window_stats(db, [user_id], standard_windows(clock.today())))[user_id]
 
     return {
         "user_id": user_id,
-        "last_7_days": {"completed": completed_7d, "total": total_7d},
-        "last_30_days": {"completed": completed_30d, "total": total_30d},
+        "last_7_days": _window_summary(windows["7d"]),
+        "last_30_days": _window_summary(windows["30d"]),
+        "windows": windows,
     }
 
 
@@ -576,8 +545,12 @@ async def _count_today_assignments_by_kid(
     return {row.user_id: row.cnt for row in result.all()}
 
 
+def _window_summary(stats: dict) -> dict:
+    return {"completed": stats["done"], "total": stats["total"]}
+
+
 def _build_leaderboard_entry(
-    kid: User, rank: int, weekly_xp: int, quests_map: dict[int, int]
+    kid: User, rank: int, weekly_xp: int, quests_completed: int
 ) -> dict:
     return {
         "rank": rank,
@@ -586,7 +559,7 @@ def _build_leaderboard_entry(
         "avatar_config": kid.avatar_config,
         "weekly_xp": weekly_xp,
         "total_xp": kid.total_points_earned or 0,
-        "quests_completed": quests_map.get(kid.id, 0),
+        "quests_completed": quests_completed,
         "current_streak": kid.current_streak or 0,
     }
 
@@ -8,6 +8,9 @@ from backend.database import get_db
 from backend.models import User, VacationPeriod
 from backend.schemas import VacationCreate, VacationResponse
 from backend.dependencies import require_parent
+from backend.services.interval_index import interval_index
+from backend.services.clock import clock
+from backend.services.family_streak import clear_family_streak
 
 router = APIRouter(prefix="/api/vacation", tags=["vacation"])
 
@@ -35,7 +38,7 @@ async def create_vacation(
     """Create a vacation/blackout period. Parent+ only."""
     if body.end_date < body.start_date:
         raise HTTPException(status_code=400, detail="End date must be after start date")
-    if body.end_date < date.today():
+    if body.end_date < clock.today():
         raise HTTPException(status_code=400, detail="Cannot create vacation in the past")
 
     vacation = VacationPeriod(
@@ -44,8 +47,10 @@ async def create_vacation(
         created_by=parent.id,
     )
     db.add(vacation)
+    await clear_family_streak(db)
     await db.commit()
     await db.refresh(vacation)
+    await interval_index.rebuild(db)
     return vacation
 
 
@@ -64,16 +69,20 @@ async def cancel_vacation(
         raise HTTPException(status_code=404, detail="Vacation not found")
 
     vacation.is_active = False
+    await clear_family_streak(db)
     await db.commit()
+    await interval_index.rebuild(db)
 
 
 async def is_vacation_day(db: AsyncSession, check_date: date) -> bool:
     """Check if a given date falls within any active vacation period."""
-    result = await db.execute(
-        select(VacationPeriod).where(
-            VacationPeriod.is_active == True,
-            VacationPeriod.start_date <= check_date,
-            VacationPeriod.end_date >= check_date,
-        )
-    )
-    return result.scalar_one_or_none() is not None
+    await interval_index.ensure_loaded(db)
+    return interval_index.is_vacation_day(check_date)
+
+
+async def vacation_days_between(
+    db: AsyncSession, start: date, end: date
+) -> set[date]:
+    """Return every date in ``[start, end]`` covered by an active vacation."""
+    await interval_index.ensure_loaded(db)
+    return interval_index.vacation_days_between(start, end)
@@ -469,6 +469,46 @@ class SettingsUpdate(BaseModel):
     settings: dict[str, str]
 
 
+# Generation
+class GenerationWatermarkResponse(BaseModel):
+    week_start: date
+    materialized_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+# Scheduler
+class ScheduledJobResponse(BaseModel):
+    name: str
+    next_run_at: datetime | None
+    last_started_at: datetime | None
+    last_duration_ms: int | None
+    last_status: str | None
+    last_error: str | None
+    run_count: int
+    failure_count: int
+
+    model_config = {"from_attributes": True}
+
+
+class JobRunResponse(BaseModel):
+    id: int
+    job_name: str
+    owner: str
+    started_at: datetime
+    duration_ms: int
+    status: str
+    error: str | None
+
+    model_config = {"from_attributes": True}
+
+
+class SchedulerStatusResponse(BaseModel):
+    leader: str | None
+    lease_expires_at: datetime | None
+    jobs: list[ScheduledJobResponse]
+
+
 # Shoutouts
 class ShoutoutCreate(BaseModel):
     to_user_id: int
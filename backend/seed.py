@@ -1,5 +1,4 @@
 import json
-from datetime import date
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.models import (
@@ -7,6 +6,7 @@ from backend.models import (
     ChoreAssignmentRule, QuestTemplate, User, UserRole, Difficulty, Recurrence,
     AssignmentStatus, AvatarItem, AvatarItemRarity, AvatarUnlockMethod,
 )
+from backend.services.clock import clock
 
 DEFAULT_CATEGORIES = [
     {"name": "Kitchen", "icon": "cooking-pot", "colour": "#ff6b6b"},
@@ -400,7 +400,7 @@ async def seed_database(db: AsyncSession):
     # Migrate existing chores to assignment rules (one-time migration)
     rule_count = await db.execute(select(func.count()).select_from(ChoreAssignmentRule))
     if rule_count.scalar() == 0:
-        today = date.today()
+        today = clock.today()
         chores_result = await db.execute(
             select(Chore).where(Chore.is_active == True)
         )
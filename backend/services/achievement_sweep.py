@@ -0,0 +1,352 @@
+"""Bulk re-evaluation of achievements for every user.
+
+``check_achievements`` only runs for the user who just acted, so an
+achievement added or edited later, or a criteria type that did not
+exist when a kid earned it, is never awarded until that kid's next
+action.  ``reevaluate_achievements`` walks all active kids in batches
+and checks them against every achievement.
+
+For each batch the per-user inputs (completion totals, earliest
+completion hour, approved redemptions, today's assignments) are read
+with one grouped query each, and the resulting unlocks, XP transactions
+and notifications are written with bulk inserts and a single commit.
+Verdicts match ``backend/achievements.py``: achievements are taken in id
+order and the bonus XP of each unlock counts towards later
+points-earned and pet-level criteria.
+
+With ``dry_run`` nothing is written and the report lists what would be
+unlocked.
+"""
+
+import copy
+import logging
+
+from sqlalchemy import Integer, bindparam, case, cast, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import async_session
+from backend.models import (
+    Achievement, AssignmentStatus, ChoreAssignment, Notification,
+    NotificationType, PointTransaction, PointType, RewardRedemption, User,
+    UserAchievement, UserDailyStats, UserRole,
+)
+from backend.services.clock import clock
+from backend.services.daily_stats import refresh_daily_stats
+from backend.services.pet_leveling import (
+    get_current_pet_xp, get_pet_level, migrate_pet_xp, set_current_pet_xp,
+)
+from backend.services.push_hook import queue_push
+from backend.services.user_cache import user_cache
+from backend.websocket_manager import ws_manager
+
+logger = logging.getLogger(__name__)
+
+# Users evaluated per transaction
+SWEEP_BATCH_SIZE = 200
+
+_DONE_STATUSES = [AssignmentStatus.completed, AssignmentStatus.verified]
+
+
+def _completed_hour(column):
+    # Same hour as the stored (naive) value, as in achievements.py
+    return cast(func.strftime("%H", column), Integer)
+
+
+async def _batch_facts(db: AsyncSession, user_ids: list[int]) -> dict[int, dict]:
+    """Criteria inputs for ``user_ids``, one grouped query per source."""
+    facts = {
+        user_id: {
+            "completions": 0, "earliest_hour": None, "redemptions": 0,
+            "today_total": 0, "today_pending": 0, "today_done": 0,
+            "today_latest_hour": None,
+        }
+        for user_id in user_ids
+    }
+
+    result = await db.execute(
+        select(
+            UserDailyStats.user_id,
+            func.sum(UserDailyStats.completed + UserDailyStats.verified),
+        )
+        .where(UserDailyStats.user_id.in_(user_ids))
+        .group_by(UserDailyStats.user_id)
+    )
+    for user_id, completions in result.all():
+        facts[user_id]["completions"] = completions or 0
+
+    result = await db.execute(
+        select(ChoreAssignment.user_id, func.min(_completed_hour(ChoreAssignment.completed_at)))
+        .where(
+            ChoreAssignment.user_id.in_(user_ids),
+            ChoreAssignment.status.in_(_DONE_STATUSES),
+            ChoreAssignment.completed_at.isnot(None),
+        )
+        .group_by(ChoreAssignment.user_id)
+    )
+    for user_id, hour in result.all():
+        facts[user_id]["earliest_hour"] = hour
+
+    result = await db.execute(
+        select(RewardRedemption.user_id, func.count())
+        .where(
+            RewardRedemption.user_id.in_(user_ids),
+            RewardRedemption.status == "approved",
+        )
+        .group_by(RewardRedemption.user_id)
+    )
+    for user_id, count in result.all():
+        facts[user_id]["redemptions"] = count
+
+    result = await db.execute(
+        select(
+            ChoreAssignment.user_id,
+            func.count(),
+            func.sum(case((ChoreAssignment.status == AssignmentStatus.pending, 1), else_=0)),
+            func.sum(case((ChoreAssignment.status.in_(_DONE_STATUSES), 1), else_=0)),
+            func.max(_completed_hour(ChoreAssignment.completed_at)),
+        )
+        .where(
+            ChoreAssignment.user_id.in_(user_ids),
+            ChoreAssignment.date == clock.today(),
+            ChoreAssignment.status != AssignmentStatus.skipped,
+        )
+        .group_by(ChoreAssignment.user_id)
+    )
+    for user_id, total, pending, done, latest_hour in result.all():
+        facts[user_id].update(
+            today_total=total, today_pending=pending or 0,
+            today_done=done or 0, today_latest_hour=latest_hour,
+        )
+    return facts
+
+
+def _qualifies(criteria: dict, state: dict, facts: dict) -> bool:
+    """Set-based counterpart of ``achievements._check_criteria``.
+
+    ``state`` holds the user's running ``total_points_earned``,
+    ``current_streak`` and avatar ``config``.
+    """
+    ctype = criteria.get("type")
+    if ctype == "total_completions":
+        return facts["completions"] >= criteria["count"]
+    if ctype in ("consecutive_days_all_complete", "streak_reached"):
+        return state["current_streak"] >= criteria["days"]
+    if ctype == "total_points_earned":
+        return state["total_points_earned"] >= criteria["amount"]
+    if ctype == "completion_before_time":
+        hour = facts["earliest_hour"]
+        return hour is not None and hour < criteria["hour"]
+    if ctype == "total_redemptions":
+        return facts["redemptions"] >= criteria["count"]
+    if ctype == "all_daily_before_time":
+        if not facts["today_total"] or facts["today_pending"]:
+            return False
+        latest = facts["today_latest_hour"]
+        return latest is None or latest < criteria["hour"]
+    if ctype == "all_daily_completed":
+        return bool(facts["today_total"]) and facts["today_done"] == facts["today_total"]
+    if ctype == "pet_level_reached":
+        pet = state["config"].get("pet")
+        if not pet or pet == "none":
+            return False
+        return get_pet_level(get_current_pet_xp(state["config"]))["level"] >= criteria["level"]
+    return False
+
+
+def _award_pet_xp(config: dict, amount: int) -> bool:
+    """Add ``amount`` to the equipped pet in ``config``; True if changed."""
+    pet = config.get("pet")
+    if not pet or pet == "none" or amount <= 0:
+        return False
+    migrate_pet_xp(config)
+    set_current_pet_xp(config, get_current_pet_xp(config) + amount)
+    return True
+
+
+async def _sweep_batch(
+    db: AsyncSession,
+    users: list,
+    achievements: list[Achievement],
+    dry_run: bool,
+) -> list[dict]:
+    """Evaluate and (unless ``dry_run``) write one batch.  Returns its unlocks."""
+    user_ids = [user.id for user in users]
+    facts = await _batch_facts(db, user_ids)
+    result = await db.execute(
+        select(UserAchievement.user_id, UserAchievement.achievement_id)
+        .where(UserAchievement.user_id.in_(user_ids))
+    )
+    unlocked = set(result.tuples().all())
+
+    unlocks = []
+    for user in users:
+        state = {
+            "total_points_earned": user.total_points_earned or 0,
+            "current_streak": user.current_streak or 0,
+            "config": copy.deepcopy(user.avatar_config or {}),
+        }
+        for achievement in achievements:
+            if (user.id, achievement.id) in unlocked:
+                continue
+            if not _qualifies(achievement.criteria, state, facts[user.id]):
+                continue
+            unlocks.append({
+                "user_id": user.id,
+                "username": user.username,
+                "achievement_id": achievement.id,
+                "achievement_key": achievement.key,
+                "title": achievement.title,
+                "points": achievement.points_reward,
+            })
+            if achievement.points_reward > 0:
+                state["total_points_earned"] += achievement.points_reward
+                _award_pet_xp(state["config"], achievement.points_reward)
+
+    if dry_run or not unlocks:
+        return unlocks
+
+    # Skip pairs unlocked by a request since they were read above
+    result = await db.execute(
+        sqlite_insert(UserAchievement)
+        .on_conflict_do_nothing()
+        .returning(UserAchievement.user_id, UserAchievement.achievement_id),
+        [{"user_id": u["user_id"], "achievement_id": u["achievement_id"]} for u in unlocks],
+    )
+    inserted = set(result.tuples().all())
+    unlocks = [u for u in unlocks if (u["user_id"], u["achievement_id"]) in inserted]
+    if not unlocks:
+        return unlocks
+
+    now = clock.now().replace(tzinfo=None)
+    today = clock.local_date(now)
+    transactions = [
+        {
+            "user_id": u["user_id"],
+            "amount": u["points"],
+            "type": PointType.achievement,
+            "description": f"Achievement unlocked: {u['title']}",
+            "reference_id": u["achievement_id"],
+            "created_at": now,
+            "local_day": today,
+        }
+        for u in unlocks if u["points"] > 0
+    ]
+    if transactions:
+        await db.execute(PointTransaction.__table__.insert(), transactions)
+
+    notifications = [
+        {
+            "user_id": u["user_id"],
+            "type": NotificationType.achievement_unlocked,
+            "title": "Achievement Unlocked!",
+            "message": f"You earned '{u['title']}' — +{u['points']} XP!",
+            "reference_type": "achievement",
+            "reference_id": u["achievement_id"],
+        }
+        for u in unlocks
+    ]
+    await db.execute(Notification.__table__.insert(), notifications)
+    for n in notifications:
+        queue_push(db.sync_session, n["user_id"], n["title"], n["message"], n["type"])
+
+    xp_by_user: dict[int, int] = {}
+    for u in unlocks:
+        xp_by_user[u["user_id"]] = xp_by_user.get(u["user_id"], 0) + u["points"]
+    points = [{"uid": user_id, "xp": xp} for user_id, xp in xp_by_user.items() if xp > 0]
+    # Pet XP is additive, so one award of the total matches one per unlock.
+    # Configs are re-read here, after the insert above took the write
+    # lock, so avatar changes made since the batch was read are kept.
+    configs = []
+    if points:
+        result = await db.execute(
+            select(User.id, User.avatar_config)
+            .where(User.id.in_([p["uid"] for p in points]))
+        )
+        for user_id, config in result.all():
+            config = copy.deepcopy(config or {})
+            if _award_pet_xp(config, xp_by_user[user_id]):
+                configs.append({"uid": user_id, "config": config})
+
+    users_table = User.__table__
+    if points:
+        await db.execute(
+            update(users_table)
+            .where(users_table.c.id == bindparam("uid"))
+            .values(
+                points_balance=users_table.c.points_balance + bindparam("xp"),
+                total_points_earned=users_table.c.total_points_earned + bindparam("xp"),
+            ),
+            points,
+        )
+    if configs:
+        await db.execute(
+            update(users_table)
+            .where(users_table.c.id == bindparam("uid"))
+            .values(avatar_config=bindparam("config")),
+            configs,
+        )
+
+    # Bulk inserts bypass the rollup's flush hook
+    await refresh_daily_stats(db, {(t["user_id"], today) for t in transactions})
+    await db.commit()
+    # The balance updates bypass the user cache's commit hook
+    user_cache.invalidate(*xp_by_user)
+
+    for u in unlocks:
+        await ws_manager.send_to_user(u["user_id"], {
+            "type": "achievement_unlocked",
+            "data": {"achievement_key": u["achievement_key"], "title": u["title"], "points": u["points"]},
+        })
+    return unlocks
+
+
+async def reevaluate_achievements(
+    dry_run: bool = False,
+    batch_size: int = SWEEP_BATCH_SIZE,
+) -> dict:
+    """Check every active kid against every achievement.
+
+    Each batch of ``batch_size`` users is committed on its own.  Returns
+    a report with the number of users checked, the XP awarded and each
+    unlock (user, achievement and points); with ``dry_run`` the unlocks
+    are only reported.
+    """
+    report = {"dry_run": dry_run, "users_checked": 0, "points_awarded": 0, "unlocks": []}
+    async with async_session() as db:
+        result = await db.execute(select(Achievement).order_by(Achievement.id))
+        achievements = result.scalars().all()
+    if not achievements:
+        return report
+
+    last_id = 0
+    while True:
+        async with async_session() as db:
+            result = await db.execute(
+                select(
+                    User.id, User.username, User.total_points_earned,
+                    User.current_streak, User.avatar_config,
+                )
+                .where(User.role == UserRole.kid, User.is_active == True, User.id > last_id)
+                .order_by(User.id)
+                .limit(batch_size)
+            )
+            users = result.all()
+            if not users:
+                break
+            last_id = users[-1].id
+            unlocks = await _sweep_batch(db, users, achievements, dry_run)
+
+        report["users_checked"] += len(users)
+        report["points_awarded"] += sum(u["points"] for u in unlocks)
+        report["unlocks"].extend(
+            {key: u[key] for key in ("user_id", "username", "achievement_key", "points")}
+            for u in unlocks
+        )
+
+    logger.info(
+        "Achievement sweep%s: %d users, %d unlocks, %d XP",
+        " (dry run)" if dry_run else "", report["users_checked"],
+        len(report["unlocks"]), report["points_awarded"],
+    )
+    return report
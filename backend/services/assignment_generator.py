@@ -5,9 +5,10 @@ background task to avoid duplicating the complex scheduling rules.
 """
 
 import logging
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models import (
@@ -16,19 +17,47 @@ from backend.models import (
     ChoreAssignmentRule,
     ChoreExclusion,
     ChoreRotation,
+    GenerationWatermark,
     AssignmentStatus,
     Recurrence,
 )
-from backend.services.recurrence import should_create_on_day
+from backend.services.recurrence import (
+    compile_chore_recurrence,
+    expand_occurrences,
+)
 from backend.services.rotation import (
-    get_rotation_kid_for_day,
+    project_rotation,
     should_advance_rotation,
     advance_rotation,
 )
+from backend.services.clock import clock
+from backend.services.daily_stats import refresh_daily_stats
 
 logger = logging.getLogger(__name__)
 
 
+async def ensure_week_generated(
+    db: AsyncSession, week_start: date
+) -> bool:
+    """Generate a week's assignments unless it is already materialized.
+
+    Read endpoints call this instead of ``auto_generate_week_assignments``
+    so that a dashboard refresh is a pure read whenever nothing upstream
+    has changed since the week was last generated.
+
+    Returns True if generation ran.
+    """
+    result = await db.execute(
+        select(GenerationWatermark.week_start).where(
+            GenerationWatermark.week_start == week_start,
+        )
+    )
+    if result.scalar_one_or_none() is not None:
+        return False
+    await auto_generate_week_assignments(db, week_start)
+    return True
+
+
 async def auto_generate_week_assignments(
     db: AsyncSession, week_start: date
 ) -> None:
@@ -39,37 +68,90 @@ async def auto_generate_week_assignments(
 
     This function does NOT advance rotations -- it reads the current
     rotation state and projects forward (useful for calendar views).
+
+    All inputs (chores, rules, rotations, exclusions, vacation days and
+    the week's existing assignments) are loaded up front in a fixed
+    number of queries.  The target slot set is computed in memory and
+    only the difference is written back.
     """
     week_end = week_start + timedelta(days=6)
     week_dates = [week_start + timedelta(days=i) for i in range(7)]
 
     # Filter out vacation days from week generation
-    from backend.routers.vacation import is_vacation_day
-    active_dates = []
-    for d in week_dates:
-        if not await is_vacation_day(db, d):
-            active_dates.append(d)
-    week_dates = active_dates
+    from backend.routers.vacation import vacation_days_between
+    vacation_days = await vacation_days_between(db, week_start, week_end)
+    week_dates = [d for d in week_dates if d not in vacation_days]
+
+    chores = await _load_active_chores(db)
+    if chores and week_dates:
+        await _materialize_week(db, chores, week_start, week_end, week_dates)
 
+    await _stamp_watermark(db, week_start)
+    await db.commit()
+
+
+async def _materialize_week(
+    db: AsyncSession,
+    chores: list[Chore],
+    week_start: date,
+    week_end: date,
+    week_dates: list[date],
+) -> None:
+    """Compute the week's target slots and write the difference."""
+    chore_ids = [c.id for c in chores]
+    rules_by_chore = await _load_active_rules_by_chore(db, chore_ids)
+    rotations = await _load_rotations_by_chore(db, chore_ids)
     exclusion_set = await _load_exclusion_set(db, week_start, week_end)
+    existing = await _load_existing_slots(db, week_start, week_end)
 
-    chores = await _load_active_chores(db)
+    legacy_ids = [
+        c.id for c in chores
+        if not rules_by_chore.get(c.id)
+        and c.recurrence != Recurrence.once
+        and not (rotations.get(c.id) and rotations[c.id].kid_ids)
+    ]
+    legacy_users = await _get_legacy_user_ids_by_chore(db, legacy_ids)
+
+    targets: set[tuple[int, int, date]] = set()
+    stale: set[tuple[int, int, date]] = set()
+    active_days = set(week_dates)
 
     for chore in chores:
-        rules = await _load_active_rules(db, chore.id)
+        rules = rules_by_chore.get(chore.id)
 
         if rules:
-            rotation = await _load_rotation(db, chore.id)
-            await _generate_from_rules(
-                db, chore, rules, rotation, week_dates, exclusion_set,
+            _plan_from_rules(
+                chore, rules, rotations.get(chore.id),
+                week_start, week_end, active_days,
+                exclusion_set, targets, stale,
             )
         else:
-            await _generate_legacy(db, chore, week_dates, exclusion_set)
+            _plan_legacy(
+                chore, rotations.get(chore.id), legacy_users.get(chore.id, []),
+                week_start, week_end, active_days, exclusion_set, targets,
+            )
 
-    await db.commit()
+    # Clean up stale pending assignments for the wrong rotation kid
+    # (could have been created by a prior buggy run).
+    stale_slots = [
+        slot for slot in stale
+        if slot in existing and existing[slot][1] == AssignmentStatus.pending
+    ]
+    if stale_slots:
+        await db.execute(
+            delete(ChoreAssignment).where(
+                ChoreAssignment.id.in_([existing[slot][0] for slot in stale_slots])
+            )
+        )
+        await refresh_daily_stats(db, {(user_id, day) for _, user_id, day in stale_slots})
+        logger.debug("Removed %d stale rotation assignments", len(stale_slots))
 
+    await _insert_missing(db, targets - existing.keys())
 
-async def generate_daily_assignments(db: AsyncSession, today: date) -> None:
+
+async def generate_daily_assignments(
+    db: AsyncSession, today: date, now: datetime | None = None,
+) -> None:
     """Generate assignments for today with rotation advancement.
 
     Called by the daily reset background task. Unlike the week-based
@@ -77,6 +159,9 @@ async def generate_daily_assignments(db: AsyncSession, today: date) -> None:
     period has elapsed.  Rotation is only advanced on days when the
     chore actually has an occurrence so that non-active days (e.g.
     weekends for a Mon-Fri custom schedule) don't waste rotation slots.
+
+    ``now`` is the moment rotations are advanced at; pass the scheduled
+    reset time when replaying a missed day.  Defaults to the current time.
     """
     # Check vacation mode — skip generation if today is a vacation day
     from backend.routers.vacation import is_vacation_day
@@ -84,30 +169,38 @@ async def generate_daily_assignments(db: AsyncSession, today: date) -> None:
         logger.info("Skipping assignment generation — vacation day %s", today)
         return
 
-    now = datetime.now(timezone.utc)
+    if now is None:
+        now = clock.now()
     chores = await _load_active_chores(db)
+    if not chores:
+        return
+
+    chore_ids = [c.id for c in chores]
+    rules_by_chore = await _load_active_rules_by_chore(db, chore_ids)
+    rotations = await _load_rotations_by_chore(db, chore_ids)
+
+    legacy_ids = [
+        c.id for c in chores
+        if not rules_by_chore.get(c.id)
+        and c.recurrence != Recurrence.once
+        and c.id not in rotations
+    ]
+    legacy_users = await _get_legacy_user_ids_by_chore(db, legacy_ids)
+
+    targets: set[tuple[int, int, date]] = set()
 
     for chore in chores:
-        rules = await _load_active_rules(db, chore.id)
+        rules = rules_by_chore.get(chore.id)
 
         if rules:
-            rotation = await _load_rotation(db, chore.id)
+            rotation = rotations.get(chore.id)
 
             # Pre-compute which rules fire today so we know whether
             # the chore has an occurrence before advancing rotation.
-            created_wd = chore.created_at.weekday()
-            created_dt = (
-                chore.created_at.date()
-                if hasattr(chore.created_at, "date")
-                else chore.created_at
-            )
             active_rules = [
                 r for r in rules
                 if r.recurrence != Recurrence.once
-                and should_create_on_day(
-                    r.recurrence, today, created_wd, r.custom_days,
-                    created_at_date=created_dt,
-                )
+                and compile_chore_recurrence(chore, r).occurs_on(today)
             ]
 
             # Only advance rotation on days the chore actually runs
@@ -121,28 +214,28 @@ async def generate_daily_assignments(db: AsyncSession, today: date) -> None:
                 ):
                     continue
 
-                await _create_if_missing(db, chore.id, rule.user_id, today)
+                targets.add((chore.id, rule.user_id, today))
         else:
             # Legacy: chore-level recurrence
             if chore.recurrence == Recurrence.once:
                 continue
 
-            if not should_create_on_day(
-                chore.recurrence, today, chore.created_at.weekday(), chore.custom_days,
-                created_at_date=chore.created_at.date() if hasattr(chore.created_at, 'date') else chore.created_at,
-            ):
+            if not compile_chore_recurrence(chore).occurs_on(today):
                 continue
 
-            rotation = await _load_rotation(db, chore.id)
+            rotation = rotations.get(chore.id)
             if rotation:
                 if should_advance_rotation(rotation, now):
                     advance_rotation(rotation, now)
                 user_ids = [rotation.kid_ids[rotation.current_index]]
             else:
-                user_ids = await _get_legacy_user_ids(db, chore.id)
+                user_ids = legacy_users.get(chore.id, [])
 
             for uid in user_ids:
-                await _create_if_missing(db, chore.id, uid, today)
+                targets.add((chore.id, uid, today))
+
+    existing = await _load_existing_slots(db, today, today)
+    await _insert_missing(db, targets - existing.keys())
 
 
 # ---------------------------------------------------------------------------
@@ -155,152 +248,184 @@ async def _load_active_chores(db: AsyncSession) -> list[Chore]:
     return list(result.scalars().all())
 
 
-async def _load_active_rules(
-    db: AsyncSession, chore_id: int
-) -> list[ChoreAssignmentRule]:
+async def _load_active_rules_by_chore(
+    db: AsyncSession, chore_ids: list[int]
+) -> dict[int, list[ChoreAssignmentRule]]:
+    """Load all active assignment rules for the given chores, keyed by chore."""
     result = await db.execute(
-        select(ChoreAssignmentRule).where(
-            ChoreAssignmentRule.chore_id == chore_id,
+        select(ChoreAssignmentRule)
+        .where(
+            ChoreAssignmentRule.chore_id.in_(chore_ids),
             ChoreAssignmentRule.is_active == True,
         )
+        .order_by(ChoreAssignmentRule.id)
     )
-    return list(result.scalars().all())
+    rules: dict[int, list[ChoreAssignmentRule]] = {}
+    for rule in result.scalars().all():
+        rules.setdefault(rule.chore_id, []).append(rule)
+    return rules
 
 
-async def _load_rotation(
-    db: AsyncSession, chore_id: int
-) -> ChoreRotation | None:
+async def _load_rotations_by_chore(
+    db: AsyncSession, chore_ids: list[int]
+) -> dict[int, ChoreRotation]:
     result = await db.execute(
-        select(ChoreRotation).where(ChoreRotation.chore_id == chore_id)
+        select(ChoreRotation).where(ChoreRotation.chore_id.in_(chore_ids))
     )
-    return result.scalar_one_or_none()
+    return {r.chore_id: r for r in result.scalars().all()}
 
 
 async def _load_exclusion_set(
     db: AsyncSession, start: date, end: date
 ) -> set[tuple[int, int, date]]:
     result = await db.execute(
-        select(ChoreExclusion).where(
+        select(
+            ChoreExclusion.chore_id, ChoreExclusion.user_id, ChoreExclusion.date,
+        ).where(
             ChoreExclusion.date >= start,
             ChoreExclusion.date <= end,
         )
     )
+    return {(row.chore_id, row.user_id, row.date) for row in result.all()}
+
+
+async def _load_existing_slots(
+    db: AsyncSession, start: date, end: date
+) -> dict[tuple[int, int, date], tuple[int, AssignmentStatus]]:
+    """Map every existing ``(chore_id, user_id, date)`` slot in the range
+    to its assignment ``(id, status)``."""
+    result = await db.execute(
+        select(
+            ChoreAssignment.id,
+            ChoreAssignment.chore_id,
+            ChoreAssignment.user_id,
+            ChoreAssignment.date,
+            ChoreAssignment.status,
+        ).where(
+            ChoreAssignment.date >= start,
+            ChoreAssignment.date <= end,
+        )
+    )
     return {
-        (e.chore_id, e.user_id, e.date) for e in result.scalars().all()
+        (row.chore_id, row.user_id, row.date): (row.id, row.status)
+        for row in result.all()
     }
 
 
-async def _get_legacy_user_ids(db: AsyncSession, chore_id: int) -> list[int]:
-    """Fall back to distinct user IDs from past assignments."""
+async def _get_legacy_user_ids_by_chore(
+    db: AsyncSession, chore_ids: list[int]
+) -> dict[int, list[int]]:
+    """Fall back to distinct user IDs from past assignments, per chore."""
+    if not chore_ids:
+        return {}
     result = await db.execute(
-        select(ChoreAssignment.user_id)
-        .where(ChoreAssignment.chore_id == chore_id)
+        select(ChoreAssignment.chore_id, ChoreAssignment.user_id)
+        .where(ChoreAssignment.chore_id.in_(chore_ids))
         .distinct()
     )
-    return list(result.scalars().all())
+    users: dict[int, list[int]] = {}
+    for row in result.all():
+        users.setdefault(row.chore_id, []).append(row.user_id)
+    return users
 
 
-async def _remove_stale_rotation_assignment(
-    db: AsyncSession, chore_id: int, user_id: int, day: date
-) -> None:
-    """Delete a pending assignment that shouldn't exist per the rotation.
+async def _insert_missing(
+    db: AsyncSession, slots: set[tuple[int, int, date]]
+) -> int:
+    """Insert pending assignments for ``slots`` in a single batched statement.
 
-    Only removes assignments that are still pending — completed or
-    verified ones are never touched.
+    Relies on the ``(chore_id, user_id, date)`` unique constraint so that
+    a slot created concurrently by another request is silently kept.
+    Returns the number of slots submitted.
     """
-    result = await db.execute(
-        select(ChoreAssignment).where(
-            ChoreAssignment.chore_id == chore_id,
-            ChoreAssignment.user_id == user_id,
-            ChoreAssignment.date == day,
-            ChoreAssignment.status == AssignmentStatus.pending,
-        )
+    if not slots:
+        return 0
+    stmt = sqlite_insert(ChoreAssignment).on_conflict_do_nothing(
+        index_elements=["chore_id", "user_id", "date"],
     )
-    stale = result.scalar_one_or_none()
-    if stale:
-        await db.delete(stale)
-        logger.debug(
-            "Removed stale rotation assignment: chore=%d user=%d day=%s",
-            chore_id, user_id, day,
-        )
-
+    await db.execute(
+        stmt,
+        [
+            {
+                "chore_id": chore_id,
+                "user_id": user_id,
+                "date": day,
+                "status": AssignmentStatus.pending,
+            }
+            for chore_id, user_id, day in sorted(slots)
+        ],
+    )
+    # Bulk inserts bypass the daily stats hook
+    await refresh_daily_stats(db, {(user_id, day) for _, user_id, day in slots})
+    logger.debug("Created %d assignments", len(slots))
+    return len(slots)
 
-async def _create_if_missing(
-    db: AsyncSession, chore_id: int, user_id: int, day: date
-) -> bool:
-    """Create a pending assignment if one doesn't already exist.
 
-    Returns True if a new assignment was created.
-    """
-    existing = await db.execute(
-        select(ChoreAssignment).where(
-            ChoreAssignment.chore_id == chore_id,
-            ChoreAssignment.user_id == user_id,
-            ChoreAssignment.date == day,
-        )
+async def _stamp_watermark(db: AsyncSession, week_start: date) -> None:
+    """Record that ``week_start``'s assignments are materialized."""
+    now = clock.now()
+    stmt = sqlite_insert(GenerationWatermark).values(
+        week_start=week_start, materialized_at=now,
     )
-    if existing.scalar_one_or_none() is None:
-        db.add(
-            ChoreAssignment(
-                chore_id=chore_id,
-                user_id=user_id,
-                date=day,
-                status=AssignmentStatus.pending,
-            )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["week_start"],
+            set_={"materialized_at": now},
         )
-        logger.debug("Created assignment: chore=%d user=%d day=%s", chore_id, user_id, day)
-        return True
-    return False
+    )
 
 
-async def _generate_from_rules(
-    db: AsyncSession,
+def _plan_from_rules(
     chore: Chore,
     rules: list[ChoreAssignmentRule],
     rotation: ChoreRotation | None,
-    week_dates: list[date],
+    week_start: date,
+    week_end: date,
+    active_days: set[date],
     exclusion_set: set[tuple[int, int, date]],
+    targets: set[tuple[int, int, date]],
+    stale: set[tuple[int, int, date]],
 ) -> None:
-    """Generate week assignments using per-kid assignment rules."""
+    """Collect week slots using per-kid assignment rules.
+
+    Only days in ``active_days`` (the week minus vacation days) are used.
+    """
     active_weekdays = _collect_active_weekdays(rules, chore) if rotation else None
 
     # Anchor the projection to when current_index was last set, NOT today.
     # This keeps the calendar consistent regardless of whether the daily
     # reset task has advanced the rotation yet (e.g. after container restart).
-    if rotation and rotation.last_rotated:
-        lr = rotation.last_rotated
-        reference_day = lr.date() if hasattr(lr, "date") else lr
-    else:
-        reference_day = date.today()
-
-    for rule in rules:
-        if rule.recurrence == Recurrence.once:
-            continue
+    # A rotation that never advanced is anchored to its creation; the
+    # watermark only tracks rows, so the plan must not depend on the day
+    # it is generated.
+    anchor = rotation and (rotation.last_rotated or rotation.created_at)
+    reference_day = clock.local_date(anchor) if anchor else week_start
+
+    kid_by_day: dict[date, int] = {}
+    if rotation and rotation.kid_ids:
+        kid_by_day = project_rotation(
+            rotation, week_start, week_end, reference_day, active_weekdays,
+        )
 
-        for day in week_dates:
-            if not should_create_on_day(
-                rule.recurrence, day, chore.created_at.weekday(), rule.custom_days,
-                created_at_date=chore.created_at.date() if hasattr(chore.created_at, 'date') else chore.created_at,
-            ):
+    rules = [r for r in rules if r.recurrence != Recurrence.once]
+    schedules = expand_occurrences(
+        [compile_chore_recurrence(chore, r) for r in rules], week_start, week_end,
+    )
+    for rule, days in zip(rules, schedules):
+        for day in days:
+            if day not in active_days:
                 continue
 
             # Rotation filtering
-            if rotation and rotation.kid_ids:
-                expected_kid = get_rotation_kid_for_day(
-                    rotation, day, reference_day, active_weekdays,
-                )
-                if int(rule.user_id) != expected_kid:
-                    # Clean up any stale pending assignment for the wrong kid
-                    # on this day (could have been created by a prior buggy run).
-                    await _remove_stale_rotation_assignment(
-                        db, chore.id, rule.user_id, day,
-                    )
+            if kid_by_day:
+                if int(rule.user_id) != kid_by_day[day]:
+                    stale.add((chore.id, rule.user_id, day))
                     continue
 
             if (chore.id, rule.user_id, day) in exclusion_set:
                 continue
 
-            await _create_if_missing(db, chore.id, rule.user_id, day)
+            targets.add((chore.id, rule.user_id, day))
 
 
 def _collect_active_weekdays(
@@ -323,43 +448,35 @@ def _collect_active_weekdays(
     return sorted(weekdays) if weekdays else None
 
 
-async def _generate_legacy(
-    db: AsyncSession,
+def _plan_legacy(
     chore: Chore,
-    week_dates: list[date],
+    rotation: ChoreRotation | None,
+    past_user_ids: list[int],
+    week_start: date,
+    week_end: date,
+    active_days: set[date],
     exclusion_set: set[tuple[int, int, date]],
+    targets: set[tuple[int, int, date]],
 ) -> None:
-    """Generate week assignments using chore-level recurrence (legacy path)."""
+    """Collect week slots using chore-level recurrence (legacy path)."""
     if chore.recurrence == Recurrence.once:
         return
 
     # Determine assigned user IDs
-    rules_result = await db.execute(
-        select(ChoreAssignmentRule.user_id).where(
-            ChoreAssignmentRule.chore_id == chore.id,
-            ChoreAssignmentRule.is_active == True,
-        )
-    )
-    user_ids = list(rules_result.scalars().all())
-
-    if not user_ids:
-        rotation = await _load_rotation(db, chore.id)
-        if rotation and rotation.kid_ids:
-            user_ids = [int(kid_id) for kid_id in rotation.kid_ids]
-        else:
-            user_ids = await _get_legacy_user_ids(db, chore.id)
+    if rotation and rotation.kid_ids:
+        user_ids = [int(kid_id) for kid_id in rotation.kid_ids]
+    else:
+        user_ids = past_user_ids
 
     if not user_ids:
         return
 
-    for day in week_dates:
-        if not should_create_on_day(
-            chore.recurrence, day, chore.created_at.weekday(), chore.custom_days,
-            created_at_date=chore.created_at.date() if hasattr(chore.created_at, 'date') else chore.created_at,
-        ):
+    compiled = compile_chore_recurrence(chore)
+    for day in compiled.occurrences(week_start, week_end):
+        if day not in active_days:
             continue
 
         for user_id in user_ids:
             if (chore.id, user_id, day) in exclusion_set:
                 continue
-            await _create_if_missing(db, chore.id, user_id, day)
+            targets.add((chore.id, user_id, day))
@@ -0,0 +1,75 @@
+"""Household clock: the single source of "now" and "today".
+
+Everything that decides which calendar day it is (the assignment
+generator, streaks, spin eligibility, the daily reset schedule) goes
+through ``clock`` so that days roll over at local midnight in
+``Settings.TZ`` regardless of the server's own timezone.  The time
+source can be swapped, which lets DST transitions be simulated without
+sleeping.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+from backend.config import settings
+from backend.timeutil import as_utc, household_tz, local_date
+
+
+class Clock:
+    def __init__(self, now_fn: Callable[[], datetime] | None = None):
+        # Returns an aware datetime; defaults to the system clock
+        self.now_fn = now_fn
+
+    @property
+    def tz(self) -> ZoneInfo:
+        return household_tz()
+
+    def now(self) -> datetime:
+        """Current instant as an aware UTC datetime."""
+        if self.now_fn is not None:
+            return self.now_fn().astimezone(timezone.utc)
+        return datetime.now(timezone.utc)
+
+    def local_now(self) -> datetime:
+        return self.now().astimezone(self.tz)
+
+    def today(self) -> date:
+        """The household's current calendar day."""
+        return self.local_now().date()
+
+    def local_date(self, instant: datetime) -> date:
+        """Local calendar day of ``instant`` (naive values are UTC)."""
+        return local_date(instant)
+
+    def reset_time_for(self, day: date) -> datetime:
+        """Return the UTC instant of the daily reset for local ``day``.
+
+        The reset runs at ``DAILY_RESET_HOUR`` local time.  If that hour
+        is skipped by a DST change it runs when the clocks jump forward;
+        if it occurs twice it runs at the first occurrence.
+        """
+        # fold=0 resolves both cases that way under zoneinfo
+        local = datetime(day.year, day.month, day.day, settings.DAILY_RESET_HOUR, tzinfo=self.tz)
+        return local.astimezone(timezone.utc)
+
+    def latest_reset_day(self, now: datetime | None = None) -> date:
+        """Return the most recent local day whose reset time has passed."""
+        now = self._aware(now)
+        today = now.astimezone(self.tz).date()
+        if now >= self.reset_time_for(today):
+            return today
+        return today - timedelta(days=1)
+
+    def next_reset_after(self, now: datetime | None = None) -> datetime:
+        """Return the first reset instant (aware UTC) after ``now``."""
+        day = self.latest_reset_day(now) + timedelta(days=1)
+        return self.reset_time_for(day)
+
+    def _aware(self, now: datetime | None) -> datetime:
+        if now is None:
+            return self.now()
+        return as_utc(now)
+
+
+clock = Clock()
@@ -0,0 +1,102 @@
+"""Daily reset with catch-up for days missed while the app was down.
+
+Days are local to ``Settings.TZ`` and each reset runs at
+``DAILY_RESET_HOUR`` local time (see ``services/clock.py``).  The date
+of the last completed reset is persisted in ``app_settings``.
+Each time the reset runs, every day between that marker and the most
+recent reset time is replayed oldest first, one transaction per day,
+so rotations advance exactly as if the task had run on schedule and
+the family streak is settled for the day before.
+Replays are bounded by ``DAILY_RESET_CATCHUP_DAYS``.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import settings
+from backend.database import async_session
+from backend.models import AppSetting
+from backend.services.assignment_generator import generate_daily_assignments
+from backend.services.clock import clock
+from backend.services.family_streak import settle_family_streak
+
+logger = logging.getLogger(__name__)
+
+LAST_RESET_KEY = "last_daily_reset"
+
+
+def next_reset_after(now: datetime) -> datetime:
+    """Scheduler next-run function: the first reset after naive-UTC
+    ``now``, as naive UTC."""
+    return clock.next_reset_after(now).replace(tzinfo=None)
+
+
+async def get_last_reset(db: AsyncSession) -> date | None:
+    result = await db.execute(
+        select(AppSetting.value).where(AppSetting.key == LAST_RESET_KEY)
+    )
+    value = result.scalar_one_or_none()
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        logger.warning("Ignoring malformed %s value %r", LAST_RESET_KEY, value)
+        return None
+
+
+async def _set_last_reset(db: AsyncSession, day: date) -> None:
+    result = await db.execute(
+        select(AppSetting).where(AppSetting.key == LAST_RESET_KEY)
+    )
+    setting = result.scalar_one_or_none()
+    if setting:
+        setting.value = day.isoformat()
+        setting.updated_at = clock.now()
+    else:
+        db.add(AppSetting(key=LAST_RESET_KEY, value=day.isoformat()))
+
+
+def _days_to_run(last: date | None, due: date) -> list[date]:
+    if last is None:
+        # No history yet (fresh install or upgrade): only run the latest
+        # reset rather than inventing past ones.
+        return [due]
+    if last >= due:
+        return []
+    first = last + timedelta(days=1)
+    earliest = due - timedelta(days=max(settings.DAILY_RESET_CATCHUP_DAYS, 1) - 1)
+    if first < earliest:
+        logger.warning(
+            "Skipping %d missed daily resets before %s (catch-up limit is %d days)",
+            (earliest - first).days, earliest, settings.DAILY_RESET_CATCHUP_DAYS,
+        )
+        first = earliest
+    return [first + timedelta(days=i) for i in range((due - first).days + 1)]
+
+
+async def run_due_resets(now: datetime | None = None) -> list[date]:
+    """Run every daily reset that is due but not yet completed.
+
+    Each day is generated and marked complete in its own transaction,
+    so a failure leaves the marker on the last good day and the
+    remaining days are retried on the next run.  Returns the days run.
+    """
+    due = clock.latest_reset_day(now)
+
+    async with async_session() as db:
+        days = _days_to_run(await get_last_reset(db), due)
+
+    if len(days) > 1:
+        logger.info("Catching up %d missed daily resets (%s to %s)", len(days), days[0], days[-1])
+
+    for day in days:
+        async with async_session() as db:
+            await generate_daily_assignments(db, day, now=clock.reset_time_for(day))
+            await settle_family_streak(db, day - timedelta(days=1))
+            await _set_last_reset(db, day)
+            await db.commit()
+    return days
@@ -0,0 +1,206 @@
+"""Maintenance of the ``user_daily_stats`` rollup.
+
+Every (user, day) cell touched by a flush of ``ChoreAssignment`` or
+``PointTransaction`` rows is recomputed from its source rows in the same
+transaction, via an ``after_flush`` hook.  A cell covers one kid's
+assignments for one day, so each refresh is a couple of indexed lookups
+however long the history grows, and recomputing (rather than applying
+deltas) keeps the cell right even when an upsert or a concurrent writer
+changed rows the session never saw.
+
+Import this module once at app startup (e.g. in main.py lifespan) and
+call ``install_daily_stats_hooks``.  Bulk ``insert()``/``update()``/
+``delete()`` statements bypass the unit of work and must call
+``refresh_daily_stats`` with the cells they touched.
+``rebuild_daily_stats`` recomputes the whole table for repair.
+"""
+
+import logging
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import Connection, delete, event, func, inspect, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.models import (
+    AssignmentStatus,
+    ChoreAssignment,
+    PointTransaction,
+    UserDailyStats,
+)
+from backend.services.family_streak import clear_settled_days
+
+logger = logging.getLogger(__name__)
+
+Cell = tuple[int, date]
+
+# session.info key holding the cells refreshed in the current transaction
+REFRESHED_CELLS_KEY = "daily_stats_cells"
+
+# Rollup column for each assignment status; pending only counts as assigned
+_STATUS_COLUMNS = {
+    AssignmentStatus.completed: "completed",
+    AssignmentStatus.verified: "verified",
+    AssignmentStatus.skipped: "skipped",
+}
+
+# Attributes whose changes move a row's contribution, per model
+_WATCHED = {
+    ChoreAssignment: ("date", ("user_id", "date", "status")),
+    PointTransaction: ("local_day", ("user_id", "local_day", "amount")),
+}
+
+
+def _empty_cell(user_id: int, day: date) -> dict:
+    return {
+        "user_id": user_id, "day": day, "xp_earned": 0,
+        "assigned": 0, "completed": 0, "verified": 0, "skipped": 0,
+    }
+
+
+def _aggregate(
+    conn: Connection, cells: set[Cell] | None = None, user_ids: list[int] | None = None,
+) -> list[dict]:
+    """Compute rollup rows from the source tables.
+
+    Restricted to ``cells`` or to the cells of ``user_ids`` when given,
+    otherwise every cell.  Cells with no source rows are omitted.
+    """
+    assignments = select(
+        ChoreAssignment.user_id,
+        ChoreAssignment.date.label("day"),
+        ChoreAssignment.status,
+        func.count().label("n"),
+    ).group_by(ChoreAssignment.user_id, ChoreAssignment.date, ChoreAssignment.status)
+    xp = select(
+        PointTransaction.user_id,
+        PointTransaction.local_day.label("day"),
+        func.sum(PointTransaction.amount).label("xp"),
+    ).where(
+        PointTransaction.amount > 0,
+        PointTransaction.local_day.is_not(None),
+    ).group_by(PointTransaction.user_id, PointTransaction.local_day)
+
+    if cells is not None:
+        user_ids = {user_id for user_id, _ in cells}
+        days = {day for _, day in cells}
+        # Filter on the cross product; stray cells are dropped below
+        assignments = assignments.where(
+            ChoreAssignment.user_id.in_(user_ids), ChoreAssignment.date.in_(days),
+        )
+        xp = xp.where(
+            PointTransaction.user_id.in_(user_ids), PointTransaction.local_day.in_(days),
+        )
+    elif user_ids is not None:
+        assignments = assignments.where(ChoreAssignment.user_id.in_(user_ids))
+        xp = xp.where(PointTransaction.user_id.in_(user_ids))
+
+    rows: dict[Cell, dict] = {}
+    for row in conn.execute(assignments):
+        key = (row.user_id, row.day)
+        if cells is not None and key not in cells:
+            continue
+        cell = rows.setdefault(key, _empty_cell(*key))
+        cell["assigned"] += row.n
+        column = _STATUS_COLUMNS.get(row.status)
+        if column:
+            cell[column] += row.n
+    for row in conn.execute(xp):
+        key = (row.user_id, row.day)
+        if cells is not None and key not in cells:
+            continue
+        rows.setdefault(key, _empty_cell(*key))["xp_earned"] = row.xp or 0
+    return list(rows.values())
+
+
+def _refresh_cells(session: Session, cells: set[Cell]) -> None:
+    if not cells:
+        return
+    conn = session.connection()
+    rows = _aggregate(conn, cells)
+    conn.execute(
+        delete(UserDailyStats).where(
+            tuple_(UserDailyStats.user_id, UserDailyStats.day).in_(list(cells))
+        )
+    )
+    if rows:
+        conn.execute(insert(UserDailyStats), rows)
+    # The settled family streak was derived from the old cell values
+    clear_settled_days(conn, min(day for _, day in cells))
+
+    # New cell values (None for removed cells) for after-commit listeners
+    # such as the current-week leaderboard; dropped on rollback.
+    refreshed = session.info.setdefault(REFRESHED_CELLS_KEY, {})
+    refreshed.update(dict.fromkeys(cells))
+    refreshed.update({(row["user_id"], row["day"]): row for row in rows})
+
+
+async def refresh_daily_stats(db: AsyncSession, cells: Iterable[Cell]) -> None:
+    """Recompute the given (user_id, day) cells in ``db``'s transaction."""
+    cells = set(cells)
+    if cells:
+        await db.run_sync(_refresh_cells, cells)
+
+
+async def rebuild_daily_stats(db: AsyncSession, user_ids: list[int] | None = None) -> int:
+    """Recompute the rollup from the source tables.
+
+    Only the rows of ``user_ids`` are rebuilt when given, which keeps
+    the transaction short for batched backfills.  Runs in ``db``'s
+    transaction; the caller commits.  Returns the number of rows written.
+    """
+    def rebuild(session: Session) -> int:
+        conn = session.connection()
+        rows = _aggregate(conn, user_ids=user_ids)
+        stmt = delete(UserDailyStats)
+        if user_ids is not None:
+            stmt = stmt.where(UserDailyStats.user_id.in_(user_ids))
+        conn.execute(stmt)
+        if rows:
+            conn.execute(insert(UserDailyStats), rows)
+        return len(rows)
+
+    count = await db.run_sync(rebuild)
+    if user_ids is None:
+        logger.info("Rebuilt user_daily_stats: %d rows", count)
+    return count
+
+
+def _touched_cells(obj, day_attr: str, watched: tuple[str, ...], is_dirty: bool) -> set[Cell]:
+    state = inspect(obj)
+    if is_dirty and not any(state.attrs[name].history.has_changes() for name in watched):
+        return set()
+    # A moved row leaves its old cell as well as entering the new one
+    user_ids = {obj.user_id, *state.attrs.user_id.history.deleted}
+    days = {getattr(obj, day_attr), *state.attrs[day_attr].history.deleted}
+    return {
+        (user_id, day) for user_id in user_ids for day in days
+        if user_id is not None and day is not None
+    }
+
+
+def _after_flush(session: Session, flush_context):
+    """Refresh the cells of flushed assignments and point transactions."""
+    cells: set[Cell] = set()
+    for objects, is_dirty in (
+        (session.new, False), (session.deleted, False), (session.dirty, True),
+    ):
+        for obj in objects:
+            watched = _WATCHED.get(type(obj))
+            if watched:
+                cells |= _touched_cells(obj, *watched, is_dirty)
+    if cells:
+        _refresh_cells(session, cells)
+        logger.debug("Refreshed %d daily stats cells", len(cells))
+
+
+def _after_rollback(session: Session):
+    session.info.pop(REFRESHED_CELLS_KEY, None)
+
+
+def install_daily_stats_hooks():
+    """Register SQLAlchemy event listeners. Call once at startup."""
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_rollback", _after_rollback)
+    logger.info("Daily stats rollup hooks installed")
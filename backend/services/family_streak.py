@@ -0,0 +1,176 @@
+"""Materialized family streak.
+
+The family streak counts consecutive days on which every active kid
+completed (or had verified) at least one quest.  Vacation days neither
+count nor break it, matching individual streaks.
+
+Finished days are settled into ``app_settings`` as the last settled day
+and the streak length through it; the daily reset settles each day once
+it is over.  Today's contribution is read from the ``user_daily_stats``
+rollup, which is updated in the same transaction as every completion,
+verification and uncompletion, so the streak goes up as soon as the
+last kid finishes without re-walking history.  Vacation changes, kids
+being activated or deactivated and rollup changes to already settled
+days (a late verification, a deleted assignment) clear the settled
+state so that it is recomputed from the rollup.
+"""
+
+import json
+import logging
+from datetime import date, timedelta
+
+from sqlalchemy import Connection, delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import AppSetting, User, UserDailyStats, UserRole
+from backend.services.clock import clock
+from backend.services.interval_index import interval_index
+
+logger = logging.getLogger(__name__)
+
+FAMILY_STREAK_KEY = "family_streak"
+
+
+async def _active_kid_ids(db: AsyncSession) -> list[int]:
+    result = await db.execute(
+        select(User.id).where(User.role == UserRole.kid, User.is_active == True)
+    )
+    return list(result.scalars().all())
+
+
+async def _qualifying_days(
+    db: AsyncSession, kid_ids: list[int], start: date | None, end: date,
+) -> set[date]:
+    """Days in ``[start, end]`` on which every kid in ``kid_ids`` got a quest done."""
+    if not kid_ids:
+        return set()
+    stmt = (
+        select(UserDailyStats.day)
+        .where(
+            UserDailyStats.user_id.in_(kid_ids),
+            UserDailyStats.day <= end,
+            UserDailyStats.completed + UserDailyStats.verified > 0,
+        )
+        .group_by(UserDailyStats.day)
+        # One rollup row per kid and day, so this is "every kid"
+        .having(func.count() == len(kid_ids))
+    )
+    if start is not None:
+        stmt = stmt.where(UserDailyStats.day >= start)
+    result = await db.execute(stmt)
+    return set(result.scalars().all())
+
+
+def _parse_state(value: str | None) -> tuple[date, int] | None:
+    if not value:
+        return None
+    try:
+        state = json.loads(value)
+        return date.fromisoformat(state["through"]), int(state["length"])
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed %s value %r", FAMILY_STREAK_KEY, value)
+        return None
+
+
+async def _load_state(db: AsyncSession) -> tuple[date, int] | None:
+    result = await db.execute(
+        select(AppSetting.value).where(AppSetting.key == FAMILY_STREAK_KEY)
+    )
+    return _parse_state(result.scalar_one_or_none())
+
+
+async def _save_state(db: AsyncSession, through: date, length: int) -> None:
+    value = json.dumps({"through": through.isoformat(), "length": length})
+    stmt = sqlite_insert(AppSetting).values(key=FAMILY_STREAK_KEY, value=value)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={"value": value, "updated_at": clock.now().replace(tzinfo=None)},
+        )
+    )
+
+
+async def settle_family_streak(db: AsyncSession, through: date) -> int:
+    """Settle every finished day up to and including ``through``.
+
+    Without settled state (first run, or after a vacation change) the
+    streak is recomputed from the whole rollup; otherwise only the days
+    since the last settlement are read.  Writes within ``db``'s
+    transaction; the caller commits.  Returns the settled length.
+    """
+    state = await _load_state(db)
+    if state is not None and state[0] >= through:
+        return state[1]
+
+    await interval_index.ensure_loaded(db)
+    kid_ids = await _active_kid_ids(db)
+
+    if state is None:
+        length = 0
+        qualifying = await _qualifying_days(db, kid_ids, None, through)
+        # Days before the first qualifying day can't extend the streak
+        earliest = min(qualifying, default=through)
+        day = through
+        while day >= earliest:
+            if day in qualifying:
+                length += 1
+            elif not interval_index.is_vacation_day(day):
+                break
+            day -= timedelta(days=1)
+    else:
+        settled_through, length = state
+        start = settled_through + timedelta(days=1)
+        qualifying = await _qualifying_days(db, kid_ids, start, through)
+        day = start
+        while day <= through:
+            if day in qualifying:
+                length += 1
+            elif not interval_index.is_vacation_day(day):
+                length = 0
+            day += timedelta(days=1)
+
+    await _save_state(db, through, length)
+    return length
+
+
+async def get_family_streak(db: AsyncSession, today: date, kid_ids: list[int]) -> int:
+    """Return the family streak including today once every kid is done.
+
+    ``kid_ids`` are the active kids.  Settles any finished days the
+    daily reset has not covered yet, such as those between midnight and
+    the reset hour, and commits them.
+    """
+    if not kid_ids:
+        return 0
+    yesterday = today - timedelta(days=1)
+    state = await _load_state(db)
+    if state is not None and state[0] >= yesterday:
+        length = state[1]
+    else:
+        length = await settle_family_streak(db, yesterday)
+        await db.commit()
+
+    if today in await _qualifying_days(db, kid_ids, today, today):
+        length += 1
+    return length
+
+
+async def clear_family_streak(db: AsyncSession) -> None:
+    """Drop the settled streak so it is recomputed on next use."""
+    await db.execute(delete(AppSetting).where(AppSetting.key == FAMILY_STREAK_KEY))
+
+
+def clear_settled_days(conn: Connection, earliest: date) -> None:
+    """Drop the settled streak if it covers ``earliest``.
+
+    Called with the connection of a flush that changed rollup cells on
+    ``earliest`` or later; cells after the settled day are read live.
+    """
+    value = conn.execute(
+        select(AppSetting.value).where(AppSetting.key == FAMILY_STREAK_KEY)
+    ).scalar_one_or_none()
+    state = _parse_state(value)
+    if state is not None and state[0] >= earliest:
+        conn.execute(delete(AppSetting).where(AppSetting.key == FAMILY_STREAK_KEY))
+        logger.debug("Settled family streak cleared for a change on %s", earliest)
@@ -0,0 +1,101 @@
+"""SQLAlchemy event hook that clears the assignment generation watermark
+whenever anything the week generator reads from is changed.
+
+Besides the watched models, chores without assignment rules take their
+kids from past assignments, so adding, removing or moving an assignment
+of such a chore also clears the watermarks.
+
+Import this module once at app startup (e.g. in main.py lifespan) to
+activate the hook.  Changes made through bulk ``delete()``/``update()``
+statements bypass the unit of work and must call
+``invalidate_generation`` explicitly.
+"""
+
+import logging
+from sqlalchemy import Connection, delete, event, exists, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.models import (
+    Chore,
+    ChoreAssignment,
+    ChoreAssignmentRule,
+    ChoreExclusion,
+    ChoreRotation,
+    GenerationWatermark,
+    VacationPeriod,
+)
+
+logger = logging.getLogger(__name__)
+
+# Models whose changes can alter which assignments a week should contain.
+_WATCHED_MODELS = (
+    Chore,
+    ChoreAssignmentRule,
+    ChoreRotation,
+    ChoreExclusion,
+    VacationPeriod,
+)
+
+
+async def invalidate_generation(db: AsyncSession) -> None:
+    """Mark every week as needing regeneration on its next read."""
+    await db.execute(delete(GenerationWatermark))
+
+
+def _touches_generation(session: Session) -> bool:
+    for obj in session.new:
+        if isinstance(obj, _WATCHED_MODELS):
+            return True
+    for obj in session.deleted:
+        if isinstance(obj, _WATCHED_MODELS):
+            return True
+    for obj in session.dirty:
+        if isinstance(obj, _WATCHED_MODELS) and session.is_modified(obj):
+            return True
+    return False
+
+
+def _assignment_chore_ids(session: Session) -> set[int]:
+    """Chores whose set of assigned kids this flush may change."""
+    chore_ids: set[int] = set()
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, ChoreAssignment):
+            chore_ids.add(obj.chore_id)
+    for obj in session.dirty:
+        if not isinstance(obj, ChoreAssignment):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[name].history.has_changes() for name in ("chore_id", "user_id")):
+            # A moved assignment leaves its old chore as well
+            chore_ids.add(obj.chore_id)
+            chore_ids.update(state.attrs.chore_id.history.deleted)
+    chore_ids.discard(None)
+    return chore_ids
+
+
+def _any_without_rules(conn: Connection, chore_ids: set[int]) -> bool:
+    has_rules = exists().where(
+        ChoreAssignmentRule.chore_id == Chore.id,
+        ChoreAssignmentRule.is_active == True,
+    )
+    result = conn.execute(
+        select(Chore.id).where(Chore.id.in_(chore_ids), ~has_rules).limit(1)
+    )
+    return result.first() is not None
+
+
+def _after_flush(session: Session, flush_context):
+    """Clear watermarks in the same transaction as the upstream change."""
+    if not _touches_generation(session):
+        chore_ids = _assignment_chore_ids(session)
+        if not chore_ids or not _any_without_rules(session.connection(), chore_ids):
+            return
+    session.connection().execute(GenerationWatermark.__table__.delete())
+    logger.debug("Assignment generation watermarks invalidated")
+
+
+def install_generation_hooks():
+    """Register SQLAlchemy event listeners. Call once at startup."""
+    event.listen(Session, "after_flush", _after_flush)
+    logger.info("Assignment generation watermark hooks installed")
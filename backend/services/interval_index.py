@@ -0,0 +1,176 @@
+"""Process-wide in-memory index over vacation periods and seasonal events.
+
+Vacation and event lookups happen on hot paths (week generation, the
+streak gap check and every quest approval) while the underlying rows
+change only when a parent edits them.  The index is loaded lazily on
+first use and rebuilt by the vacation/events routers after each write,
+so lookups never touch the database.
+
+Every flush that changes a vacation period or seasonal event also bumps
+a version stamp in ``app_settings`` (see ``install_interval_index_hooks``).
+``ensure_loaded`` compares that stamp with the one the index was built
+from, so an edit made on one worker is picked up by every other worker
+on its next lookup at the cost of a single primary-key read.
+"""
+
+import bisect
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import cast, event, Integer, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.models import AppSetting, SeasonalEvent, VacationPeriod
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_VERSION_KEY = "interval_index_version"
+
+# Models the index is built from.
+_WATCHED_MODELS = (VacationPeriod, SeasonalEvent)
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """Normalise to naive UTC, matching how SQLite stores event bounds."""
+    if dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+async def _read_version(db: AsyncSession) -> str | None:
+    result = await db.execute(
+        select(AppSetting.value).where(AppSetting.key == INTERVAL_VERSION_KEY)
+    )
+    return result.scalar_one_or_none()
+
+
+class IntervalIndex:
+    def __init__(self):
+        self._loaded = False
+        self._version: str | None = None
+        # Merged, non-overlapping vacation ranges sorted by start date
+        self._vacation_starts: list[date] = []
+        self._vacation_ends: list[date] = []
+        # Active events as (start, end, title, multiplier), sorted by start
+        self._events: list[tuple[datetime, datetime, str, float]] = []
+        self._event_starts: list[datetime] = []
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Reload all active vacation periods and seasonal events."""
+        # Read the stamp first: a write landing mid-rebuild leaves the
+        # stored version ahead of ours and triggers another reload.
+        version = await _read_version(db)
+        # Select columns rather than entities so identity-mapped objects
+        # with uncommitted or unrefreshed attributes are never used.
+        vac_result = await db.execute(
+            select(VacationPeriod.start_date, VacationPeriod.end_date)
+            .where(VacationPeriod.is_active == True)
+            .order_by(VacationPeriod.start_date)
+        )
+        starts: list[date] = []
+        ends: list[date] = []
+        for row in vac_result.all():
+            if row.end_date < row.start_date:
+                continue
+            # Merge overlapping or adjacent periods
+            if ends and row.start_date <= ends[-1] + timedelta(days=1):
+                ends[-1] = max(ends[-1], row.end_date)
+            else:
+                starts.append(row.start_date)
+                ends.append(row.end_date)
+
+        ev_result = await db.execute(
+            select(
+                SeasonalEvent.start_date,
+                SeasonalEvent.end_date,
+                SeasonalEvent.title,
+                SeasonalEvent.multiplier,
+            )
+            .where(SeasonalEvent.is_active == True)
+            .order_by(SeasonalEvent.start_date, SeasonalEvent.id)
+        )
+        events = [
+            (_naive_utc(row.start_date), _naive_utc(row.end_date), row.title, row.multiplier)
+            for row in ev_result.all()
+        ]
+        events.sort(key=lambda e: e[0])
+
+        # Swap in one step so concurrent readers never see a partial index
+        (
+            self._vacation_starts, self._vacation_ends,
+            self._events, self._event_starts, self._loaded, self._version,
+        ) = starts, ends, events, [e[0] for e in events], True, version
+        logger.debug(
+            "Interval index rebuilt at version %s: %d vacation ranges, %d events",
+            version, len(starts), len(events),
+        )
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """Load the index, or reload it if another worker changed the rows."""
+        if not self._loaded or await _read_version(db) != self._version:
+            await self.rebuild(db)
+
+    def is_vacation_day(self, day: date) -> bool:
+        """Return True if ``day`` falls within any active vacation period."""
+        i = bisect.bisect_right(self._vacation_starts, day) - 1
+        return i >= 0 and day <= self._vacation_ends[i]
+
+    def vacation_days_between(self, start: date, end: date) -> set[date]:
+        """Return every date in ``[start, end]`` covered by a vacation."""
+        days: set[date] = set()
+        i = max(bisect.bisect_right(self._vacation_starts, start) - 1, 0)
+        while i < len(self._vacation_starts) and self._vacation_starts[i] <= end:
+            day = max(self._vacation_starts[i], start)
+            last = min(self._vacation_ends[i], end)
+            while day <= last:
+                days.add(day)
+                day += timedelta(days=1)
+            i += 1
+        return days
+
+    def active_events(self, at: datetime) -> list[tuple[str, float]]:
+        """Return ``(title, multiplier)`` for every event running at ``at``."""
+        at = _naive_utc(at)
+        upper = bisect.bisect_right(self._event_starts, at)
+        return [
+            (title, multiplier)
+            for start, end, title, multiplier in self._events[:upper]
+            if end >= at
+        ]
+
+
+interval_index = IntervalIndex()
+
+
+def _touches_intervals(session: Session) -> bool:
+    for obj in session.new:
+        if isinstance(obj, _WATCHED_MODELS):
+            return True
+    for obj in session.deleted:
+        if isinstance(obj, _WATCHED_MODELS):
+            return True
+    for obj in session.dirty:
+        if isinstance(obj, _WATCHED_MODELS) and session.is_modified(obj):
+            return True
+    return False
+
+
+def _after_flush(session: Session, flush_context):
+    """Bump the version stamp in the same transaction as the change."""
+    if not _touches_intervals(session):
+        return
+    stmt = sqlite_insert(AppSetting).values(key=INTERVAL_VERSION_KEY, value="1")
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AppSetting.key],
+        set_={"value": cast(cast(AppSetting.value, Integer) + 1, AppSetting.value.type)},
+    )
+    session.connection().execute(stmt)
+    logger.debug("Interval index version bumped")
+
+
+def install_interval_index_hooks():
+    """Register SQLAlchemy event listeners. Call once at startup."""
+    event.listen(Session, "after_flush", _after_flush)
+    logger.info("Interval index version hooks installed")
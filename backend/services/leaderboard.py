@@ -0,0 +1,215 @@
+"""Weekly leaderboard: a live current week and frozen past weeks.
+
+The current week is held in memory as the ``user_daily_stats`` cells of
+its seven days.  It is loaded from the rollup on first use and whenever
+the week rolls over, and after each commit the cells refreshed by that
+transaction are copied in (see ``services/daily_stats.py``), so a
+leaderboard request only reads the kid list.  Commits made by other
+workers are picked up when the copy is reloaded, at most
+``CACHE_MAX_AGE`` later.
+
+At each week boundary the scheduler freezes the finished week into
+``leaderboard_snapshots``; the first run also freezes every earlier week
+found in the rollup.  Weeks run Monday to Sunday in the household
+timezone.
+"""
+
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.database import async_session
+from backend.models import LeaderboardSnapshot, User, UserDailyStats, UserRole
+from backend.services.clock import clock
+from backend.services.daily_stats import REFRESHED_CELLS_KEY
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the in-memory week is reloaded from the rollup
+CACHE_MAX_AGE = 60
+
+
+def week_start_for(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def next_week_boundary(now: datetime) -> datetime:
+    """Scheduler next-run function: the next local Monday midnight after
+    naive-UTC ``now``, as naive UTC."""
+    monday = week_start_for(clock.local_date(now)) + timedelta(days=7)
+    local = datetime(monday.year, monday.month, monday.day, tzinfo=clock.tz)
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def rank_kids(kid_ids: list[int], totals: dict[int, tuple[int, int]]) -> list[tuple[int, int, int, int]]:
+    """Rank kids by weekly XP.
+
+    ``totals`` maps kid id to (weekly_xp, quests_completed).  Kids with XP
+    come first, highest first; the rest follow in ``kid_ids`` order.
+    Returns (kid_id, rank, weekly_xp, quests_completed) tuples.
+    """
+    scored = sorted(
+        (kid_id for kid_id in kid_ids if totals.get(kid_id, (0, 0))[0] > 0),
+        key=lambda kid_id: totals[kid_id][0],
+        reverse=True,
+    )
+    scored_set = set(scored)
+    ordered = scored + [kid_id for kid_id in kid_ids if kid_id not in scored_set]
+    return [
+        (kid_id, rank, *totals.get(kid_id, (0, 0)))
+        for rank, kid_id in enumerate(ordered, start=1)
+    ]
+
+
+async def _week_totals(db: AsyncSession, week_start: date) -> dict[int, tuple[int, int]]:
+    result = await db.execute(
+        select(
+            UserDailyStats.user_id,
+            func.sum(UserDailyStats.xp_earned),
+            func.sum(UserDailyStats.completed + UserDailyStats.verified),
+        )
+        .where(
+            UserDailyStats.day >= week_start,
+            UserDailyStats.day <= week_start + timedelta(days=6),
+        )
+        .group_by(UserDailyStats.user_id)
+    )
+    return {row[0]: (row[1] or 0, row[2] or 0) for row in result.all()}
+
+
+class CurrentWeekLeaderboard:
+    def __init__(self):
+        self._week_start: date | None = None
+        self._loaded_at = 0.0
+        # (user_id, day) -> (xp_earned, quests_completed)
+        self._cells: dict[tuple[int, date], tuple[int, int]] = {}
+
+    async def totals(self, db: AsyncSession, today: date) -> dict[int, tuple[int, int]]:
+        """Return {kid_id: (weekly_xp, quests_completed)} for ``today``'s week."""
+        week_start = week_start_for(today)
+        if (
+            self._week_start != week_start
+            or time.monotonic() - self._loaded_at > CACHE_MAX_AGE
+        ):
+            await self._load(db, week_start)
+        totals: dict[int, tuple[int, int]] = {}
+        for (user_id, _), (xp, quests) in self._cells.items():
+            prev_xp, prev_quests = totals.get(user_id, (0, 0))
+            totals[user_id] = (prev_xp + xp, prev_quests + quests)
+        return totals
+
+    async def _load(self, db: AsyncSession, week_start: date) -> None:
+        result = await db.execute(
+            select(
+                UserDailyStats.user_id,
+                UserDailyStats.day,
+                UserDailyStats.xp_earned,
+                UserDailyStats.completed + UserDailyStats.verified,
+            ).where(
+                UserDailyStats.day >= week_start,
+                UserDailyStats.day <= week_start + timedelta(days=6),
+            )
+        )
+        self._cells = {(row[0], row[1]): (row[2], row[3]) for row in result.all()}
+        self._week_start = week_start
+        self._loaded_at = time.monotonic()
+
+    def apply(self, cells: dict[tuple[int, date], dict | None]) -> None:
+        """Copy in committed rollup cells; ``None`` removes a cell."""
+        if self._week_start is None:
+            return
+        week_end = self._week_start + timedelta(days=6)
+        for (user_id, day), row in cells.items():
+            if not self._week_start <= day <= week_end:
+                continue
+            if row is None:
+                self._cells.pop((user_id, day), None)
+            else:
+                self._cells[(user_id, day)] = (
+                    row["xp_earned"], row["completed"] + row["verified"],
+                )
+
+    def invalidate(self) -> None:
+        """Force a reload from the rollup on next use."""
+        self._week_start = None
+
+
+current_week = CurrentWeekLeaderboard()
+
+
+def _after_commit(session: Session):
+    cells = session.info.pop(REFRESHED_CELLS_KEY, None)
+    if cells:
+        current_week.apply(cells)
+
+
+def install_leaderboard_hooks():
+    """Register SQLAlchemy event listeners. Call once at startup."""
+    event.listen(Session, "after_commit", _after_commit)
+    logger.info("Leaderboard cache hooks installed")
+
+
+async def _active_kids_since(db: AsyncSession) -> list[tuple[int, date]]:
+    """Active kids with the local day their account was created."""
+    result = await db.execute(
+        select(User.id, User.created_at)
+        .where(User.role == UserRole.kid, User.is_active == True)
+        .order_by(User.id)
+    )
+    return [
+        (row.id, clock.local_date(row.created_at) if row.created_at else date.min)
+        for row in result.all()
+    ]
+
+
+async def freeze_finished_weeks() -> list[date]:
+    """Snapshot every finished week not yet frozen.  Returns their starts.
+
+    Kids are the currently active ones that existed by the end of each
+    week.  A week already frozen (e.g. by another worker) is left alone.
+    """
+    last_finished = week_start_for(clock.today()) - timedelta(days=7)
+
+    async with async_session() as db:
+        latest = (await db.execute(select(func.max(LeaderboardSnapshot.week_start)))).scalar()
+        if latest is not None:
+            first = latest + timedelta(days=7)
+        else:
+            earliest_day = (await db.execute(select(func.min(UserDailyStats.day)))).scalar()
+            first = week_start_for(earliest_day) if earliest_day else last_finished
+        kids = await _active_kids_since(db)
+
+    frozen = []
+    week_start = first
+    while week_start <= last_finished:
+        week_end = week_start + timedelta(days=6)
+        kid_ids = [kid_id for kid_id, created in kids if created <= week_end]
+        if kid_ids:
+            async with async_session() as db:
+                totals = await _week_totals(db, week_start)
+                rows = [
+                    {
+                        "week_start": week_start,
+                        "user_id": kid_id,
+                        "rank": rank,
+                        "weekly_xp": xp,
+                        "quests_completed": quests,
+                    }
+                    for kid_id, rank, xp, quests in rank_kids(kid_ids, totals)
+                ]
+                await db.execute(
+                    sqlite_insert(LeaderboardSnapshot).on_conflict_do_nothing(),
+                    rows,
+                )
+                await db.commit()
+            frozen.append(week_start)
+        week_start += timedelta(days=7)
+
+    if frozen:
+        logger.info("Froze %d leaderboard weeks (%s to %s)", len(frozen), frozen[0], frozen[-1])
+    return frozen
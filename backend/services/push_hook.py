@@ -47,17 +47,24 @@ def _after_flush(session: Session, flush_context):
     if not new_notifs:
         return
 
-    session.info.setdefault("_pending_push", [])
     for n in new_notifs:
-        notif_type = n.type.value if n.type else "chorequest"
-        url = _NOTIFICATION_URL_MAP.get(notif_type, "/")
-        session.info["_pending_push"].append({
-            "user_id": n.user_id,
-            "title": n.title,
-            "body": n.message,
-            "tag": notif_type,
-            "url": url,
-        })
+        queue_push(session, n.user_id, n.title, n.message, n.type)
+
+
+def queue_push(session: Session, user_id: int, title: str, body: str, notif_type) -> None:
+    """Queue a push to be sent once ``session`` commits.
+
+    For notifications written with bulk ``insert()`` statements, which
+    the flush hook never sees.
+    """
+    tag = notif_type.value if notif_type else "chorequest"
+    session.info.setdefault("_pending_push", []).append({
+        "user_id": user_id,
+        "title": title,
+        "body": body,
+        "tag": tag,
+        "url": _NOTIFICATION_URL_MAP.get(tag, "/"),
+    })
 
 
 def _after_commit(session: Session):
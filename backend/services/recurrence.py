@@ -1,6 +1,7 @@
 """Shared recurrence logic for determining when chores should be assigned."""
 
-from datetime import date
+from datetime import date, timedelta
+from functools import lru_cache
 
 from backend.models import Recurrence
 
@@ -41,3 +42,118 @@ def should_create_on_day(
     if recurrence == Recurrence.custom:
         return bool(custom_days and target_day.weekday() in custom_days)
     return False
+
+
+_ALL_DAYS_MASK = 0b1111111
+
+
+class CompiledRecurrence:
+    """Pre-computed form of a recurrence schedule.
+
+    ``weekday_mask`` has bit *n* set when weekday *n* (0=Mon) can have an
+    occurrence.  ``anchor`` is the fortnight parity anchor (creation
+    date) and is only set for fortnightly schedules that have one.
+    Answers exactly what ``should_create_on_day`` would for the same
+    inputs, without re-deriving anything per call.
+    """
+
+    __slots__ = ("weekday_mask", "anchor")
+
+    def __init__(self, weekday_mask: int, anchor: date | None = None):
+        self.weekday_mask = weekday_mask
+        self.anchor = anchor
+
+    def occurs_on(self, day: date) -> bool:
+        if not self.weekday_mask >> day.weekday() & 1:
+            return False
+        if self.anchor is None:
+            return True
+        return (day - self.anchor).days // 7 % 2 == 0
+
+    def occurrences(self, start: date, end: date) -> list[date]:
+        """Return every occurrence date in ``[start, end]``, in order."""
+        if end < start or not self.weekday_mask:
+            return []
+        step = 7 if self.anchor is None else 14
+        days: list[date] = []
+        for wd in range(7):
+            if not self.weekday_mask >> wd & 1:
+                continue
+            first = start + timedelta(days=(wd - start.weekday()) % 7)
+            if self.anchor is not None and not self.occurs_on(first):
+                first += timedelta(days=7)
+            while first <= end:
+                days.append(first)
+                first += timedelta(days=step)
+        days.sort()
+        return days
+
+
+@lru_cache(maxsize=1024)
+def compile_recurrence(
+    recurrence: Recurrence,
+    created_at_weekday: int,
+    custom_days: tuple[int, ...] | None = None,
+    *,
+    created_at_date: date | None = None,
+) -> CompiledRecurrence:
+    """Compile a recurrence schedule.  Arguments mirror ``should_create_on_day``
+    except that ``custom_days`` must be a tuple so results can be cached."""
+    if recurrence in (Recurrence.once, Recurrence.daily):
+        return CompiledRecurrence(_ALL_DAYS_MASK)
+    if recurrence == Recurrence.weekly:
+        return CompiledRecurrence(_weekday_bit(created_at_weekday))
+    if recurrence == Recurrence.fortnightly:
+        return CompiledRecurrence(_weekday_bit(created_at_weekday), created_at_date)
+    if recurrence == Recurrence.custom:
+        mask = 0
+        for d in custom_days or ():
+            mask |= _weekday_bit(d)
+        return CompiledRecurrence(mask)
+    return CompiledRecurrence(0)
+
+
+def compile_chore_recurrence(chore, rule=None) -> CompiledRecurrence:
+    """Compile the schedule of a ``ChoreAssignmentRule`` (when given) or the
+    chore-level legacy schedule, anchored to the chore's creation date."""
+    source = rule if rule is not None else chore
+    created_dt = (
+        chore.created_at.date()
+        if hasattr(chore.created_at, "date")
+        else chore.created_at
+    )
+    return compile_recurrence(
+        source.recurrence,
+        chore.created_at.weekday(),
+        tuple(source.custom_days) if source.custom_days else None,
+        created_at_date=created_dt,
+    )
+
+
+def expand_occurrences(
+    compiled: list[CompiledRecurrence], start: date, end: date
+) -> list[list[date]]:
+    """Expand many schedules over ``[start, end]`` at once.
+
+    The range's weekday bits are computed a single time and shared by
+    every schedule.  Returns one sorted date list per input, in order.
+    """
+    span = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    bits = [1 << d.weekday() for d in span]
+    expanded = []
+    for c in compiled:
+        if c.weekday_mask == _ALL_DAYS_MASK and c.anchor is None:
+            expanded.append(list(span))
+        elif c.anchor is None:
+            mask = c.weekday_mask
+            expanded.append([d for d, b in zip(span, bits) if mask & b])
+        else:
+            expanded.append([d for d in span if c.occurs_on(d)])
+    return expanded
+
+
+def _weekday_bit(weekday) -> int:
+    # Non-weekday values can never equal date.weekday(), so they add nothing
+    if isinstance(weekday, int) and 0 <= weekday <= 6:
+        return 1 << weekday
+    return 0
@@ -3,32 +3,35 @@
 from datetime import date, datetime, timedelta, timezone
 
 from backend.models import ChoreRotation, RotationCadence
+from backend.services.clock import clock
+
+_CADENCE_DAYS = {
+    "daily": 1,
+    "weekly": 7,
+    "fortnightly": 14,
+    "monthly": 30,
+}
+
+_ALL_DAYS = 0b1111111
 
 
 def should_advance_rotation(rotation: ChoreRotation, now: datetime) -> bool:
     """Determine whether a rotation should advance to the next kid.
 
     Returns True when enough calendar days have passed since the last
-    rotation based on the configured cadence.  We compare calendar
+    rotation based on the configured cadence.  We compare local calendar
     dates (not raw timedeltas) so that e.g. Monday 23:00 → Tuesday
-    00:01 correctly counts as 1 day for daily cadence.
+    00:01 correctly counts as 1 day for daily cadence, including across
+    DST changes.
     """
     if rotation.last_rotated is None:
         return True
 
     cadence = _cadence_value(rotation.cadence)
 
-    now_date = now.date() if hasattr(now, "date") else now
-    last_date = rotation.last_rotated.date() if hasattr(rotation.last_rotated, "date") else rotation.last_rotated
-    days_since = (now_date - last_date).days
+    days_since = (_local_day(now) - _local_day(rotation.last_rotated)).days
 
-    thresholds = {
-        "daily": 1,
-        "weekly": 7,
-        "fortnightly": 14,
-        "monthly": 30,
-    }
-    return days_since >= thresholds.get(cadence, 7)
+    return days_since >= _cadence_days(cadence)
 
 
 def advance_rotation(rotation: ChoreRotation, now: datetime) -> None:
@@ -46,48 +49,149 @@ def get_rotation_kid_for_day(
     """Return the kid ID that should be assigned on ``target_day``
     given the rotation's current state.
 
-    For daily cadence, the kid rotates each *occurrence* relative to
-    ``reference_day``.  When *active_weekdays* is supplied (e.g. from a
-    custom-days schedule), only those weekdays count as occurrences;
-    otherwise every calendar day counts.
-
-    For all other cadences, the same kid is used for the entire period.
+    ``rotation.current_index`` is taken to be the kid on ``reference_day``
+    (normally the date of ``last_rotated``).  The rotation then advances
+    the way the daily reset advances it: on the first occurrence day at
+    least one cadence period after the previous advance.  When
+    *active_weekdays* is supplied (e.g. from a custom-days schedule),
+    only those weekdays count as occurrences; otherwise every calendar
+    day counts.
     """
-    cadence = _cadence_value(rotation.cadence)
+    offset = _advances_between(
+        reference_day, target_day,
+        _cadence_days(_cadence_value(rotation.cadence)),
+        _weekday_mask(active_weekdays),
+    )
+    return int(rotation.kid_ids[(rotation.current_index + offset) % len(rotation.kid_ids)])
 
-    if cadence == "daily":
-        if active_weekdays is not None:
-            offset = _count_occurrences(reference_day, target_day, active_weekdays)
-        else:
-            offset = (target_day - reference_day).days
-        idx = (rotation.current_index + offset) % len(rotation.kid_ids)
-    else:
-        idx = rotation.current_index
 
-    return int(rotation.kid_ids[idx])
+def project_rotation(
+    rotation: ChoreRotation,
+    start: date,
+    end: date,
+    reference_day: date,
+    active_weekdays: list[int] | None = None,
+) -> dict[date, int]:
+    """Return the kid ID for every day in ``[start, end]`` in one pass.
 
+    Equivalent to calling ``get_rotation_kid_for_day`` for each day, but
+    the offset is only derived once and then carried forward, so long
+    ranges (month views, multi-week projections) cost O(1) per day.
+    """
+    if end < start or not rotation.kid_ids:
+        return {}
+
+    kids = [int(k) for k in rotation.kid_ids]
+    period = _cadence_days(_cadence_value(rotation.cadence))
+    mask = _weekday_mask(active_weekdays)
+    schedule: dict[date, int] = {}
+
+    if period == 1 or not mask:
+        # Daily cadence advances on every occurrence day
+        offset = _advances_between(reference_day, start, period, mask)
+        day = start
+        while day <= end:
+            if day != start and mask >> day.weekday() & 1:
+                offset += 1
+            schedule[day] = kids[(rotation.current_index + offset) % len(kids)]
+            day += timedelta(days=1)
+        return schedule
+
+    aligned = _periods_are_aligned(reference_day, period, mask)
+    hits = _advance_dates(reference_day, period, mask)
+    next_hit = next(hits)
+    advanced = 0
+    day = start
+    while day <= end:
+        if aligned or day < reference_day:
+            offset = (day - reference_day).days // period
+        else:
+            while next_hit <= day:
+                advanced += 1
+                next_hit = next(hits)
+            offset = advanced
+        schedule[day] = kids[(rotation.current_index + offset) % len(kids)]
+        day += timedelta(days=1)
+    return schedule
 
-def _count_occurrences(start: date, end: date, weekdays: list[int]) -> int:
-    """Count how many *weekday* occurrences fall in the range (start, end].
 
-    Returns a negative number when *end* < *start*.
+def _advances_between(
+    reference_day: date, target_day: date, period: int, mask: int,
+) -> int:
+    """Number of rotation advances in ``(reference_day, target_day]``.
+
+    Negative when ``target_day`` is before ``reference_day``.
     """
-    if start == end or not weekdays:
+    if not mask:
         return 0
+    if period == 1:
+        return _count_weekdays(reference_day, target_day, mask)
+    if target_day < reference_day or _periods_are_aligned(reference_day, period, mask):
+        # Before the reference day the real advance history is unknown,
+        # so whole periods are assumed.
+        return (target_day - reference_day).days // period
+    count = 0
+    for hit in _advance_dates(reference_day, period, mask):
+        if hit > target_day:
+            return count
+        count += 1
+
+
+def _periods_are_aligned(reference_day: date, period: int, mask: int) -> bool:
+    """True when every advance lands exactly one period after the last,
+    which makes the advance count a plain division."""
+    if mask == _ALL_DAYS:
+        return True
+    return period % 7 == 0 and bool(mask >> reference_day.weekday() & 1)
+
 
-    forward = end >= start
-    a, b = (start, end) if forward else (end, start)
+def _advance_dates(reference_day: date, period: int, mask: int):
+    """Yield the dates after ``reference_day`` on which the rotation
+    advances: the first active day once a full period has elapsed."""
+    due = reference_day + timedelta(days=period)
+    while True:
+        # At most six steps to reach an active weekday
+        while not mask >> due.weekday() & 1:
+            due += timedelta(days=1)
+        yield due
+        due += timedelta(days=period)
 
-    total_days = (b - a).days
-    full_weeks, remaining = divmod(total_days, 7)
 
-    wd_set = set(weekdays)
-    count = full_weeks * len(wd_set)
-    for i in range(1, remaining + 1):
-        if (a + timedelta(days=i)).weekday() in wd_set:
-            count += 1
+def _count_weekdays(start: date, end: date, mask: int) -> int:
+    """Count the days in ``(start, end]`` whose weekday bit is set in *mask*.
 
-    return count if forward else -count
+    Closed form: for each weekday, the number of matching ordinals up to
+    a day is a floor division.  Returns a negative number when
+    *end* < *start*.
+    """
+    a, b = start.toordinal(), end.toordinal()
+    count = 0
+    for wd in range(7):
+        if mask >> wd & 1:
+            # date.fromordinal(1) is a Monday, so weekday == (ordinal - 1) % 7
+            count += (b - 1 - wd) // 7 - (a - 1 - wd) // 7
+    return count
+
+
+def _weekday_mask(weekdays: list[int] | None) -> int:
+    if weekdays is None:
+        return _ALL_DAYS
+    mask = 0
+    for wd in weekdays:
+        if 0 <= wd <= 6:
+            mask |= 1 << wd
+    return mask
+
+
+def _cadence_days(cadence: str) -> int:
+    """Minimum number of calendar days between two advances."""
+    return _CADENCE_DAYS.get(cadence, 7)
+
+
+def _local_day(value: datetime | date) -> date:
+    if isinstance(value, datetime):
+        return clock.local_date(value)
+    return value
 
 
 def _cadence_value(cadence: RotationCadence | str) -> str:
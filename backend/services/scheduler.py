@@ -0,0 +1,241 @@
+"""Leader-elected background job scheduler.
+
+Every worker process starts the scheduler, but only the one holding the
+``scheduler_leases`` row runs jobs.  The leader renews its lease every
+third of ``SCHEDULER_LEASE_SECONDS`` (including while a job is running);
+if it dies, another worker takes over once the lease expires.
+
+Jobs are registered with a function that returns their next run time.
+Each job's next run time and last outcome are kept in ``scheduled_jobs``
+and every run is recorded in ``job_runs``, so a new leader picks up
+exactly where the old one left off.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import case, delete, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from backend.config import settings
+from backend.database import async_session
+from backend.models import JobRun, ScheduledJob, SchedulerLease
+from backend.services.clock import clock
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "scheduler"
+
+# Run history rows kept per job
+HISTORY_LIMIT = 50
+
+# A failed job is retried after this long instead of waiting a full period
+RETRY_DELAY = timedelta(minutes=5)
+
+
+def _utcnow() -> datetime:
+    # Naive UTC, matching how SQLite stores DateTime columns
+    return clock.now().replace(tzinfo=None)
+
+
+class Scheduler:
+    def __init__(self):
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        # name -> (job coroutine function, next-run function)
+        self._jobs: dict[str, tuple[Callable[[], Awaitable], Callable[[datetime], datetime]]] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def lease_seconds(self) -> int:
+        return max(settings.SCHEDULER_LEASE_SECONDS, 3)
+
+    def register(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        next_run: Callable[[datetime], datetime],
+    ) -> None:
+        """Register a job.  ``next_run(now)`` returns the first run time
+        after ``now`` (naive UTC).  A job that has never run is due
+        immediately."""
+        self._jobs[name] = (func, next_run)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            await self._release_lease()
+
+    # ---------- leadership ----------
+
+    async def _acquire_lease(self) -> bool:
+        """Take or renew the lease.  Returns True if this worker holds it."""
+        now = _utcnow()
+        expires = now + timedelta(seconds=self.lease_seconds)
+        async with async_session() as db:
+            result = await db.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == LEASE_NAME,
+                    or_(
+                        SchedulerLease.owner == self.owner_id,
+                        SchedulerLease.expires_at < now,
+                    ),
+                )
+                .values(
+                    owner=self.owner_id,
+                    expires_at=expires,
+                    acquired_at=case(
+                        (SchedulerLease.owner == self.owner_id, SchedulerLease.acquired_at),
+                        else_=now,
+                    ),
+                )
+            )
+            if result.rowcount == 0:
+                await db.execute(
+                    sqlite_insert(SchedulerLease)
+                    .values(name=LEASE_NAME, owner=self.owner_id, acquired_at=now, expires_at=expires)
+                    .on_conflict_do_nothing(index_elements=["name"])
+                )
+            owner = (await db.execute(
+                select(SchedulerLease.owner).where(SchedulerLease.name == LEASE_NAME)
+            )).scalar_one()
+            await db.commit()
+
+        leader = owner == self.owner_id
+        if leader != self.is_leader:
+            if leader:
+                logger.info("Scheduler lease acquired by %s", self.owner_id)
+            else:
+                logger.info("Scheduler lease held by %s; standing by", owner)
+        self.is_leader = leader
+        return leader
+
+    async def _release_lease(self) -> None:
+        async with async_session() as db:
+            await db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == LEASE_NAME, SchedulerLease.owner == self.owner_id)
+                .values(expires_at=_utcnow())
+            )
+            await db.commit()
+        self.is_leader = False
+        logger.info("Scheduler lease released by %s", self.owner_id)
+
+    # ---------- job execution ----------
+
+    async def _run(self) -> None:
+        renew_every = self.lease_seconds / 3
+        while True:
+            try:
+                if await self._acquire_lease():
+                    await self._run_due_jobs()
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            await asyncio.sleep(renew_every)
+
+    async def _run_due_jobs(self) -> None:
+        async with async_session() as db:
+            result = await db.execute(select(ScheduledJob.name, ScheduledJob.next_run_at))
+            next_runs = {row.name: row.next_run_at for row in result.all()}
+
+        for name in self._jobs:
+            due_at = next_runs.get(name)
+            if due_at is not None and due_at > _utcnow():
+                continue
+            # Another worker may have taken over during a long job
+            if not await self._acquire_lease():
+                return
+            await self._run_job(name)
+
+    async def _run_job(self, name: str) -> None:
+        func, next_run = self._jobs[name]
+        started = _utcnow()
+        t0 = time.monotonic()
+        error = None
+
+        task = asyncio.create_task(func())
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self.lease_seconds / 3)
+                if done:
+                    break
+                await self._acquire_lease()
+            task.result()
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        except Exception as exc:
+            logger.exception("Scheduled job %s failed", name)
+            error = f"{type(exc).__name__}: {exc}"
+
+        duration_ms = int((time.monotonic() - t0) * 1000)
+        now = _utcnow()
+        next_run_at = next_run(now)
+        if error:
+            next_run_at = min(next_run_at, now + RETRY_DELAY)
+        await self._record_run(name, started, duration_ms, error, next_run_at)
+
+    async def _record_run(
+        self,
+        name: str,
+        started: datetime,
+        duration_ms: int,
+        error: str | None,
+        next_run_at: datetime,
+    ) -> None:
+        status = "error" if error else "ok"
+        async with async_session() as db:
+            job = await db.get(ScheduledJob, name)
+            if job is None:
+                job = ScheduledJob(name=name, run_count=0, failure_count=0)
+                db.add(job)
+            job.next_run_at = next_run_at
+            job.last_started_at = started
+            job.last_duration_ms = duration_ms
+            job.last_status = status
+            job.last_error = error
+            job.run_count += 1
+            if error:
+                job.failure_count += 1
+
+            db.add(JobRun(
+                job_name=name,
+                owner=self.owner_id,
+                started_at=started,
+                duration_ms=duration_ms,
+                status=status,
+                error=error,
+            ))
+            await db.flush()
+
+            # Trim history to the most recent HISTORY_LIMIT runs
+            keep = (
+                select(JobRun.id)
+                .where(JobRun.job_name == name)
+                .order_by(JobRun.id.desc())
+                .limit(HISTORY_LIMIT)
+            )
+            await db.execute(
+                delete(JobRun).where(JobRun.job_name == name, JobRun.id.not_in(keep))
+            )
+            await db.commit()
+        logger.info("Scheduled job %s finished (%s, %d ms)", name, status, duration_ms)
+
+
+scheduler = Scheduler()
@@ -1,11 +1,101 @@
-"""Shared query helpers for computing assignment completion statistics."""
+"""Shared query helpers for computing assignment completion statistics.
 
-from datetime import date
+Counts come from the ``user_daily_stats`` rollup, so their cost depends
+on the number of days in range rather than on history size.
+``window_stats`` computes any number of date windows for any number of
+users in a single conditional-aggregation query.
+"""
 
-from sqlalchemy import select, func
+from datetime import date, timedelta
+
+from sqlalchemy import and_, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models import ChoreAssignment, AssignmentStatus
+from backend.models import UserDailyStats
+
+# A window is (first day, last day); a last day of None is open-ended so
+# that assignments already generated for later days are included.
+Window = tuple[date, date | None]
+
+_COUNT_COLUMNS = ("assigned", "completed", "verified", "skipped")
+
+
+def standard_windows(today: date) -> dict[str, Window]:
+    """The windows shown on stats screens, keyed by name."""
+    monday = today - timedelta(days=today.weekday())
+    first_of_month = today.replace(day=1)
+    next_month = (first_of_month + timedelta(days=32)).replace(day=1)
+    return {
+        "7d": (today - timedelta(days=7), None),
+        "30d": (today - timedelta(days=30), None),
+        "90d": (today - timedelta(days=90), None),
+        "week": (monday, monday + timedelta(days=6)),
+        "month": (first_of_month, next_month - timedelta(days=1)),
+    }
+
+
+async def window_stats(
+    db: AsyncSession,
+    user_ids: list[int],
+    windows: dict[str, Window],
+) -> dict[int, dict[str, dict]]:
+    """Compute assignment counts for every user and window in one query.
+
+    Returns ``{user_id: {window_name: stats}}`` where stats holds
+    ``total``, ``completed``, ``verified``, ``skipped``, ``done``
+    (completed or verified) and ``rate`` (done as a percentage of total).
+    ``completed`` excludes verified assignments.  Every requested user
+    and window is present, with zeros when there is nothing to count.
+    """
+    result: dict[int, dict[str, dict]] = {
+        user_id: {name: _window_result(0, 0, 0, 0) for name in windows}
+        for user_id in user_ids
+    }
+    if not user_ids or not windows:
+        return result
+
+    columns = []
+    for start, end in windows.values():
+        in_window = UserDailyStats.day >= start
+        if end is not None:
+            in_window = and_(in_window, UserDailyStats.day <= end)
+        for name in _COUNT_COLUMNS:
+            column = getattr(UserDailyStats, name)
+            columns.append(func.sum(case((in_window, column), else_=0)))
+
+    # Only scan the days some window covers
+    stmt = (
+        select(UserDailyStats.user_id, *columns)
+        .where(
+            UserDailyStats.user_id.in_(user_ids),
+            UserDailyStats.day >= min(start for start, _ in windows.values()),
+        )
+        .group_by(UserDailyStats.user_id)
+    )
+    ends = [end for _, end in windows.values()]
+    if None not in ends:
+        stmt = stmt.where(UserDailyStats.day <= max(ends))
+
+    width = len(_COUNT_COLUMNS)
+    for row in (await db.execute(stmt)).all():
+        sums = [value or 0 for value in row[1:]]
+        result[row[0]] = {
+            name: _window_result(*sums[i * width:(i + 1) * width])
+            for i, name in enumerate(windows)
+        }
+    return result
+
+
+def _window_result(assigned: int, completed: int, verified: int, skipped: int) -> dict:
+    done = completed + verified
+    return {
+        "total": assigned,
+        "completed": completed,
+        "verified": verified,
+        "skipped": skipped,
+        "done": done,
+        "rate": round(done / assigned * 100, 1) if assigned > 0 else 0.0,
+    }
 
 
 async def count_assignments(
@@ -22,22 +112,8 @@ async def count_assignments(
         since: Count assignments on or after this date.
         completed_only: If True, only count completed/verified assignments.
     """
-    stmt = (
-        select(func.count())
-        .select_from(ChoreAssignment)
-        .where(
-            ChoreAssignment.user_id == user_id,
-            ChoreAssignment.date >= since,
-        )
-    )
-    if completed_only:
-        stmt = stmt.where(
-            ChoreAssignment.status.in_(
-                [AssignmentStatus.completed, AssignmentStatus.verified]
-            )
-        )
-    result = await db.execute(stmt)
-    return result.scalar() or 0
+    stats = (await window_stats(db, [user_id], {"since": (since, None)}))[user_id]["since"]
+    return stats["done"] if completed_only else stats["total"]
 
 
 async def completion_rate(
@@ -50,7 +126,5 @@ async def completion_rate(
     Returns:
         (total, completed, rate_percentage)
     """
-    total = await count_assignments(db, user_id, since)
-    completed = await count_assignments(db, user_id, since, completed_only=True)
-    rate = (completed / total * 100) if total > 0 else 0.0
-    return total, completed, round(rate, 1)
+    stats = (await window_stats(db, [user_id], {"since": (since, None)}))[user_id]["since"]
+    return stats["total"], stats["done"], stats["rate"]
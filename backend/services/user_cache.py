@@ -0,0 +1,134 @@
+"""In-process cache of authenticated user snapshots.
+
+``get_current_user`` reads the ``User`` row on every request; endpoints
+that only need to know who is calling and their role can instead depend
+on ``get_current_identity`` (see ``dependencies.py``), which is served
+from this cache without touching the database.
+
+Entries are ``CurrentUser`` tuples of active users, kept for at most
+``USER_CACHE_TTL_SECONDS`` (well under the access-token lifetime) and
+bounded to ``USER_CACHE_MAX_ENTRIES`` by evicting the least recently
+used.  A commit that changes a cached field of a ``User`` through the
+ORM drops that user's entry, via an ``after_commit`` hook; writes that
+bypass the ORM must call ``user_cache.invalidate``.  Other workers only
+see such changes once their entry expires.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# session.info key holding the ids of users changed in the transaction
+_CHANGED_USERS_KEY = "user_cache_ids"
+
+# User attributes whose change makes a snapshot stale
+_WATCHED = ("username", "display_name", "role", "is_active", "points_balance", "total_points_earned")
+
+
+class CurrentUser(NamedTuple):
+    id: int
+    username: str
+    display_name: str
+    role: UserRole
+    points_balance: int
+    total_points_earned: int
+
+
+def snapshot(user) -> CurrentUser:
+    """Build a snapshot from a ``User`` (or a row with the same fields)."""
+    return CurrentUser(
+        id=user.id,
+        username=user.username,
+        display_name=user.display_name,
+        role=user.role,
+        points_balance=user.points_balance,
+        total_points_earned=user.total_points_earned,
+    )
+
+
+class UserCache:
+    def __init__(self):
+        # user_id -> (snapshot, stored at)
+        self._entries: OrderedDict[int, tuple[CurrentUser, float]] = OrderedDict()
+        # Bumped by every invalidation; see put()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: int) -> CurrentUser | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] > settings.USER_CACHE_TTL_SECONDS:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[0]
+
+    def put(self, user: CurrentUser, generation: int) -> None:
+        """Store ``user``, read when ``generation`` was current.
+
+        Skipped if anything was invalidated since, as the read may
+        predate that change.
+        """
+        if generation != self._generation or settings.USER_CACHE_TTL_SECONDS <= 0:
+            return
+        self._entries[user.id] = (user, time.monotonic())
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > settings.USER_CACHE_MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids: int) -> None:
+        self._generation += 1
+        for user_id in user_ids:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def _after_flush(session: Session, flush_context):
+    changed = set()
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            changed.add(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            state = inspect(obj)
+            if any(state.attrs[name].history.has_changes() for name in _WATCHED):
+                changed.add(obj.id)
+    if changed:
+        session.info.setdefault(_CHANGED_USERS_KEY, set()).update(changed)
+
+
+def _after_commit(session: Session):
+    changed = session.info.pop(_CHANGED_USERS_KEY, None)
+    if changed:
+        user_cache.invalidate(*changed)
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_CHANGED_USERS_KEY, None)
+
+
+def install_user_cache_hooks():
+    """Register SQLAlchemy event listeners. Call once at startup."""
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    logger.info("User cache hooks installed")
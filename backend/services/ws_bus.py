@@ -0,0 +1,194 @@
+"""Event buses that carry WebSocket messages between workers.
+
+``WebSocketManager`` publishes every outgoing message on a bus instead
+of only writing to its own sockets; the bus hands it back to each
+worker's manager, which delivers to whichever sockets it holds.  The
+bus is chosen by ``WS_BUS``:
+
+* ``local`` - a single process; messages are delivered in place.
+* ``sqlite`` - for several uvicorn workers sharing the database.  A
+  message is delivered locally at once and queued in memory; a
+  background task writes queued messages to ``ws_events`` in one short
+  transaction and polls for rows from other workers every
+  ``WS_BUS_POLL_MS``.  Rows older than ``RETENTION`` are deleted.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+from typing import Callable
+
+from sqlalchemy import delete, func, insert, select
+
+from backend.config import settings
+from backend.database import engine
+from backend.models import WebSocketEvent
+from backend.services.clock import clock
+
+logger = logging.getLogger(__name__)
+
+# How long relayed rows are kept; only workers that fell this far behind
+# could still need them.
+RETENTION = timedelta(seconds=60)
+
+# Rows read per poll
+_POLL_BATCH = 500
+
+# An event is {"data": <JSON text>, "user_ids": [...] or None for all,
+# "exclude_user": <id> or None}, plus "coalesce": <entity> for messages
+# the receiving manager may merge
+Deliver = Callable[[dict], None]
+
+
+class LocalBus:
+    name = "local"
+
+    def __init__(self):
+        self._deliver: Deliver | None = None
+
+    def attach(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    def publish(self, event: dict) -> None:
+        self._deliver(event)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"bus": self.name}
+
+
+class SQLiteBus(LocalBus):
+    name = "sqlite"
+
+    def __init__(self):
+        super().__init__()
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._outbox: list[str] = []
+        self._wake: asyncio.Event | None = None
+        self._last_id = 0
+        self._last_cleanup = 0.0
+        self._task: asyncio.Task | None = None
+        # Counters since startup
+        self.relayed_out = 0
+        self.relayed_in = 0
+        self.errors = 0
+
+    def publish(self, event: dict) -> None:
+        self._deliver(event)
+        self._outbox.append(json.dumps(event))
+        if self._wake is not None:
+            self._wake.set()
+
+    async def start(self) -> None:
+        async with engine.connect() as conn:
+            result = await conn.execute(select(func.max(WebSocketEvent.id)))
+            self._last_id = result.scalar() or 0
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("SQLite WebSocket bus started (%s)", self.origin)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self._flush()
+        except Exception:
+            logger.warning("Dropping %d unsent WebSocket bus events", len(self._outbox))
+
+    async def _run(self) -> None:
+        interval = max(settings.WS_BUS_POLL_MS, 10) / 1000
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self._flush()
+                await self._poll()
+                if time.monotonic() - self._last_cleanup > RETENTION.total_seconds():
+                    await self._cleanup()
+            except Exception:
+                self.errors += 1
+                logger.warning("WebSocket bus relay failed", exc_info=True)
+
+    async def _flush(self) -> None:
+        if not self._outbox:
+            return
+        batch, self._outbox = self._outbox, []
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    insert(WebSocketEvent),
+                    [{"origin": self.origin, "payload": payload} for payload in batch],
+                )
+        except Exception:
+            # Put them back to retry on the next tick
+            self._outbox[:0] = batch
+            raise
+        self.relayed_out += len(batch)
+
+    async def _poll(self) -> None:
+        while True:
+            async with engine.connect() as conn:
+                result = await conn.execute(
+                    select(WebSocketEvent.id, WebSocketEvent.origin, WebSocketEvent.payload)
+                    .where(WebSocketEvent.id > self._last_id)
+                    .order_by(WebSocketEvent.id)
+                    .limit(_POLL_BATCH)
+                )
+                rows = result.all()
+            for row in rows:
+                self._last_id = row.id
+                if row.origin == self.origin:
+                    continue
+                try:
+                    self._deliver(json.loads(row.payload))
+                    self.relayed_in += 1
+                except Exception:
+                    self.errors += 1
+                    logger.warning("Bad WebSocket bus event %d", row.id, exc_info=True)
+            if len(rows) < _POLL_BATCH:
+                return
+
+    async def _cleanup(self) -> None:
+        self._last_cleanup = time.monotonic()
+        async with engine.begin() as conn:
+            await conn.execute(
+                delete(WebSocketEvent).where(
+                    WebSocketEvent.created_at < clock.now().replace(tzinfo=None) - RETENTION
+                )
+            )
+
+    def stats(self) -> dict:
+        return {
+            "bus": self.name,
+            "origin": self.origin,
+            "pending": len(self._outbox),
+            "relayed_out": self.relayed_out,
+            "relayed_in": self.relayed_in,
+            "errors": self.errors,
+        }
+
+
+def make_bus() -> LocalBus:
+    if settings.WS_BUS == "sqlite":
+        return SQLiteBus()
+    if settings.WS_BUS != "local":
+        logger.warning("Unknown WS_BUS %r, using 'local'", settings.WS_BUS)
+    return LocalBus()
@@ -0,0 +1,38 @@
+"""Shared test fixtures.
+
+``backend.config`` reads the environment and ``backend.database``
+creates the engine when first imported, so the test database is chosen
+here, before any test module imports the app.  Each run gets its own
+SQLite file in a temporary directory.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="chorequest-tests-")
+os.environ.setdefault("SECRET_KEY", "chorequest-test-secret-key")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_DIR}/test.db"
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # One event loop for the whole run: pooled aiosqlite connections are
+    # bound to the loop that opened them.
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def db_path() -> str:
+    return os.path.join(_DB_DIR, "test.db")
+
+
+@pytest.fixture(scope="session")
+async def init_db(anyio_backend):
+    """Create the schema once per run, as the app does at startup."""
+    from backend.database import engine, init_db as _init_db
+
+    await _init_db()
+    yield engine
+    await engine.dispose()
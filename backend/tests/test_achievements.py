@@ -0,0 +1,247 @@
+"""Event filtering in ``check_achievements``, the completion and
+redemption approval checks, and the nightly sweep."""
+
+import itertools
+
+import httpx
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from backend import achievements
+from backend.achievements import (
+    EVENT_POINTS_AWARDED, EVENT_QUEST_COMPLETED, EVENT_QUEST_VERIFIED, EVENT_REDEMPTION,
+    check_achievements,
+)
+from backend.auth import create_access_token
+from backend.database import async_session
+from backend.models import (
+    Achievement, Chore, ChoreAssignment, Difficulty, Recurrence, RedemptionStatus, Reward,
+    RewardRedemption, User, UserAchievement, UserRole,
+)
+from backend.services.achievement_sweep import _sweep_batch, reevaluate_achievements
+from backend.services import daily_stats
+from backend.services.clock import clock
+from backend.services.pet_leveling import get_current_pet_xp
+
+pytestmark = pytest.mark.anyio
+
+# Ids well clear of rows other test modules insert
+_ids = itertools.count(9000)
+
+
+async def _user(db, role=UserRole.kid) -> User:
+    user_id = next(_ids)
+    user = User(
+        id=user_id, username=f"user{user_id}", display_name="User",
+        password_hash="x", role=role,
+    )
+    db.add(user)
+    await db.flush()
+    return user
+
+
+async def _achievement(db, criteria: dict) -> Achievement:
+    key = f"test_{next(_ids)}"
+    achievement = Achievement(
+        key=key, title=key, description="", icon="star", points_reward=0, criteria=criteria,
+    )
+    db.add(achievement)
+    await db.flush()
+    return achievement
+
+
+async def _unlocked(db, user: User, achievement: Achievement) -> bool:
+    result = await db.execute(
+        select(UserAchievement.id).where(
+            UserAchievement.user_id == user.id,
+            UserAchievement.achievement_id == achievement.id,
+        )
+    )
+    return result.first() is not None
+
+
+async def _approved_redemption(db, kid: User, status=RedemptionStatus.approved) -> RewardRedemption:
+    reward = Reward(title="Reward", point_cost=1, created_by=kid.id)
+    db.add(reward)
+    await db.flush()
+    redemption = RewardRedemption(reward_id=reward.id, user_id=kid.id, points_spent=1, status=status)
+    db.add(redemption)
+    await db.flush()
+    return redemption
+
+
+# Criteria each event evaluates; every type the seed data uses appears
+_EXPECTED_CRITERIA = {
+    EVENT_QUEST_COMPLETED: {
+        "total_completions", "completion_before_time",
+        "all_daily_before_time", "all_daily_completed",
+        "total_points_earned", "pet_level_reached",
+    },
+    EVENT_QUEST_VERIFIED: {
+        "streak_reached", "consecutive_days_all_complete",
+        "all_daily_before_time", "all_daily_completed",
+        "total_points_earned", "pet_level_reached",
+    },
+    EVENT_REDEMPTION: {
+        "total_redemptions", "all_daily_before_time", "all_daily_completed",
+        "total_points_earned", "pet_level_reached",
+    },
+    EVENT_POINTS_AWARDED: {
+        "all_daily_before_time", "all_daily_completed",
+        "total_points_earned", "pet_level_reached",
+    },
+}
+
+
+@pytest.mark.parametrize("trigger", [*_EXPECTED_CRITERIA, None])
+async def test_event_runs_only_its_evaluators(init_db, monkeypatch, trigger):
+    ran = set()
+
+    def recorder(ctype):
+        async def evaluate(db, user, criteria, cache):
+            ran.add(ctype)
+            return False
+        return evaluate
+
+    monkeypatch.setattr(
+        achievements, "_EVALUATORS",
+        {ctype: recorder(ctype) for ctype in achievements._EVALUATORS},
+    )
+    async with async_session() as db:
+        kid = await _user(db)
+        for ctype in achievements._EVALUATORS:
+            # Out of reach, so later tests' real evaluators never unlock them
+            await _achievement(db, {
+                "type": ctype, "count": 10**6, "days": 10**6, "amount": 10**6,
+                "hour": -1, "level": 10**6,
+            })
+        await db.commit()
+
+        await check_achievements(db, kid, trigger)
+
+    if trigger is None:
+        assert ran == set(achievements._EVALUATORS)
+    else:
+        assert ran == _EXPECTED_CRITERIA[trigger]
+
+
+async def test_completing_a_quest_checks_completion_criteria(init_db):
+    from backend.main import app
+
+    async with async_session() as db:
+        kid = await _user(db)
+        achievement = await _achievement(db, {"type": "total_completions", "count": 1})
+        chore = Chore(
+            title="Quest", points=5, difficulty=Difficulty.easy, category_id=1,
+            recurrence=Recurrence.once, created_by=kid.id,
+        )
+        db.add(chore)
+        await db.flush()
+        db.add(ChoreAssignment(chore_id=chore.id, user_id=kid.id, date=clock.today()))
+        await db.commit()
+
+    # The rollup the completion count reads is kept by the flush hook
+    event.listen(Session, "after_flush", daily_stats._after_flush)
+    try:
+        token = create_access_token(kid.id, kid.role.value)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                f"/api/chores/{chore.id}/complete",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        assert response.status_code == 200, response.text
+    finally:
+        event.remove(Session, "after_flush", daily_stats._after_flush)
+
+    async with async_session() as db:
+        assert await _unlocked(db, kid, achievement)
+        # Other events no longer evaluate it
+        other = await _achievement(db, {"type": "total_completions", "count": 1})
+        await db.commit()
+        kid = await db.get(User, kid.id)
+        for later in (EVENT_POINTS_AWARDED, EVENT_QUEST_VERIFIED, EVENT_REDEMPTION):
+            await check_achievements(db, kid, later)
+        assert not await _unlocked(db, kid, other)
+        await check_achievements(db, kid)
+        assert await _unlocked(db, kid, other)
+
+
+async def test_verify_skips_redemption_criteria(init_db):
+    async with async_session() as db:
+        kid = await _user(db)
+        achievement = await _achievement(db, {"type": "total_redemptions", "count": 1})
+        await _approved_redemption(db, kid)
+        await db.commit()
+
+        await check_achievements(db, kid, EVENT_QUEST_VERIFIED)
+        assert not await _unlocked(db, kid, achievement)
+        await check_achievements(db, kid, EVENT_REDEMPTION)
+        assert await _unlocked(db, kid, achievement)
+
+
+async def test_approving_a_redemption_checks_achievements(init_db):
+    from backend.main import app
+
+    async with async_session() as db:
+        parent = await _user(db, UserRole.parent)
+        kid = await _user(db)
+        achievement = await _achievement(db, {"type": "total_redemptions", "count": 1})
+        redemption = await _approved_redemption(db, kid, RedemptionStatus.pending)
+        await db.commit()
+
+    token = create_access_token(parent.id, parent.role.value)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            f"/api/rewards/redemptions/{redemption.id}/approve",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    assert response.status_code == 200, response.text
+
+    async with async_session() as db:
+        assert await _unlocked(db, kid, achievement)
+
+
+async def test_sweep_keeps_concurrent_avatar_changes(init_db):
+    async with async_session() as db:
+        kid = await _user(db)
+        kid.avatar_config = {"pet": "cat", "hat": "cap"}
+        achievement = await _achievement(db, {"type": "total_completions", "count": 0})
+        achievement.points_reward = 10
+        await db.commit()
+
+    # The batch is read, then the kid changes their avatar before the write
+    async with async_session() as db:
+        result = await db.execute(
+            select(
+                User.id, User.username, User.total_points_earned,
+                User.current_streak, User.avatar_config,
+            ).where(User.id == kid.id)
+        )
+        rows = result.all()
+    async with async_session() as db:
+        user = await db.get(User, kid.id)
+        user.avatar_config = {"pet": "cat", "hat": "crown"}
+        await db.commit()
+
+    async with async_session() as db:
+        unlocks = await _sweep_batch(db, rows, [achievement], dry_run=False)
+        assert [u["achievement_id"] for u in unlocks] == [achievement.id]
+        user = await db.get(User, kid.id)
+        assert user.avatar_config["hat"] == "crown"
+        assert get_current_pet_xp(user.avatar_config) == 10
+
+
+async def test_sweep_checks_only_kids(init_db):
+    async with async_session() as db:
+        kid = await _user(db)
+        parent = await _user(db, UserRole.parent)
+        await _achievement(db, {"type": "total_completions", "count": 0})
+        await db.commit()
+
+    report = await reevaluate_achievements(dry_run=True)
+    unlocked_users = {u["user_id"] for u in report["unlocks"]}
+    assert kid.id in unlocked_users
+    assert parent.id not in unlocked_users
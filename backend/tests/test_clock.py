@@ -0,0 +1,170 @@
+"""Daily reset scheduling across DST transitions, and handlers taking
+their timestamps from the household clock.
+
+Time is simulated by swapping ``Clock.now_fn``, so whole days are
+stepped through without sleeping.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from backend.config import settings
+from backend.services.clock import Clock
+
+UTC = timezone.utc
+
+
+@pytest.fixture
+def zone(monkeypatch):
+    def configure(tz: str, reset_hour: int):
+        monkeypatch.setattr(settings, "TZ", tz)
+        monkeypatch.setattr(settings, "DAILY_RESET_HOUR", reset_hour)
+    return configure
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=UTC)
+
+
+@pytest.mark.parametrize("tz, hour, day, expected", [
+    # Europe/London springs forward at 01:00 GMT on 29 March 2026
+    ("Europe/London", 1, date(2026, 3, 28), _utc(2026, 3, 28, 1)),
+    ("Europe/London", 1, date(2026, 3, 29), _utc(2026, 3, 29, 1)),   # skipped: runs at the jump
+    ("Europe/London", 1, date(2026, 3, 30), _utc(2026, 3, 30, 0)),
+    ("Europe/London", 0, date(2026, 3, 29), _utc(2026, 3, 29, 0)),
+    # ... and falls back at 02:00 BST on 25 October 2026
+    ("Europe/London", 1, date(2026, 10, 24), _utc(2026, 10, 24, 0)),
+    ("Europe/London", 1, date(2026, 10, 25), _utc(2026, 10, 25, 0)),  # repeated: first one
+    ("Europe/London", 1, date(2026, 10, 26), _utc(2026, 10, 26, 1)),
+    # America/New_York springs forward at 02:00 EST on 8 March 2026
+    ("America/New_York", 2, date(2026, 3, 7), _utc(2026, 3, 7, 7)),
+    ("America/New_York", 2, date(2026, 3, 8), _utc(2026, 3, 8, 7)),   # skipped: runs at the jump
+    ("America/New_York", 2, date(2026, 3, 9), _utc(2026, 3, 9, 6)),
+    # ... and falls back at 02:00 EDT on 1 November 2026
+    ("America/New_York", 1, date(2026, 11, 1), _utc(2026, 11, 1, 5)),  # repeated: first one
+    ("America/New_York", 2, date(2026, 11, 1), _utc(2026, 11, 1, 7)),
+    ("America/New_York", 0, date(2026, 11, 2), _utc(2026, 11, 2, 5)),
+])
+def test_reset_time_for(zone, tz, hour, day, expected):
+    zone(tz, hour)
+    assert Clock().reset_time_for(day) == expected
+
+
+def _simulate(clock: Clock, start: datetime, end: datetime, step: timedelta):
+    """Step the clock from ``start`` to ``end``; return (instant, day)
+    for every tick at which the latest reset day changed."""
+    changes = []
+    previous = None
+    now = start
+    while now <= end:
+        clock.now_fn = lambda now=now: now
+        day = clock.latest_reset_day()
+        if day != previous:
+            changes.append((now, day))
+            previous = day
+        now += step
+    return changes
+
+
+@pytest.mark.parametrize("tz, hour, start, end", [
+    ("Europe/London", 0, _utc(2026, 3, 26, 12), _utc(2026, 4, 1)),
+    ("Europe/London", 1, _utc(2026, 3, 26, 12), _utc(2026, 4, 1)),
+    ("Europe/London", 0, _utc(2026, 10, 22, 12), _utc(2026, 10, 28)),
+    ("Europe/London", 1, _utc(2026, 10, 22, 12), _utc(2026, 10, 28)),
+    ("America/New_York", 2, _utc(2026, 3, 5, 12), _utc(2026, 3, 11)),
+    ("America/New_York", 1, _utc(2026, 10, 29, 12), _utc(2026, 11, 4)),
+    ("America/New_York", 0, _utc(2026, 10, 29, 12), _utc(2026, 11, 4)),
+])
+def test_each_day_resets_once_at_its_reset_time(zone, tz, hour, start, end):
+    zone(tz, hour)
+    clock = Clock()
+    changes = _simulate(clock, start, end, timedelta(minutes=15))
+
+    days = [day for _, day in changes]
+    # Consecutive days, none skipped or repeated
+    assert days == [days[0] + timedelta(days=i) for i in range(len(days))]
+    assert len(days) >= 6
+    for instant, day in changes[1:]:
+        # Reset instants fall on the hour in every zone used here
+        assert instant == clock.reset_time_for(day)
+        assert clock.next_reset_after(instant - timedelta(minutes=15)) == instant
+        assert clock.next_reset_after(instant) == clock.reset_time_for(day + timedelta(days=1))
+
+
+def test_today_follows_local_midnight_across_spring_forward(zone):
+    zone("Europe/London", 0)
+    clock = Clock(lambda: _utc(2026, 3, 28, 23, 59))
+    assert clock.today() == date(2026, 3, 28)
+    clock.now_fn = lambda: _utc(2026, 3, 29, 0, 0)
+    assert clock.today() == date(2026, 3, 29)
+    # Midnight on the 30th is 23:00 UTC on the 29th once BST applies
+    clock.now_fn = lambda: _utc(2026, 3, 29, 23, 0)
+    assert clock.today() == date(2026, 3, 30)
+
+
+def test_local_date_of_naive_utc(zone):
+    zone("America/New_York", 0)
+    clock = Clock()
+    assert clock.local_date(datetime(2026, 11, 1, 3, 30)) == date(2026, 10, 31)
+    assert clock.local_date(datetime(2026, 11, 1, 4, 30)) == date(2026, 11, 1)
+    assert clock.local_date(datetime(2026, 11, 2, 4, 30)) == date(2026, 11, 1)
+
+
+def test_scheduler_next_run_is_naive_utc(zone):
+    from backend.services import daily_reset
+
+    zone("Europe/London", 0)
+    assert daily_reset.next_reset_after(datetime(2026, 3, 29, 12)) == datetime(2026, 3, 29, 23)
+    assert daily_reset.next_reset_after(datetime(2026, 10, 25, 12)) == datetime(2026, 10, 26, 0)
+
+
+@pytest.mark.anyio
+async def test_chore_actions_use_the_simulated_instant(init_db, zone, monkeypatch):
+    import httpx
+
+    from backend.auth import create_access_token
+    from backend.database import async_session
+    from backend.main import app
+    from backend.models import (
+        AssignmentStatus, Chore, ChoreAssignment, Difficulty, Recurrence, User, UserRole,
+    )
+    from backend.services.clock import clock
+
+    zone("America/New_York", 0)
+    # 23:50 on 10 May local time is already 11 May in UTC
+    now = _utc(2031, 5, 11, 3, 50)
+    monkeypatch.setattr(clock, "now_fn", lambda: now)
+
+    async with async_session() as db:
+        kid, parent = (
+            User(id=user_id, username=f"user{user_id}", display_name="User",
+                 password_hash="x", role=role)
+            for user_id, role in ((9800, UserRole.kid), (9801, UserRole.parent))
+        )
+        chore = Chore(
+            title="Late quest", points=5, difficulty=Difficulty.easy, category_id=1,
+            recurrence=Recurrence.once, created_by=9801,
+        )
+        db.add_all([kid, parent, chore])
+        await db.flush()
+        assignment = ChoreAssignment(chore_id=chore.id, user_id=kid.id, date=date(2031, 5, 10))
+        db.add(assignment)
+        await db.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for user, action in ((kid, "complete"), (parent, "verify")):
+            token = create_access_token(user.id, user.role.value)
+            response = await client.post(
+                f"/api/chores/{chore.id}/{action}",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert response.status_code == 200, response.text
+
+    async with async_session() as db:
+        assignment = await db.get(ChoreAssignment, assignment.id)
+        assert assignment.status == AssignmentStatus.verified
+        naive_now = now.replace(tzinfo=None)
+        assert assignment.completed_at == naive_now
+        assert assignment.verified_at == naive_now
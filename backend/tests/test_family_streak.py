@@ -0,0 +1,100 @@
+"""Invalidation of the settled family streak."""
+
+import itertools
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from backend.auth import create_access_token
+from backend.database import async_session
+from backend.models import AssignmentStatus, ChoreAssignment, User, UserRole
+from backend.services.clock import clock
+from backend.services.daily_stats import refresh_daily_stats
+from backend.services.family_streak import _load_state, _save_state
+
+pytestmark = pytest.mark.anyio
+
+# Ids well clear of rows other test modules insert
+_ids = itertools.count(9600)
+
+
+async def _user(db, role=UserRole.kid) -> User:
+    user_id = next(_ids)
+    user = User(
+        id=user_id, username=f"user{user_id}", display_name="User",
+        password_hash="x", role=role,
+    )
+    db.add(user)
+    await db.flush()
+    return user
+
+
+async def _settle(db, through) -> None:
+    await _save_state(db, through, 3)
+    await db.commit()
+
+
+@pytest.mark.parametrize("days_ago, cleared", [(3, True), (1, True), (0, False)])
+async def test_rollup_change_clears_covered_days(init_db, days_ago, cleared):
+    async with async_session() as db:
+        kid = await _user(db)
+        today = clock.today()
+        await _settle(db, today - timedelta(days=1))
+
+        day = today - timedelta(days=days_ago)
+        db.add(ChoreAssignment(
+            chore_id=1, user_id=kid.id, date=day, status=AssignmentStatus.verified,
+        ))
+        await db.flush()
+        await refresh_daily_stats(db, {(kid.id, day)})
+        await db.commit()
+
+        assert (await _load_state(db) is None) == cleared
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("PUT", "/api/admin/users/{id}", {"is_active": False}),
+    ("PUT", "/api/admin/users/{id}", {"role": "parent"}),
+    ("DELETE", "/api/admin/users/{id}", None),
+])
+async def test_kid_deactivation_clears_streak(init_db, method, path, body):
+    from backend.main import app
+
+    async with async_session() as db:
+        admin = await _user(db, UserRole.admin)
+        kid = await _user(db)
+        await _settle(db, clock.today() - timedelta(days=1))
+
+    token = create_access_token(admin.id, admin.role.value)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.request(
+            method, path.format(id=kid.id), json=body,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    assert response.status_code == 200, response.text
+
+    async with async_session() as db:
+        assert await _load_state(db) is None
+
+
+async def test_unrelated_user_update_keeps_streak(init_db):
+    from backend.main import app
+
+    async with async_session() as db:
+        admin = await _user(db, UserRole.admin)
+        parent = await _user(db, UserRole.parent)
+        await _settle(db, clock.today() - timedelta(days=1))
+
+    token = create_access_token(admin.id, admin.role.value)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.put(
+            f"/api/admin/users/{parent.id}", json={"is_active": False},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    assert response.status_code == 200, response.text
+
+    async with async_session() as db:
+        assert await _load_state(db) is not None
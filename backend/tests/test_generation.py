@@ -0,0 +1,117 @@
+"""Generation watermarks: a stamped week is regenerated whenever an
+input to its plan changes, and the plan does not depend on the day it
+is generated."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import Session
+
+from backend.database import async_session
+from backend.models import (
+    Chore, ChoreAssignment, ChoreAssignmentRule, ChoreRotation, Difficulty,
+    GenerationWatermark, Recurrence, RotationCadence,
+)
+from backend.services import generation_hook
+from backend.services.assignment_generator import (
+    auto_generate_week_assignments, ensure_week_generated,
+)
+from backend.services.clock import clock
+
+pytestmark = pytest.mark.anyio
+
+WEEK = date(2032, 3, 1)  # a Monday
+KID_A, KID_B = 9900, 9901
+
+
+@pytest.fixture(scope="module")
+async def hooks(init_db):
+    event.listen(Session, "after_flush", generation_hook._after_flush)
+    yield
+    event.remove(Session, "after_flush", generation_hook._after_flush)
+
+
+async def _chore(db, title: str) -> Chore:
+    chore = Chore(
+        title=title, points=5, difficulty=Difficulty.easy, category_id=1,
+        recurrence=Recurrence.daily, created_by=KID_A,
+    )
+    db.add(chore)
+    await db.flush()
+    return chore
+
+
+async def _week_slots(db, chore_id: int) -> set[tuple[int, date]]:
+    result = await db.execute(
+        select(ChoreAssignment.user_id, ChoreAssignment.date).where(
+            ChoreAssignment.chore_id == chore_id,
+            ChoreAssignment.date >= WEEK,
+            ChoreAssignment.date <= WEEK + timedelta(days=6),
+        )
+    )
+    return set(result.tuples().all())
+
+
+async def _stamped(db) -> bool:
+    result = await db.execute(
+        select(GenerationWatermark.week_start).where(GenerationWatermark.week_start == WEEK)
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def test_new_kid_on_rule_less_chore_regenerates_week(hooks):
+    async with async_session() as db:
+        chore = await _chore(db, "Legacy quest")
+        db.add(ChoreAssignment(chore_id=chore.id, user_id=KID_A, date=WEEK - timedelta(days=30)))
+        await db.commit()
+
+        assert await ensure_week_generated(db, WEEK)
+        assert {user_id for user_id, _ in await _week_slots(db, chore.id)} == {KID_A}
+        assert not await ensure_week_generated(db, WEEK)
+
+        # The legacy path takes its kids from past assignments
+        db.add(ChoreAssignment(chore_id=chore.id, user_id=KID_B, date=WEEK - timedelta(days=20)))
+        await db.commit()
+        assert not await _stamped(db)
+
+        assert await ensure_week_generated(db, WEEK)
+        assert {user_id for user_id, _ in await _week_slots(db, chore.id)} == {KID_A, KID_B}
+
+
+async def test_assignment_changes_on_ruled_chore_keep_watermark(hooks):
+    async with async_session() as db:
+        chore = await _chore(db, "Ruled quest")
+        db.add(ChoreAssignmentRule(
+            chore_id=chore.id, user_id=KID_A, recurrence=Recurrence.daily,
+        ))
+        await db.commit()
+        await ensure_week_generated(db, WEEK)
+
+        db.add(ChoreAssignment(chore_id=chore.id, user_id=KID_B, date=WEEK - timedelta(days=20)))
+        await db.commit()
+        assert await _stamped(db)
+
+
+async def test_never_rotated_plan_ignores_generation_day(hooks, monkeypatch):
+    async with async_session() as db:
+        chore = await _chore(db, "Rotating quest")
+        for kid in (KID_A, KID_B):
+            db.add(ChoreAssignmentRule(chore_id=chore.id, user_id=kid, recurrence=Recurrence.daily))
+        db.add(ChoreRotation(
+            chore_id=chore.id, kid_ids=[KID_A, KID_B], cadence=RotationCadence.daily,
+            current_index=0, created_at=datetime(2032, 2, 1),
+        ))
+        await db.commit()
+
+        plans = []
+        for generated_on in (datetime(2032, 2, 20, 12), datetime(2032, 2, 21, 12)):
+            monkeypatch.setattr(
+                clock, "now_fn", lambda at=generated_on: at.replace(tzinfo=timezone.utc),
+            )
+            await db.execute(delete(ChoreAssignment).where(ChoreAssignment.chore_id == chore.id))
+            await auto_generate_week_assignments(db, WEEK)
+            plans.append(await _week_slots(db, chore.id))
+
+        assert len(plans[0]) == 7
+        assert plans[0] == plans[1]
@@ -0,0 +1,143 @@
+"""Query plans for the hot query shapes.
+
+Each query is planned against a few years of history with ``ANALYZE``
+statistics, and must use the index designed for it; a change that makes
+SQLite fall back to scanning the table fails here.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from backend.models import (
+    AssignmentStatus, AuditLog, ChoreAssignment, Notification,
+    NotificationType, PointTransaction, PointType,
+)
+
+pytestmark = pytest.mark.anyio
+
+KIDS = range(2, 6)
+CHORES = range(1, 11)
+FIRST_DAY = date(2023, 1, 1)
+DAYS = 3 * 365
+
+
+@pytest.fixture(scope="module")
+async def history(init_db):
+    engine = init_db
+    rng = random.Random(10)
+    async with engine.begin() as conn:
+        await conn.execute(insert(ChoreAssignment), [
+            {
+                "chore_id": chore_id, "user_id": user_id,
+                "date": FIRST_DAY + timedelta(days=day),
+                "status": rng.choice(list(AssignmentStatus)),
+            }
+            for day in range(DAYS) for user_id in KIDS for chore_id in CHORES
+        ])
+        start = datetime(2023, 1, 1)
+        await conn.execute(insert(PointTransaction), [
+            {
+                "user_id": rng.choice(KIDS), "amount": 5, "type": PointType.chore_complete,
+                "description": "history", "created_at": start + timedelta(minutes=37 * i),
+                "local_day": (start + timedelta(minutes=37 * i)).date(),
+            }
+            for i in range(40_000)
+        ])
+        await conn.execute(insert(Notification), [
+            {
+                "user_id": rng.choice(KIDS), "type": NotificationType.chore_verified,
+                "title": "t", "message": "m", "is_read": rng.random() < 0.95,
+                "created_at": start + timedelta(hours=3 * i),
+            }
+            for i in range(8_000)
+        ])
+        await conn.execute(insert(AuditLog), [
+            {"action": "login", "created_at": start + timedelta(hours=i)}
+            for i in range(20_000)
+        ])
+        await conn.exec_driver_sql("ANALYZE")
+    return engine
+
+
+async def _plan(engine, stmt) -> list[str]:
+    sql = str(stmt.compile(engine.sync_engine, compile_kwargs={"literal_binds": True}))
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)
+        return [row[-1] for row in result.all()]
+
+
+QUERIES = {
+    "assignments by user/date": (
+        select(ChoreAssignment.id).where(
+            ChoreAssignment.user_id == 3,
+            ChoreAssignment.date == date(2025, 6, 1),
+            ChoreAssignment.status == AssignmentStatus.pending,
+        ),
+        "ix_chore_assignments_user_date_status",
+    ),
+    "assignments by user/date range": (
+        select(func.count()).select_from(ChoreAssignment).where(
+            ChoreAssignment.user_id == 3,
+            ChoreAssignment.date >= date(2025, 5, 1),
+            ChoreAssignment.date <= date(2025, 5, 31),
+        ),
+        "ix_chore_assignments_user_date_status",
+    ),
+    "assignments by status/date": (
+        select(ChoreAssignment).where(
+            ChoreAssignment.status == AssignmentStatus.completed,
+            ChoreAssignment.date >= date(2025, 6, 2),
+            ChoreAssignment.date <= date(2025, 6, 8),
+        ),
+        "ix_chore_assignments_date",
+    ),
+    "point transactions by user/created_at": (
+        select(PointTransaction)
+        .where(PointTransaction.user_id == 3)
+        .order_by(PointTransaction.created_at.desc())
+        .limit(50),
+        "ix_point_transactions_user_created",
+    ),
+    "notifications unread by user": (
+        select(Notification)
+        .where(Notification.user_id == 3, Notification.is_read == False)  # noqa: E712
+        .order_by(Notification.created_at.desc())
+        .limit(20),
+        "ix_notifications_user_read_created",
+    ),
+    "audit log by created_at": (
+        select(AuditLog).order_by(AuditLog.created_at.desc()).offset(0).limit(50),
+        "ix_audit_logs_created_at",
+    ),
+}
+
+
+@pytest.mark.parametrize("name", list(QUERIES))
+async def test_query_uses_index(history, name):
+    stmt, index = QUERIES[name]
+    plan = await _plan(history, stmt)
+    assert any(f"INDEX {index}" in step for step in plan), plan
+    assert not any(step.startswith("SCAN") and "INDEX" not in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+async def test_index_migration_is_idempotent(init_db):
+    from backend.migrations import _secondary_indexes
+
+    engine = init_db
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("DROP INDEX ix_audit_logs_created_at")
+        await _secondary_indexes(conn)
+        await _secondary_indexes(conn)
+        result = await conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%'"
+        )
+        names = set(result.scalars().all())
+    assert {
+        "ix_chore_assignments_user_date_status", "ix_chore_assignments_date",
+        "ix_point_transactions_user_created", "ix_notifications_user_read_created",
+        "ix_refresh_tokens_token_hash", "ix_audit_logs_created_at",
+    } <= names
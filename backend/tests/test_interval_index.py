@@ -0,0 +1,96 @@
+"""Cross-worker freshness of the interval index: each ``IntervalIndex``
+instance stands in for the per-process index of a separate worker."""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.database import async_session
+from backend.models import SeasonalEvent, User, UserRole, VacationPeriod
+from backend.services import interval_index as interval_module
+from backend.services.interval_index import IntervalIndex
+
+pytestmark = pytest.mark.anyio
+
+_PARENT_ID = 9500
+
+
+@pytest.fixture(scope="module")
+async def hooks(init_db):
+    event.listen(Session, "after_flush", interval_module._after_flush)
+    async with async_session() as db:
+        db.add(User(
+            id=_PARENT_ID, username=f"user{_PARENT_ID}", display_name="Parent",
+            password_hash="x", role=UserRole.parent,
+        ))
+        await db.commit()
+    yield
+    event.remove(Session, "after_flush", interval_module._after_flush)
+
+
+async def _loaded_index() -> IntervalIndex:
+    index = IntervalIndex()
+    async with async_session() as db:
+        await index.ensure_loaded(db)
+    return index
+
+
+async def test_other_worker_sees_new_vacation(hooks):
+    other = await _loaded_index()
+    day = date(2031, 7, 14)
+    assert not other.is_vacation_day(day)
+
+    async with async_session() as db:
+        vacation = VacationPeriod(
+            start_date=date(2031, 7, 10), end_date=date(2031, 7, 20),
+            created_by=_PARENT_ID,
+        )
+        db.add(vacation)
+        await db.commit()
+
+    async with async_session() as db:
+        await other.ensure_loaded(db)
+    assert other.is_vacation_day(day)
+
+    async with async_session() as db:
+        vacation = await db.get(VacationPeriod, vacation.id)
+        vacation.is_active = False
+        await db.commit()
+
+    async with async_session() as db:
+        await other.ensure_loaded(db)
+    assert not other.is_vacation_day(day)
+
+
+async def test_other_worker_sees_new_event(hooks):
+    other = await _loaded_index()
+    at = datetime(2031, 12, 24, 12, 0)
+    assert other.active_events(at) == []
+
+    async with async_session() as db:
+        db.add(SeasonalEvent(
+            title="Winter", multiplier=2.0, created_by=_PARENT_ID,
+            start_date=datetime(2031, 12, 20), end_date=datetime(2031, 12, 31),
+        ))
+        await db.commit()
+
+    async with async_session() as db:
+        await other.ensure_loaded(db)
+    assert other.active_events(at) == [("Winter", 2.0)]
+
+
+async def test_unchanged_version_skips_rebuild(hooks, monkeypatch):
+    index = await _loaded_index()
+    rebuilds = 0
+
+    async def counting_rebuild(db):
+        nonlocal rebuilds
+        rebuilds += 1
+
+    monkeypatch.setattr(index, "rebuild", counting_rebuild)
+    async with async_session() as db:
+        await index.ensure_loaded(db)
+        await index.ensure_loaded(db)
+    assert rebuilds == 0
@@ -0,0 +1,65 @@
+"""Backfill migrations."""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, select
+
+from backend import migrations
+from backend.database import async_session
+from backend.models import (
+    AssignmentStatus, ChoreAssignment, PointTransaction, PointType, User, UserDailyStats,
+    UserRole,
+)
+from backend.services.daily_stats import rebuild_daily_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def _rollup(db) -> set[tuple]:
+    result = await db.execute(select(
+        UserDailyStats.user_id, UserDailyStats.day, UserDailyStats.xp_earned,
+        UserDailyStats.assigned, UserDailyStats.completed, UserDailyStats.verified,
+        UserDailyStats.skipped,
+    ))
+    return set(result.all())
+
+
+async def test_daily_stats_backfill_matches_full_rebuild(init_db, monkeypatch):
+    async with async_session() as db:
+        for user_id in (9700, 9701):
+            db.add(User(
+                id=user_id, username=f"user{user_id}", display_name="Kid",
+                password_hash="x", role=UserRole.kid,
+            ))
+            for n in range(20):
+                day = date(2030, 1, 1) + timedelta(days=n)
+                db.add(ChoreAssignment(
+                    chore_id=1, user_id=user_id, date=day,
+                    status=list(AssignmentStatus)[n % len(AssignmentStatus)],
+                ))
+                db.add(PointTransaction(
+                    user_id=user_id, amount=n + 1, type=PointType.chore_complete,
+                    description="Quest", local_day=day,
+                ))
+        await db.commit()
+
+        await rebuild_daily_stats(db)
+        await db.commit()
+        expected = await _rollup(db)
+        await db.execute(delete(UserDailyStats))
+        await db.commit()
+
+    batches = []
+    real_rebuild = migrations.rebuild_daily_stats
+
+    async def recording_rebuild(db, user_ids=None):
+        batches.append(user_ids)
+        return await real_rebuild(db, user_ids)
+
+    monkeypatch.setattr(migrations, "rebuild_daily_stats", recording_rebuild)
+    await migrations._build_user_daily_stats()
+
+    async with async_session() as db:
+        assert await _rollup(db) == expected
+    assert all(len(user_ids) == 1 for user_ids in batches)
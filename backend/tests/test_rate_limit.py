@@ -0,0 +1,89 @@
+"""Rate limiter backends: window boundaries, LRU eviction, counting
+shared through SQLite, and failing open."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend import rate_limit
+from backend.config import settings
+from backend.rate_limit import MemoryBackend, RateLimiter, SQLiteBackend
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("make_backend", [lambda: MemoryBackend(100), SQLiteBackend])
+async def test_sliding_window_boundary(init_db, make_backend):
+    backend = make_backend()
+    key = f"boundary:{backend.name}"
+    for t in (1000.0, 1001.0, 1002.0):
+        assert await backend.hit(key, 3, 10, t) is None
+
+    assert await backend.hit(key, 3, 10, 1009.5) == pytest.approx(0.5)
+    # The oldest request leaves the window exactly one window later
+    assert await backend.hit(key, 3, 10, 1010.0) is None
+    assert await backend.hit(key, 3, 10, 1010.5) == pytest.approx(0.5)
+    # A key idle for a whole window starts afresh
+    for t in (1030.0, 1030.1, 1030.2):
+        assert await backend.hit(key, 3, 10, t) is None
+
+
+async def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_keys=2)
+    for _ in range(2):
+        await backend.hit("a", 2, 60, 0.0)
+    await backend.hit("b", 2, 60, 1.0)
+    # Using "a" makes "b" the least recently used
+    assert await backend.hit("a", 2, 60, 2.0) is not None
+    await backend.hit("c", 2, 60, 3.0)
+
+    assert len(backend) == 2
+    assert set(backend._keys) == {"a", "c"}
+    # "a" kept its times; "b" was forgotten
+    assert await backend.hit("a", 2, 60, 4.0) is not None
+    assert await backend.hit("b", 1, 60, 5.0) is None
+
+
+async def test_sqlite_backend_counts_across_connections(init_db, monkeypatch):
+    backend = SQLiteBackend()
+    key = "shared:login"
+    now = 5000.0
+
+    results = await asyncio.gather(*(backend.hit(key, 5, 60, now) for _ in range(8)))
+    assert sum(r is None for r in results) == 5
+
+    # Another worker: its own engine on the same database file
+    other_engine = create_async_engine(settings.DATABASE_URL)
+    monkeypatch.setattr(rate_limit, "engine", other_engine)
+    try:
+        assert await backend.hit(key, 5, 60, now + 1) is not None
+        assert await backend.hit("shared:other", 5, 60, now + 1) is None
+    finally:
+        await other_engine.dispose()
+
+
+async def test_backend_error_fails_open(caplog):
+    class BrokenBackend:
+        name = "broken"
+
+        async def hit(self, key, limit, window, now):
+            raise RuntimeError("database is locked")
+
+    limiter = RateLimiter(BrokenBackend())
+    await limiter.check("login:10.0.0.1", 1, 60)
+    await limiter.check("login:10.0.0.1", 1, 60)
+
+    assert limiter.metrics["login"] == {"checked": 2, "rejected": 0, "errors": 2}
+    assert "allowing login:10.0.0.1" in caplog.text
+
+
+@pytest.mark.parametrize("make_backend", [lambda: MemoryBackend(100), SQLiteBackend])
+async def test_zero_limit_rejects(init_db, make_backend):
+    limiter = RateLimiter(make_backend())
+    with pytest.raises(HTTPException) as raised:
+        await limiter.check("zero:10.0.0.1", 0, 60)
+    assert raised.value.status_code == 429
+    assert raised.value.headers["Retry-After"] == "61"
+    assert limiter.metrics["zero"]["errors"] == 0
@@ -0,0 +1,113 @@
+"""Compiled recurrence schedules against ``should_create_on_day``.
+
+Schedules, anchors and ranges are drawn at random (seeded, so failures
+reproduce) and every day of every range is checked against the
+original per-day function.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from backend.models import Recurrence
+from backend.services.recurrence import (
+    compile_chore_recurrence, compile_recurrence, expand_occurrences,
+    should_create_on_day,
+)
+
+CASES_PER_SEED = 500
+
+
+def _random_schedule(rng: random.Random):
+    recurrence = rng.choice(list(Recurrence))
+    custom_days = rng.choice([
+        None, [], rng.sample(range(7), rng.randint(1, 7)),
+        [rng.randrange(7), rng.randrange(7)],  # duplicates
+        [9, rng.randrange(7)],                  # out-of-range weekday
+    ])
+    created = date(2024, 1, 1) + timedelta(days=rng.randint(0, 900))
+    anchor = rng.choice([created, None])
+    return recurrence, custom_days, created, anchor
+
+
+def _random_range(rng: random.Random) -> tuple[date, date]:
+    start = date(2024, 1, 1) + timedelta(days=rng.randint(-100, 1000))
+    return start, start + timedelta(days=rng.randint(-2, 60))
+
+
+def _brute_force(recurrence, custom_days, created, anchor, start, end) -> list[date]:
+    days = [start + timedelta(days=k) for k in range((end - start).days + 1)]
+    return [
+        day for day in days
+        if should_create_on_day(
+            recurrence, day, created.weekday(), custom_days, created_at_date=anchor,
+        )
+    ]
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_compiled_matches_should_create_on_day(seed):
+    rng = random.Random(seed)
+    for _ in range(CASES_PER_SEED):
+        recurrence, custom_days, created, anchor = _random_schedule(rng)
+        start, end = _random_range(rng)
+        compiled = compile_recurrence(
+            recurrence, created.weekday(),
+            tuple(custom_days) if custom_days else None, created_at_date=anchor,
+        )
+        expected = _brute_force(recurrence, custom_days, created, anchor, start, end)
+        case = (recurrence, custom_days, created, anchor, start, end)
+
+        assert compiled.occurrences(start, end) == expected, case
+        for k in range(max((end - start).days + 1, 0)):
+            day = start + timedelta(days=k)
+            assert compiled.occurs_on(day) == (day in expected), (case, day)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_expand_occurrences_matches_per_schedule(seed):
+    rng = random.Random(100 + seed)
+    for _ in range(50):
+        schedules = [_random_schedule(rng) for _ in range(rng.randint(1, 40))]
+        start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 900))
+        end = start + timedelta(days=rng.randint(0, 45))
+        compiled = [
+            compile_recurrence(
+                recurrence, created.weekday(),
+                tuple(custom_days) if custom_days else None, created_at_date=anchor,
+            )
+            for recurrence, custom_days, created, anchor in schedules
+        ]
+        expected = [
+            _brute_force(recurrence, custom_days, created, anchor, start, end)
+            for recurrence, custom_days, created, anchor in schedules
+        ]
+        assert expand_occurrences(compiled, start, end) == expected
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_chore_and_rule_schedules(seed):
+    """``compile_chore_recurrence`` anchors to the chore's creation time,
+    as the generator did when calling ``should_create_on_day``."""
+    rng = random.Random(200 + seed)
+    for _ in range(200):
+        recurrence, custom_days, created, _ = _random_schedule(rng)
+        created_at = datetime.combine(created, datetime.min.time()) + timedelta(
+            minutes=rng.randrange(24 * 60),
+        )
+        chore = SimpleNamespace(
+            created_at=created_at, recurrence=rng.choice(list(Recurrence)),
+            custom_days=rng.choice([None, [0, 3]]),
+        )
+        rule = SimpleNamespace(recurrence=recurrence, custom_days=custom_days)
+        start, end = _random_range(rng)
+        for source, compiled in (
+            (chore, compile_chore_recurrence(chore)),
+            (rule, compile_chore_recurrence(chore, rule)),
+        ):
+            expected = _brute_force(
+                source.recurrence, source.custom_days, created, created, start, end,
+            )
+            assert compiled.occurrences(start, end) == expected
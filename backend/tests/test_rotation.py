@@ -0,0 +1,89 @@
+"""Rotation projection against the per-day lookup and the daily reset.
+
+Rotations, reference days, active weekdays and ranges are drawn at
+random (seeded, so failures reproduce).  ``project_rotation`` must agree
+with ``get_rotation_kid_for_day`` on every day, and from the reference
+day on with a day-by-day replay of what the daily reset does.
+"""
+
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from backend.models import RotationCadence
+from backend.services.rotation import (
+    advance_rotation, get_rotation_kid_for_day, project_rotation, should_advance_rotation,
+)
+
+CASES_PER_SEED = 400
+
+
+def _random_rotation(rng: random.Random):
+    kids = rng.sample(range(100, 120), rng.randint(1, 5))
+    rotation = SimpleNamespace(
+        kid_ids=kids,
+        cadence=rng.choice(list(RotationCadence) + ["yearly"]),  # unknown: weekly
+        current_index=rng.randrange(len(kids)),
+        last_rotated=None,
+    )
+    active_weekdays = rng.choice([
+        None, [], sorted(rng.sample(range(7), rng.randint(1, 7))),
+        [rng.randrange(7)],
+    ])
+    return rotation, active_weekdays
+
+
+def _random_range(rng: random.Random, reference_day: date) -> tuple[date, date]:
+    # Ranges before, straddling and well after (a gap) the reference day
+    start = reference_day + timedelta(days=rng.choice([
+        rng.randint(-40, 0), rng.randint(0, 14), rng.randint(15, 400),
+    ]))
+    return start, start + timedelta(days=rng.randint(-1, 45))
+
+
+def _replay(rotation, reference_day: date, end: date, active_weekdays) -> dict[date, int]:
+    """Kid per day from ``reference_day`` to ``end`` as the daily reset
+    would leave it: advancing only on occurrence days once the cadence
+    period has elapsed."""
+    state = SimpleNamespace(**vars(rotation))
+    state.kid_ids = list(rotation.kid_ids)
+    state.last_rotated = reference_day
+    kids = {}
+    day = reference_day
+    while day <= end:
+        occurs = active_weekdays is None or day.weekday() in active_weekdays
+        if day != reference_day and occurs and should_advance_rotation(state, day):
+            advance_rotation(state, day)
+        kids[day] = int(state.kid_ids[state.current_index])
+        day += timedelta(days=1)
+    return kids
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_projection_matches_lookup_and_daily_reset(seed):
+    rng = random.Random(300 + seed)
+    for _ in range(CASES_PER_SEED):
+        rotation, active_weekdays = _random_rotation(rng)
+        reference_day = date(2024, 1, 1) + timedelta(days=rng.randint(0, 900))
+        start, end = _random_range(rng, reference_day)
+        case = (vars(rotation), active_weekdays, reference_day, start, end)
+
+        projected = project_rotation(rotation, start, end, reference_day, active_weekdays)
+        days = [start + timedelta(days=k) for k in range((end - start).days + 1)]
+        assert list(projected) == days, case
+
+        for day in days:
+            expected = get_rotation_kid_for_day(rotation, day, reference_day, active_weekdays)
+            assert projected[day] == expected, (case, day)
+
+        replayed = _replay(rotation, reference_day, end, active_weekdays)
+        for day in days:
+            if day >= reference_day:
+                assert projected[day] == replayed[day], (case, day)
+
+
+def test_empty_rotation_projects_nothing():
+    rotation = SimpleNamespace(kid_ids=[], cadence="daily", current_index=0)
+    assert project_rotation(rotation, date(2026, 1, 1), date(2026, 1, 7), date(2026, 1, 1)) == {}
@@ -0,0 +1,66 @@
+"""Heartbeat reaping in ``WebSocketManager._check_alive``."""
+
+import asyncio
+
+import pytest
+
+from backend.config import settings
+from backend.websocket_manager import IDLE_CLOSE_CODE, WebSocketManager
+
+pytestmark = pytest.mark.anyio
+
+
+class _FakeWebSocket:
+    def __init__(self):
+        self.sent: list[str] = []
+        self.closed_with: int | None = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+@pytest.fixture
+async def manager():
+    manager = WebSocketManager()
+    yield manager
+    for conns in list(manager.active_connections.values()):
+        for conn in list(conns):
+            manager._remove(conn)
+
+
+def _long_after(conn) -> float:
+    deadline = settings.WS_PING_INTERVAL_SECONDS + settings.WS_PONG_TIMEOUT_SECONDS
+    return conn.last_seen + deadline + 1
+
+
+async def test_silent_connection_is_reaped_after_it_has_ponged(manager):
+    ws = _FakeWebSocket()
+    conn = await manager.connect(ws, user_id=1)
+    manager.touch(conn)
+
+    manager._check_alive(_long_after(conn))
+    await asyncio.sleep(0.05)
+
+    assert manager.active_connections == {}
+    assert manager.reaped == 1
+    assert ws.closed_with == IDLE_CLOSE_CODE
+
+
+async def test_client_that_never_ponged_is_kept(manager):
+    # A client cached from before the heartbeat never sends anything
+    ws = _FakeWebSocket()
+    conn = await manager.connect(ws, user_id=1)
+
+    manager._check_alive(_long_after(conn))
+    await asyncio.sleep(0.05)
+
+    assert manager.active_connections == {1: [conn]}
+    assert manager.reaped == 0
+    assert ws.closed_with is None
+    assert manager.pings == 1
@@ -0,0 +1,134 @@
+"""Cross-worker WebSocket delivery over the SQLite bus.
+
+Starts two uvicorn workers on one database with ``WS_BUS=sqlite`` and
+checks that messages raised on one worker reach sockets held by the
+other, in both directions, and are delivered exactly once.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+import websockets
+
+pytestmark = pytest.mark.anyio
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_worker(env: dict, port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"worker on port {port} exited with {proc.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/health").status_code == 200:
+                return proc
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"worker on port {port} did not start")
+
+
+@pytest.fixture(scope="module")
+def workers(tmp_path_factory):
+    db = tmp_path_factory.mktemp("ws-bus") / "bus.db"
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{db}",
+        "WS_BUS": "sqlite",
+        "WS_BUS_POLL_MS": "50",
+        "WS_COALESCE_MS": "0",
+    }
+    procs = []
+    try:
+        # One at a time: the first creates the schema
+        for _ in range(2):
+            port = _free_port()
+            procs.append((_start_worker(env, port), port))
+        yield [f"127.0.0.1:{port}" for _, port in procs]
+    finally:
+        for proc, _ in procs:
+            proc.terminate()
+        for proc, _ in procs:
+            proc.wait(timeout=10)
+
+
+async def _next(ws, msg_type: str, timeout: float = 3.0) -> dict | None:
+    """Return the next message of ``msg_type``, skipping others."""
+    deadline = time.monotonic() + timeout
+    while (remaining := deadline - time.monotonic()) > 0:
+        try:
+            msg = json.loads(await asyncio.wait_for(ws.recv(), remaining))
+        except asyncio.TimeoutError:
+            return None
+        if msg["type"] == msg_type:
+            return msg
+    return None
+
+
+async def test_messages_reach_sockets_on_other_worker(workers):
+    a, b = workers
+    async with httpx.AsyncClient() as client:
+        r = await client.post(f"http://{a}/api/auth/register", json={
+            "username": "admin", "password": "password123", "display_name": "Admin",
+        })
+        admin = r.json()
+        headers = {"Authorization": f"Bearer {admin['access_token']}"}
+        r = await client.post(
+            f"http://{a}/api/admin/invite-codes", json={"role": "kid", "max_uses": 1}, headers=headers,
+        )
+        r = await client.post(f"http://{b}/api/auth/register", json={
+            "username": "kid", "password": "password123", "display_name": "Kid",
+            "invite_code": r.json()["code"],
+        })
+        kid = r.json()
+        kid_headers = {"Authorization": f"Bearer {kid['access_token']}"}
+
+        kid_url = f"ws://{b}/ws/{kid['user']['id']}?token={kid['access_token']}"
+        admin_url = f"ws://{a}/ws/{admin['user']['id']}?token={admin['access_token']}"
+        async with websockets.connect(kid_url) as kid_ws, websockets.connect(admin_url) as admin_ws:
+            # Broadcast raised on A, socket on B
+            r = await client.post(f"http://{a}/api/emotes", json={"emote": "wave"}, headers=headers)
+            assert r.status_code == 200
+            msg = await _next(kid_ws, "emote")
+            assert msg and msg["data"]["emote"] == "wave"
+            assert await _next(admin_ws, "emote")
+
+            # send_to_user raised on A for a kid connected to B
+            r = await client.post(
+                f"http://{a}/api/points/{kid['user']['id']}/bonus",
+                json={"amount": 5, "description": "relay"}, headers=headers,
+            )
+            assert r.status_code == 200
+            msg = await _next(kid_ws, "bonus_points")
+            assert msg and msg["data"]["amount"] == 5
+
+            # Broadcast raised on B, socket on A; the sender's own socket
+            # on B gets it once, not again when the relay comes back
+            r = await client.post(f"http://{b}/api/emotes", json={"emote": "cheer"}, headers=kid_headers)
+            assert r.status_code == 200
+            msg = await _next(admin_ws, "emote")
+            assert msg and msg["data"]["emote"] == "cheer"
+            msg = await _next(kid_ws, "emote")
+            assert msg and msg["data"]["emote"] == "cheer"
+            assert await _next(kid_ws, "emote", timeout=0.5) is None
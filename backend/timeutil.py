@@ -0,0 +1,35 @@
+"""Timezone helpers below the services layer.
+
+``backend.models`` needs the household's local day for column defaults
+but must not import the services package, so the zone lookup and the
+UTC-to-local-day conversion live here and ``services/clock.py`` builds
+on them.
+"""
+
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from backend.config import settings
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def household_tz() -> ZoneInfo:
+    """The zone in ``Settings.TZ``."""
+    return _zone(settings.TZ)
+
+
+def as_utc(instant: datetime) -> datetime:
+    """Make ``instant`` aware; naive values are UTC, as stored by SQLite."""
+    if instant.tzinfo is None:
+        return instant.replace(tzinfo=timezone.utc)
+    return instant
+
+
+def local_date(instant: datetime) -> date:
+    """Household calendar day of ``instant`` (naive values are UTC)."""
+    return as_utc(instant).astimezone(household_tz()).date()
@@ -1,45 +1,359 @@
+"""WebSocket connections and message fan-out.
+
+Each connection has a bounded outbound queue drained by its own writer
+task, so sending never waits on a client: ``send_to_user`` and
+``broadcast`` only enqueue, and one slow phone delays nobody but itself.
+When a queue is full, ``WS_OVERFLOW_POLICY`` decides what happens:
+
+* ``drop_oldest`` - discard the oldest queued message to make room.
+* ``disconnect`` - close the connection (code 1013, try again later);
+  the client reconnects and refetches.
+
+``data_changed`` messages only tell clients to refetch, so a burst of
+them (a bulk edit, a rule change) is coalesced: for ``WS_COALESCE_MS``
+each user's pending messages are held by entity, a repeat replaces the
+earlier one (a later ``points`` balance supersedes an older one), and
+the survivors are queued together when the window ends.  ``0`` sends
+them at once.
+
+Every ``WS_PING_INTERVAL_SECONDS`` each connection is sent a ``ping``
+message, which the client answers with ``pong``.  A connection from
+which nothing has been received for the interval plus
+``WS_PONG_TIMEOUT_SECONDS`` is taken to be half-open (a phone that lost
+its network) and is closed and removed rather than written to forever.
+Only connections that have sent something at least once are reaped:
+clients cached from before the heartbeat never answer pings, and
+closing them would just make them reconnect and refetch every cycle.
+
+Messages go out through an event bus (``services/ws_bus.py``) so that
+with several workers each one delivers to the sockets it holds; the
+bus is started and stopped with the app.
+
+``stats`` reports connection counts, queue depth, drop counters,
+message and byte rates and send latency (queued to written) for this
+worker; ``connections`` lists each connection by user.
+"""
+
+import asyncio
 import json
+import logging
+import time
+from collections import deque
+
 from fastapi import WebSocket
 
+from backend.config import settings
+from backend.services.ws_bus import LocalBus, make_bus
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to a consumer dropped for falling behind
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+# Close code sent to a connection that stopped answering pings
+IDLE_CLOSE_CODE = 4408
+
+PING_MESSAGE = json.dumps({"type": "ping"})
+
+# Send latencies kept for the percentiles in stats()
+LATENCY_SAMPLES = 1000
+
+# Message type held back and merged per user; see the module docstring
+COALESCED_TYPE = "data_changed"
+
+
+class _RateWindow:
+    """Messages and bytes per second over the last ``seconds``."""
+
+    def __init__(self, seconds: int = 60):
+        self.seconds = seconds
+        # [second, messages, bytes], oldest first
+        self._buckets: deque[list[int]] = deque()
+
+    def add(self, nbytes: int, now: float) -> None:
+        second = int(now)
+        if self._buckets and self._buckets[-1][0] == second:
+            bucket = self._buckets[-1]
+            bucket[1] += 1
+            bucket[2] += nbytes
+        else:
+            self._buckets.append([second, 1, nbytes])
+            self._trim(second)
+
+    def _trim(self, second: int) -> None:
+        while self._buckets and self._buckets[0][0] <= second - self.seconds:
+            self._buckets.popleft()
+
+    def rates(self, now: float) -> tuple[float, float]:
+        self._trim(int(now))
+        messages = sum(bucket[1] for bucket in self._buckets)
+        nbytes = sum(bucket[2] for bucket in self._buckets)
+        return messages / self.seconds, nbytes / self.seconds
+
+
+class _Connection:
+    def __init__(self, websocket: WebSocket, user_id: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        # (message, monotonic time it was queued)
+        self.queue: asyncio.Queue[tuple[str, float]] = asyncio.Queue(
+            maxsize=max(settings.WS_SEND_QUEUE_SIZE, 1),
+        )
+        self.writer: asyncio.Task | None = None
+        self.connected_at = time.monotonic()
+        self.last_seen = self.connected_at
+        # Set once the client has sent anything; see the module docstring
+        self.ponged = False
+        self.sent = 0
+        self.bytes_sent = 0
+
 
 class WebSocketManager:
-    def __init__(self):
-        self.active_connections: dict[int, list[WebSocket]] = {}
+    def __init__(self, bus: LocalBus | None = None):
+        self.active_connections: dict[int, list[_Connection]] = {}
+        self.bus = bus or LocalBus()
+        self.bus.attach(self._deliver)
+        # user_id -> {entity: data} waiting for the coalescing window to end
+        self._pending: dict[int, dict[str, str]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._heartbeat: asyncio.Task | None = None
+        # Counters since startup
+        self.sent = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+        self.slow_disconnects = 0
+        self.coalesced = 0
+        self.pings = 0
+        self.reaped = 0
+        self._rates = _RateWindow()
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
 
-    async def connect(self, websocket: WebSocket, user_id: int):
+    async def connect(self, websocket: WebSocket, user_id: int) -> _Connection:
         await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
+        conn = _Connection(websocket, user_id)
+        conn.writer = asyncio.create_task(self._write(conn))
+        self.active_connections.setdefault(user_id, []).append(conn)
+        return conn
+
+    def touch(self, conn: _Connection) -> None:
+        """Note that something (a pong or any other frame) arrived."""
+        conn.last_seen = time.monotonic()
+        conn.ponged = True
 
     def disconnect(self, websocket: WebSocket, user_id: int):
-        if user_id in self.active_connections:
-            self.active_connections[user_id] = [
-                ws for ws in self.active_connections[user_id] if ws != websocket
+        for conn in self.active_connections.get(user_id, []):
+            if conn.websocket is websocket:
+                self._remove(conn)
+                break
+
+    def _remove(self, conn: _Connection) -> None:
+        conns = self.active_connections.get(conn.user_id)
+        if conns and conn in conns:
+            conns.remove(conn)
+            if not conns:
+                del self.active_connections[conn.user_id]
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+
+    async def _write(self, conn: _Connection) -> None:
+        try:
+            while True:
+                data, queued_at = await conn.queue.get()
+                await conn.websocket.send_text(data)
+                now = time.monotonic()
+                # Messages are ASCII (json.dumps escapes the rest), so
+                # characters are bytes
+                nbytes = len(data)
+                conn.sent += 1
+                conn.bytes_sent += nbytes
+                self.sent += 1
+                self.bytes_sent += nbytes
+                self._rates.add(nbytes, now)
+                self._latencies.append(now - queued_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The socket is gone; the receive loop will notice too
+            self._remove(conn)
+
+    def _enqueue(self, conn: _Connection, data: str) -> None:
+        item = (data, time.monotonic())
+        try:
+            conn.queue.put_nowait(item)
+            return
+        except asyncio.QueueFull:
+            pass
+        if settings.WS_OVERFLOW_POLICY == "disconnect":
+            self.slow_disconnects += 1
+            logger.info("Disconnecting slow WebSocket consumer (user %s)", conn.user_id)
+            self._drop(conn, SLOW_CONSUMER_CLOSE_CODE)
+            return
+        conn.queue.get_nowait()
+        conn.queue.put_nowait(item)
+        self.dropped += 1
+
+    def _drop(self, conn: _Connection, code: int) -> None:
+        self._remove(conn)
+        asyncio.create_task(self._close(conn, code))
+
+    async def _close(self, conn: _Connection, code: int) -> None:
+        try:
+            # A half-open socket may never finish the closing handshake
+            await asyncio.wait_for(conn.websocket.close(code=code), timeout=5)
+        except Exception:
+            pass
+
+    def _send(self, user_id: int, data: str) -> None:
+        for conn in list(self.active_connections.get(user_id, [])):
+            self._enqueue(conn, data)
+
+    def _hold(self, user_id: int, entity: str, data: str) -> None:
+        pending = self._pending.setdefault(user_id, {})
+        if entity in pending:
+            self.coalesced += 1
+        pending[entity] = data
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                settings.WS_COALESCE_MS / 1000, self._flush_pending,
+            )
+
+    def _flush_pending(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for user_id, messages in pending.items():
+            for data in messages.values():
+                self._send(user_id, data)
+
+    def _deliver(self, event: dict) -> None:
+        """Deliver a bus event to the sockets held by this worker."""
+        user_ids = event["user_ids"]
+        if user_ids is None:
+            user_ids = [
+                user_id for user_id in list(self.active_connections)
+                if user_id != event["exclude_user"]
             ]
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
+        entity = event.get("coalesce")
+        for user_id in user_ids:
+            if entity is not None and settings.WS_COALESCE_MS > 0:
+                if user_id in self.active_connections:
+                    self._hold(user_id, entity, event["data"])
+            else:
+                self._send(user_id, event["data"])
+
+    def _check_alive(self, now: float) -> None:
+        """Ping every connection and close those that went quiet."""
+        deadline = settings.WS_PING_INTERVAL_SECONDS + settings.WS_PONG_TIMEOUT_SECONDS
+        for conns in list(self.active_connections.values()):
+            for conn in list(conns):
+                if conn.ponged and now - conn.last_seen > deadline:
+                    self.reaped += 1
+                    logger.info("Closing unresponsive WebSocket (user %s)", conn.user_id)
+                    self._drop(conn, IDLE_CLOSE_CODE)
+                else:
+                    self.pings += 1
+                    self._enqueue(conn, PING_MESSAGE)
+
+    async def _run_heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(settings.WS_PING_INTERVAL_SECONDS)
+            try:
+                self._check_alive(time.monotonic())
+            except Exception:
+                logger.warning("WebSocket heartbeat failed", exc_info=True)
+
+    async def start(self) -> None:
+        await self.bus.start()
+        if settings.WS_PING_INTERVAL_SECONDS > 0:
+            self._heartbeat = asyncio.create_task(self._run_heartbeat())
+
+    async def stop(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        await self.bus.stop()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_pending()
+
+    def _publish(self, message: dict, user_ids: list[int] | None, exclude_user: int | None) -> None:
+        event = {"data": json.dumps(message), "user_ids": user_ids, "exclude_user": exclude_user}
+        if message.get("type") == COALESCED_TYPE:
+            event["coalesce"] = str(message.get("data", {}).get("entity"))
+        self.bus.publish(event)
 
     async def send_to_user(self, user_id: int, message: dict):
-        if user_id in self.active_connections:
-            data = json.dumps(message)
-            dead = []
-            for ws in self.active_connections[user_id]:
-                try:
-                    await ws.send_text(data)
-                except Exception:
-                    dead.append(ws)
-            for ws in dead:
-                self.active_connections[user_id].remove(ws)
+        self._publish(message, [user_id], None)
 
     async def broadcast(self, message: dict, exclude_user: int | None = None):
-        for user_id in list(self.active_connections.keys()):
-            if user_id != exclude_user:
-                await self.send_to_user(user_id, message)
+        self._publish(message, None, exclude_user)
 
     async def send_to_parents(self, message: dict, parent_ids: list[int]):
-        for pid in parent_ids:
-            await self.send_to_user(pid, message)
+        if parent_ids:
+            self._publish(message, list(parent_ids), None)
+
+    def stats(self) -> dict:
+        depths = [
+            conn.queue.qsize()
+            for conns in self.active_connections.values() for conn in conns
+        ]
+        messages_per_second, bytes_per_second = self._rates.rates(time.monotonic())
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000, 2)
+
+        return {
+            "users": len(self.active_connections),
+            "connections": len(depths),
+            "queued": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "queue_size": max(settings.WS_SEND_QUEUE_SIZE, 1),
+            "overflow_policy": settings.WS_OVERFLOW_POLICY,
+            "sent": self.sent,
+            "bytes_sent": self.bytes_sent,
+            "messages_per_second": round(messages_per_second, 2),
+            "bytes_per_second": round(bytes_per_second, 1),
+            "send_latency_ms": {
+                "p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99),
+                "max": percentile(1.0),
+            },
+            "dropped": self.dropped,
+            "slow_disconnects": self.slow_disconnects,
+            "coalesce_ms": settings.WS_COALESCE_MS,
+            "coalesced": self.coalesced,
+            "coalesce_pending": sum(len(m) for m in self._pending.values()),
+            "ping_interval_seconds": settings.WS_PING_INTERVAL_SECONDS,
+            "pings": self.pings,
+            "reaped": self.reaped,
+            **self.bus.stats(),
+        }
+
+    def connections(self) -> list[dict]:
+        """This worker's connections, grouped by user."""
+        now = time.monotonic()
+        return [
+            {
+                "user_id": user_id,
+                "connections": [
+                    {
+                        "connected_seconds": round(now - conn.connected_at),
+                        "idle_seconds": round(now - conn.last_seen, 1),
+                        "ponged": conn.ponged,
+                        "queued": conn.queue.qsize(),
+                        "sent": conn.sent,
+                        "bytes_sent": conn.bytes_sent,
+                    }
+                    for conn in conns
+                ],
+            }
+            for user_id, conns in sorted(self.active_connections.items())
+        ]
 
 
-ws_manager = WebSocketManager()
+ws_manager = WebSocketManager(make_bus())
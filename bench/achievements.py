@@ -0,0 +1,111 @@
+"""Achievement evaluation time for kids with long histories.
+
+Usage (from the repository root)::
+
+    python -m bench.achievements
+
+Seeds the default achievements and kids with 0 to 8,000 assignments
+(mostly completed or verified, spread over past days), then times one
+evaluation of every achievement's criteria per kid, averaged over 5
+runs, and of the subset each event evaluates where the checkout
+declares one.  Only ``_check_criteria`` is called, so nothing is
+unlocked and the script also runs on checkouts from before the
+evaluator rewrite.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="chorequest-bench-")
+os.environ.setdefault("SECRET_KEY", "chorequest-bench-secret-key")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_DIR}/bench.db"
+
+from datetime import date, datetime, timedelta  # noqa: E402
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from backend import achievements  # noqa: E402
+from backend.database import async_session, engine, init_db  # noqa: E402
+from backend.models import (  # noqa: E402
+    Achievement, AssignmentStatus, ChoreAssignment, User, UserRole,
+)
+from backend.seed import seed_database  # noqa: E402
+
+SIZES = (0, 100, 1000, 3000, 8000)
+RUNS = 5
+
+
+async def _build() -> None:
+    rng = random.Random(17)
+    today = date.today()
+    async with async_session() as db:
+        await seed_database(db)
+        await db.execute(insert(User), [
+            {"id": 100 + i, "username": f"kid{i}", "display_name": "Kid",
+             "password_hash": "x", "role": UserRole.kid,
+             "current_streak": 3, "total_points_earned": 400}
+            for i in range(len(SIZES))
+        ])
+        rows = []
+        for i, size in enumerate(SIZES):
+            for k in range(size):
+                day = today - timedelta(days=k // 3 + 1)
+                status = rng.choice([
+                    AssignmentStatus.completed, AssignmentStatus.verified,
+                    AssignmentStatus.verified, AssignmentStatus.pending,
+                ])
+                done = status != AssignmentStatus.pending
+                rows.append({
+                    "chore_id": k % 3 + 1, "user_id": 100 + i, "date": day, "status": status,
+                    # Completed after 9am, so the early-bird check finds nothing
+                    "completed_at": datetime(day.year, day.month, day.day, rng.randrange(9, 22))
+                    if done else None,
+                })
+        if rows:
+            await db.execute(insert(ChoreAssignment), rows)
+        try:
+            from backend.services.daily_stats import rebuild_daily_stats
+        except ImportError:
+            pass  # older checkouts count assignments directly
+        else:
+            await rebuild_daily_stats(db)
+        await db.commit()
+
+
+async def main() -> None:
+    logging.disable(logging.INFO)
+    await init_db()
+    await _build()
+    async with async_session() as db:
+        result = await db.execute(select(Achievement).order_by(Achievement.id))
+        criteria = [a.criteria for a in result.scalars().all()]
+        result = await db.execute(select(User).where(User.id >= 100).order_by(User.id))
+        users = result.scalars().all()
+
+        # Per-event subsets where the checkout declares them
+        columns = {"full evaluation": None}
+        for event, ctypes in sorted(getattr(achievements, "_EVENT_CRITERIA", {}).items()):
+            columns[event] = ctypes
+
+        print(f"{len(criteria)} achievements")
+        print(f"{'assignments':>11}" + "".join(f" {name:>16}" for name in columns))
+        for size, user in zip(SIZES, users):
+            cells = []
+            for ctypes in columns.values():
+                subset = [c for c in criteria if ctypes is None or c.get("type") in ctypes]
+                t0 = time.perf_counter()
+                for _ in range(RUNS):
+                    for c in subset:
+                        await achievements._check_criteria(db, user, c)
+                elapsed = (time.perf_counter() - t0) / RUNS * 1000
+                cells.append(f" {elapsed:>13.2f} ms")
+            print(f"{size:>11}" + "".join(cells))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Query count of week generation for households of growing size.
+
+Usage (from the repository root)::
+
+    python -m bench.generator_queries
+
+Builds households of 5 kids with 10, 40 and 100 daily chores, each
+assigned to every kid through a rule, in a throwaway database.  It then
+counts the SQL statements ``auto_generate_week_assignments`` issues for
+one calendar week: cold (nothing generated yet) and warm (run again).
+Run it on a checkout from before the bulk generator to compare; that
+version issued one SELECT per (chore, kid, day).
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="chorequest-bench-")
+os.environ.setdefault("SECRET_KEY", "chorequest-bench-secret-key")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_DIR}/bench.db"
+
+from datetime import date  # noqa: E402
+
+from sqlalchemy import delete, event, insert  # noqa: E402
+
+from backend.database import async_session, engine, init_db  # noqa: E402
+from backend.models import (  # noqa: E402
+    Chore, ChoreAssignment, ChoreAssignmentRule, ChoreCategory, Difficulty,
+    Recurrence, User, UserRole,
+)
+from backend.services.assignment_generator import auto_generate_week_assignments  # noqa: E402
+
+KIDS = 5
+SIZES = (10, 40, 100)
+WEEK = date(2025, 3, 3)
+
+
+async def _build(chores: int) -> None:
+    async with engine.begin() as conn:
+        for model in (ChoreAssignment, ChoreAssignmentRule, Chore, ChoreCategory, User):
+            await conn.execute(delete(model))
+        await conn.execute(insert(User), [
+            {"id": 1, "username": "parent", "display_name": "Parent",
+             "password_hash": "x", "role": UserRole.parent},
+        ] + [
+            {"id": kid, "username": f"kid{kid}", "display_name": "Kid",
+             "password_hash": "x", "role": UserRole.kid}
+            for kid in range(2, 2 + KIDS)
+        ])
+        await conn.execute(insert(ChoreCategory), [
+            {"id": 1, "name": "Bench", "icon": "star", "colour": "#000000"},
+        ])
+        await conn.execute(insert(Chore), [
+            {"id": chore_id, "title": f"Chore {chore_id}", "points": 5,
+             "difficulty": Difficulty.easy, "category_id": 1,
+             "recurrence": Recurrence.daily, "created_by": 1}
+            for chore_id in range(1, chores + 1)
+        ])
+        await conn.execute(insert(ChoreAssignmentRule), [
+            {"chore_id": chore_id, "user_id": kid, "recurrence": Recurrence.daily}
+            for chore_id in range(1, chores + 1) for kid in range(2, 2 + KIDS)
+        ])
+
+
+async def main() -> None:
+    logging.disable(logging.INFO)
+    await init_db()
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    print(f"{'chores':>6} {'kids':>4} {'cold':>6} {'warm':>6}")
+    for chores in SIZES:
+        await _build(chores)
+        runs = []
+        for _ in range(2):
+            statements = 0
+            async with async_session() as db:
+                await auto_generate_week_assignments(db, WEEK)
+            runs.append(statements)
+        print(f"{chores:>6} {KIDS:>4} {runs[0]:>6} {runs[1]:>6}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""Latency of an unrelated endpoint during a burst of logins.
+
+Usage (from the repository root)::
+
+    python -m bench.login_burst
+
+Runs the app in process through httpx's ``ASGITransport``.  It pings
+``/api/health`` every 5 ms, first with nothing else running and then
+while 10 password logins run concurrently.  It reports the health-check
+p50/p99 and the logins' status codes.  10 logins stay within the
+default login rate limit, so the script also runs on checkouts from
+before bcrypt moved off the event loop.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="chorequest-bench-")
+os.environ.setdefault("SECRET_KEY", "chorequest-bench-secret-key")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_DIR}/bench.db"
+
+import httpx  # noqa: E402
+
+from backend.main import app  # noqa: E402
+
+LOGINS = 10
+PINGS = 100
+
+
+def _percentile(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1)
+
+
+async def main() -> None:
+    logging.disable(logging.INFO)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            r = await client.post("/api/auth/register", json={
+                "username": "admin", "password": "password123", "display_name": "Admin",
+            })
+            assert r.status_code == 200, r.text
+
+            async def ping(out: list[float]) -> None:
+                for _ in range(PINGS):
+                    t0 = time.perf_counter()
+                    await client.get("/api/health")
+                    out.append((time.perf_counter() - t0) * 1000)
+                    await asyncio.sleep(0.005)
+
+            async def login() -> int:
+                r = await client.post("/api/auth/login", json={
+                    "username": "admin", "password": "password123",
+                })
+                return r.status_code
+
+            idle: list[float] = []
+            await ping(idle)
+            busy: list[float] = []
+            t0 = time.perf_counter()
+            _, *codes = await asyncio.gather(ping(busy), *[login() for _ in range(LOGINS)])
+            elapsed = time.perf_counter() - t0
+
+    print(f"idle:  health p50={_percentile(idle, 0.5)} ms  p99={_percentile(idle, 0.99)} ms")
+    print(
+        f"burst: health p50={_percentile(busy, 0.5)} ms  p99={_percentile(busy, 0.99)} ms  "
+        f"max={round(max(busy), 1)} ms"
+    )
+    print(f"{LOGINS} logins: {sorted(codes)} in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
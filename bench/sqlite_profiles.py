@@ -0,0 +1,116 @@
+"""Verify and calendar throughput under each SQLite pragma profile.
+
+Usage (from the repository root)::
+
+    python -m bench.sqlite_profiles
+
+Each profile runs in its own process with its own database (the
+profile is applied when connections open).  The workload goes through
+the app with ``TestClient``: 60 daily chores for one kid are completed
+and then verified, then 8 future calendar weeks are read cold (each
+generates its assignments) and 5 more times warm.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = ("durable", "balanced", "fast")
+CHORES = 60
+WEEKS = 8
+WARM_ROUNDS = 5
+
+
+def run_profile() -> dict:
+    from datetime import date, timedelta
+
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    def ok(response, code=200):
+        assert response.status_code == code, (response.request.url, response.status_code, response.text)
+        return response.json() if response.content else None
+
+    with TestClient(app) as client:
+        admin = ok(client.post("/api/auth/register", json={
+            "username": "admin", "password": "password123", "display_name": "Admin",
+        }))
+        headers = {"Authorization": f"Bearer {admin['access_token']}"}
+        code = ok(client.post(
+            "/api/admin/invite-codes", json={"role": "kid", "max_uses": 1}, headers=headers,
+        ))["code"]
+        kid = ok(client.post("/api/auth/register", json={
+            "username": "kid", "password": "password123", "display_name": "Kid", "invite_code": code,
+        }))
+        kid_headers = {"Authorization": f"Bearer {kid['access_token']}"}
+        category = ok(client.get("/api/chores/categories", headers=headers))[0]["id"]
+
+        chore_ids = []
+        for i in range(CHORES):
+            chore = ok(client.post("/api/chores", json={
+                "title": f"Chore {i}", "points": 5, "difficulty": "easy",
+                "category_id": category, "recurrence": "daily", "assigned_user_ids": [],
+            }, headers=headers), 201)
+            ok(client.post(f"/api/chores/{chore['id']}/assign", json={
+                "assignments": [{"user_id": kid["user"]["id"], "recurrence": "daily"}],
+            }, headers=headers), 201)
+            chore_ids.append(chore["id"])
+        for chore_id in chore_ids:
+            ok(client.post(f"/api/chores/{chore_id}/complete", headers=kid_headers))
+
+        t0 = time.perf_counter()
+        for chore_id in chore_ids:
+            ok(client.post(f"/api/chores/{chore_id}/verify", headers=headers))
+        verify = CHORES / (time.perf_counter() - t0)
+
+        monday = date.today() - timedelta(days=date.today().weekday())
+        weeks = [str(monday + timedelta(weeks=w)) for w in range(1, WEEKS + 1)]
+        t0 = time.perf_counter()
+        for week in weeks:
+            ok(client.get(f"/api/calendar?week_start={week}", headers=headers))
+        cold = WEEKS / (time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        for _ in range(WARM_ROUNDS):
+            for week in weeks:
+                ok(client.get(f"/api/calendar?week_start={week}", headers=headers))
+        warm = WARM_ROUNDS * WEEKS / (time.perf_counter() - t0)
+
+    return {
+        "verify_per_s": round(verify, 1),
+        "calendar_cold_per_s": round(cold, 1),
+        "calendar_warm_per_s": round(warm, 1),
+    }
+
+
+def main() -> None:
+    print(f"{'profile':<10} {'verify/s':>9} {'calendar cold/s':>16} {'calendar warm/s':>16}")
+    for profile in PROFILES:
+        db_dir = tempfile.mkdtemp(prefix=f"chorequest-bench-{profile}-")
+        env = {
+            **os.environ,
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "chorequest-bench-secret-key"),
+            "DATABASE_URL": f"sqlite+aiosqlite:///{db_dir}/bench.db",
+            "SQLITE_PROFILE": profile,
+        }
+        out = subprocess.run(
+            [sys.executable, "-m", "bench.sqlite_profiles", "--run"],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print(
+            f"{profile:<10} {result['verify_per_s']:>9} "
+            f"{result['calendar_cold_per_s']:>16} {result['calendar_warm_per_s']:>16}"
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--run"]:
+        logging.disable(logging.CRITICAL)
+        print(json.dumps(run_profile()))
+    else:
+        main()
@@ -23,6 +23,11 @@ export function useWebSocket(userId, onMessage) {
     ws.onmessage = (event) => {
       try {
         const data = JSON.parse(event.data);
+        // Server heartbeat; answer it, and don't trigger page refetches
+        if (data.type === 'ping') {
+          ws.send(JSON.stringify({ type: 'pong' }));
+          return;
+        }
         onMessage?.(data);
       } catch { /* ignore */ }
     };